@@ -0,0 +1,339 @@
+/**
+ * Audio Chunk Ingestor
+ * Low-copy parsing of TTS audio arriving over the WebSocket
+ *
+ * Preferred: binary frames with a small header, parsed as views (no copy)
+ *   byte 0     magic (0xA5)
+ *   byte 1     codec id (see AudioChunkIngestor.CODECS)
+ *   bytes 2-3  turn id (uint16, little-endian)
+ *   bytes 4-7  sequence number (uint32, little-endian) - the TTS request's
+ *              seq from MiniMax; frames forwarded by the voice relay carry
+ *              the sentence index within the turn instead, since pooled
+ *              upstream sockets number requests across all sessions
+ *   bytes 8-   payload
+ *
+ * Fallback: JSON audio_chunk messages - the base64 field is decoded
+ * straight from the message string into a pooled Uint8Array, and only
+ * the small remainder of the message goes through JSON.parse
+ */
+
+const FRAME_MAGIC = 0xA5;
+const FRAME_HEADER_BYTES = 8;
+const AUDIO_FIELD = '"audio":"';
+// Stands in for the audio value while the envelope is parsed
+const AUDIO_PLACEHOLDER = '"audio":-1';
+const AUDIO_PLACEHOLDER_VALUE = -1;
+
+// Base64 alphabet lookup (255 = invalid / padding)
+const BASE64_LOOKUP = (() => {
+  const table = new Uint8Array(256).fill(255);
+  const alphabet = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/';
+  for (let i = 0; i < alphabet.length; i++) {
+    table[alphabet.charCodeAt(i)] = i;
+  }
+  // URL-safe variants
+  table['-'.charCodeAt(0)] = 62;
+  table['_'.charCodeAt(0)] = 63;
+  return table;
+})();
+
+class AudioChunkIngestor {
+  constructor(options = {}) {
+    this.options = {
+      poolSize: 8,          // buffers kept per size class
+      minPoolBytes: 4096,
+      ...options
+    };
+
+    // Size-class pool: power-of-two byte length -> free Uint8Arrays
+    this.pool = new Map();
+
+    this.stats = {
+      binaryFrames: 0,
+      base64Chunks: 0,
+      bytes: 0,
+      pooledHits: 0,
+      pooledMisses: 0
+    };
+  }
+
+  /**
+   * Parse a binary WebSocket frame, starting byteOffset bytes in (for
+   * frames behind another header, e.g. the relay's mux header)
+   * Returns { codec, turnId, seq, payload } where payload is a view
+   * into the original buffer, or null if the frame is not framed
+   */
+  parseBinaryFrame(arrayBuffer, byteOffset = 0) {
+    if (arrayBuffer.byteLength - byteOffset < FRAME_HEADER_BYTES) return null;
+
+    const header = new DataView(arrayBuffer, byteOffset, FRAME_HEADER_BYTES);
+    if (header.getUint8(0) !== FRAME_MAGIC) return null;
+
+    this.stats.binaryFrames++;
+    this.stats.bytes += arrayBuffer.byteLength - byteOffset - FRAME_HEADER_BYTES;
+
+    return {
+      codec: AudioChunkIngestor.CODEC_NAMES[header.getUint8(1)] || 'unknown',
+      turnId: header.getUint16(2, true),
+      seq: header.getUint32(4, true),
+      payload: new Uint8Array(arrayBuffer, byteOffset + FRAME_HEADER_BYTES)
+    };
+  }
+
+  /**
+   * Parse a JSON text message, decoding an embedded base64 audio field
+   * without running JSON.parse over the audio payload
+   * Returns { message, audio } - audio is a Uint8Array or null
+   */
+  parseTextMessage(text, options = {}) {
+    const fieldStart = text.indexOf(AUDIO_FIELD);
+    const valueStart = fieldStart + AUDIO_FIELD.length;
+    const valueEnd = fieldStart === -1 ? -1 : text.indexOf('"', valueStart);
+    const escaped = valueEnd !== -1 && text.lastIndexOf('\\', valueEnd) >= valueStart;
+
+    if (valueEnd !== -1 && !escaped) {
+      // Parse the envelope with the audio value blanked out. The match only
+      // counts if it was the top-level key - a nested or earlier "audio"
+      // field leaves message.audio as something other than the placeholder
+      const message = JSON.parse(text.slice(0, fieldStart) + AUDIO_PLACEHOLDER + text.slice(valueEnd + 1));
+      if (message.audio === AUDIO_PLACEHOLDER_VALUE) {
+        message.audio = null;
+        return { message, audio: this.decodeAudio(text, valueStart, valueEnd, options.pooled) };
+      }
+    }
+
+    // Slow path: whitespace after the colon, escapes, or the fast path
+    // found the wrong field - parse everything and decode the real value
+    const message = JSON.parse(text);
+    if (typeof message.audio !== 'string') {
+      return { message, audio: null };
+    }
+    const base64 = message.audio;
+    message.audio = null;
+    return { message, audio: this.decodeAudio(base64, 0, base64.length, options.pooled) };
+  }
+
+  decodeAudio(text, start, end, pooled) {
+    const audio = this.decodeBase64(text, start, end, pooled);
+    this.stats.base64Chunks++;
+    this.stats.bytes += audio.byteLength;
+    return audio;
+  }
+
+  /**
+   * Decode base64 from text[start, end) with a table lookup
+   * When pooled, the result is a view into a reusable buffer that must be
+   * handed back with release() once the consumer has copied it
+   */
+  decodeBase64(text, start = 0, end = text.length, pooled = false) {
+    // Ignore padding
+    while (end > start && text.charCodeAt(end - 1) === 61) end--;
+
+    const length = end - start;
+    const outLength = (length * 3) >> 2;
+    const out = pooled ? this.acquire(outLength) : new Uint8Array(outLength);
+    const lookup = BASE64_LOOKUP;
+
+    let o = 0;
+    let i = start;
+    const fullEnd = start + (length & ~3);
+
+    for (; i < fullEnd; i += 4) {
+      const n = (lookup[text.charCodeAt(i)] << 18) |
+        (lookup[text.charCodeAt(i + 1)] << 12) |
+        (lookup[text.charCodeAt(i + 2)] << 6) |
+        lookup[text.charCodeAt(i + 3)];
+      out[o++] = n >> 16;
+      out[o++] = (n >> 8) & 0xFF;
+      out[o++] = n & 0xFF;
+    }
+
+    const remaining = end - i;
+    if (remaining >= 2) {
+      const n = (lookup[text.charCodeAt(i)] << 18) |
+        (lookup[text.charCodeAt(i + 1)] << 12) |
+        (remaining === 3 ? lookup[text.charCodeAt(i + 2)] << 6 : 0);
+      out[o++] = n >> 16;
+      if (remaining === 3) {
+        out[o++] = (n >> 8) & 0xFF;
+      }
+    }
+
+    return out.length === o ? out : out.subarray(0, o);
+  }
+
+  /**
+   * Get a pooled buffer of at least byteLength bytes
+   */
+  acquire(byteLength) {
+    let size = this.options.minPoolBytes;
+    while (size < byteLength) size <<= 1;
+
+    const free = this.pool.get(size);
+    if (free && free.length > 0) {
+      this.stats.pooledHits++;
+      return free.pop().subarray(0, byteLength);
+    }
+
+    this.stats.pooledMisses++;
+    return new Uint8Array(size).subarray(0, byteLength);
+  }
+
+  /**
+   * Return a pooled buffer for reuse
+   */
+  release(view) {
+    const buffer = view.buffer;
+    if (buffer.byteLength === 0) return; // detached
+
+    const size = buffer.byteLength;
+    let free = this.pool.get(size);
+    if (!free) {
+      free = [];
+      this.pool.set(size, free);
+    }
+    if (free.length < this.options.poolSize) {
+      free.push(new Uint8Array(buffer));
+    }
+  }
+
+  getStats() {
+    return { ...this.stats };
+  }
+
+  /**
+   * Build a framed binary message (used by local stand-ins and tests)
+   */
+  static encodeFrame(payload, { codec = 'mp3', turnId = 0, seq = 0 } = {}) {
+    const frame = new Uint8Array(FRAME_HEADER_BYTES + payload.byteLength);
+    const header = new DataView(frame.buffer);
+    header.setUint8(0, FRAME_MAGIC);
+    header.setUint8(1, AudioChunkIngestor.CODECS[codec] ?? 255);
+    header.setUint16(2, turnId, true);
+    header.setUint32(4, seq, true);
+    frame.set(payload, FRAME_HEADER_BYTES);
+    return frame.buffer;
+  }
+
+  /**
+   * Check text message parsing against the corpus (both decode paths)
+   * Run from the browser console: AudioChunkIngestor.runCorpus()
+   */
+  static runCorpus(corpus = AudioChunkIngestor.CORPUS) {
+    const ingestor = new AudioChunkIngestor();
+    const failures = [];
+    corpus.forEach(({ name, text, expected }) => {
+      let actual;
+      try {
+        const { message, audio } = ingestor.parseTextMessage(text);
+        actual = {
+          message: Object.fromEntries(Object.keys(expected.message).map(key => [key, message[key]])),
+          bytes: audio ? Array.from(audio) : null
+        };
+      } catch (error) {
+        actual = { error: error.message };
+      }
+      if (JSON.stringify(actual) !== JSON.stringify(expected)) {
+        failures.push({ name, expected, actual });
+      }
+    });
+
+    const result = { cases: corpus.length, passed: corpus.length - failures.length, failures };
+    if (failures.length > 0) {
+      console.warn(`[Ingestor] ${failures.length}/${corpus.length} corpus case(s) failed`, failures);
+    } else {
+      console.log(`[Ingestor] All ${corpus.length} corpus cases passed`);
+    }
+    return result;
+  }
+
+  /**
+   * Microbenchmark: legacy JSON.parse + atob + charCodeAt loop vs this ingestor
+   * Run from the browser console: AudioChunkIngestor.benchmark()
+   */
+  static benchmark({ chunkBytes = 16384, iterations = 500 } = {}) {
+    const raw = new Uint8Array(chunkBytes);
+    for (let i = 0; i < chunkBytes; i++) raw[i] = (i * 31) & 0xFF;
+
+    let binary = '';
+    for (let i = 0; i < chunkBytes; i++) binary += String.fromCharCode(raw[i]);
+    const message = JSON.stringify({ type: 'audio_chunk', audio: btoa(binary), seq: 1 });
+    const frame = AudioChunkIngestor.encodeFrame(raw, { codec: 'pcm16', turnId: 1, seq: 1 });
+
+    const now = () => (typeof performance !== 'undefined' ? performance.now() : Date.now());
+    const run = (fn) => {
+      for (let i = 0; i < 20; i++) fn(); // warm up
+      const start = now();
+      for (let i = 0; i < iterations; i++) fn();
+      const elapsed = now() - start;
+      return Math.round((chunkBytes * iterations) / elapsed);
+    };
+
+    const legacy = run(() => {
+      const parsed = JSON.parse(message);
+      const binaryString = atob(parsed.audio);
+      const bytes = new Uint8Array(binaryString.length);
+      for (let i = 0; i < binaryString.length; i++) {
+        bytes[i] = binaryString.charCodeAt(i);
+      }
+      return bytes.buffer;
+    });
+
+    const ingestor = new AudioChunkIngestor();
+    const base64 = run(() => {
+      const { audio } = ingestor.parseTextMessage(message, { pooled: true });
+      ingestor.release(audio);
+    });
+
+    const framed = run(() => ingestor.parseBinaryFrame(frame));
+
+    const result = {
+      chunkBytes,
+      iterations,
+      legacyBytesPerMs: legacy,
+      base64BytesPerMs: base64,
+      binaryBytesPerMs: framed,
+      base64Speedup: +(base64 / legacy).toFixed(2)
+    };
+    console.table ? console.table(result) : console.log(result);
+    return result;
+  }
+}
+
+AudioChunkIngestor.CODECS = { mp3: 0, pcm16: 1, opus: 2, wav: 3, flac: 4 };
+AudioChunkIngestor.CODEC_NAMES = ['mp3', 'pcm16', 'opus', 'wav', 'flac'];
+
+// Text messages and what parseTextMessage() must return for them
+// ("AAEC/w==" is the bytes 0, 1, 2, 255)
+AudioChunkIngestor.CORPUS = [
+  {
+    name: 'compact',
+    text: '{"type":"audio_chunk","audio":"AAEC/w==","seq":1}',
+    expected: { message: { type: 'audio_chunk', audio: null, seq: 1 }, bytes: [0, 1, 2, 255] }
+  },
+  {
+    name: 'whitespace after the colon',
+    text: JSON.stringify({ type: 'audio_chunk', audio: 'AAEC/w==', seq: 2 }, null, 1),
+    expected: { message: { type: 'audio_chunk', audio: null, seq: 2 }, bytes: [0, 1, 2, 255] }
+  },
+  {
+    name: 'nested audio field first',
+    text: '{"type":"audio_chunk","meta":{"audio":"AQ=="},"audio":"AAEC/w==","seq":3}',
+    expected: { message: { type: 'audio_chunk', meta: { audio: 'AQ==' }, audio: null, seq: 3 }, bytes: [0, 1, 2, 255] }
+  },
+  {
+    name: 'escaped slash',
+    text: '{"type":"audio_chunk","audio":"AAEC\\/w==","seq":4}',
+    expected: { message: { type: 'audio_chunk', audio: null, seq: 4 }, bytes: [0, 1, 2, 255] }
+  },
+  {
+    name: 'no audio',
+    text: '{"type":"audio_end","seq":5}',
+    expected: { message: { type: 'audio_end', seq: 5 }, bytes: null }
+  }
+];
+
+// Export for use in other modules
+if (typeof module !== 'undefined' && module.exports) {
+  module.exports = AudioChunkIngestor;
+}
@@ -0,0 +1,265 @@
+/**
+ * Audio Playback Scheduler
+ * Gapless streaming playback on the AudioContext clock
+ * Decodes chunks ahead while audio plays and queues each buffer
+ * to start exactly when the previous one ends
+ */
+
+class AudioPlaybackScheduler {
+  constructor(audioContext, options = {}) {
+    this.audioContext = audioContext;
+    this.options = {
+      startDelay: 0.03,   // s of lead time when (re)starting playback
+      minLead: 0.005,     // s - anything closer than this counts as late
+      ...options
+    };
+
+    // Single output node so the whole stream can be faded or muted at once
+    this.output = audioContext.createGain();
+    this.output.connect(audioContext.destination);
+
+    // decodeAudioData detaches its input; enqueue() copies views first,
+    // so pooled buffers may be recycled as soon as it returns
+    this.copiesInput = true;
+
+    this.nextStartTime = 0;
+    this.activeSources = new Set();
+    this.pendingDecodes = 0;
+    this.scheduleChain = Promise.resolve();
+    this.generation = 0;
+    this.listeners = {};
+
+    this.resetTurnMetrics();
+    this.lastTurnMetrics = null;
+  }
+
+  /**
+   * Reset metrics for a new playback turn
+   */
+  resetTurnMetrics() {
+    this.turnMetrics = {
+      chunks: 0,
+      bytes: 0,
+      underruns: 0,
+      decodeErrors: 0,
+      scheduledDuration: 0,
+      minSlackMs: Infinity,
+      totalSlackMs: 0
+    };
+  }
+
+  /**
+   * Queue an encoded audio chunk (ArrayBuffer or Uint8Array view) for playback
+   * Decoding starts immediately; buffers are scheduled in arrival order
+   * An ArrayBuffer is handed to the decoder (and detached); a view is
+   * copied before this returns, so its buffer may be reused afterwards
+   */
+  enqueue(data) {
+    const generation = this.generation;
+    this.pendingDecodes++;
+    this.turnMetrics.bytes += data.byteLength;
+
+    // decodeAudioData detaches its input, so views are copied out first
+    const arrayBuffer = data instanceof ArrayBuffer ? data : data.slice().buffer;
+
+    // Start decoding now so it overlaps with audio already playing
+    const decoded = this.audioContext.decodeAudioData(arrayBuffer);
+
+    this.scheduleChain = this.scheduleChain
+      .then(() => decoded)
+      .then((audioBuffer) => {
+        if (generation === this.generation) {
+          this.scheduleBuffer(audioBuffer);
+        }
+      })
+      .catch((error) => {
+        if (generation === this.generation) {
+          console.error('[Playback] Error decoding audio:', error);
+          this.turnMetrics.decodeErrors++;
+        }
+      })
+      .finally(() => {
+        if (generation === this.generation) {
+          this.pendingDecodes--;
+          this.checkDrained();
+        }
+      });
+  }
+
+  /**
+   * Schedule a decoded buffer at the end of the current timeline
+   */
+  scheduleBuffer(audioBuffer) {
+    const now = this.audioContext.currentTime;
+    const wasPlaying = this.activeSources.size > 0;
+
+    if (this.nextStartTime < now + this.options.minLead) {
+      // Timeline ran dry mid-turn: the listener hears a gap
+      if (wasPlaying || this.turnMetrics.chunks > 0) {
+        this.turnMetrics.underruns++;
+        this.emit('underrun', { chunk: this.turnMetrics.chunks });
+      }
+      this.nextStartTime = now + this.options.startDelay;
+    }
+
+    const source = this.audioContext.createBufferSource();
+    source.buffer = audioBuffer;
+    source.connect(this.output);
+
+    source.onended = () => {
+      this.activeSources.delete(source);
+      this.checkDrained();
+    };
+
+    const startTime = this.nextStartTime;
+    source.start(startTime);
+    this.activeSources.add(source);
+    this.nextStartTime = startTime + audioBuffer.duration;
+
+    // Slack = how far ahead of the clock this chunk was queued
+    const slackMs = (startTime - now) * 1000;
+    this.turnMetrics.chunks++;
+    this.turnMetrics.scheduledDuration += audioBuffer.duration;
+    this.turnMetrics.totalSlackMs += slackMs;
+    this.turnMetrics.minSlackMs = Math.min(this.turnMetrics.minSlackMs, slackMs);
+
+    if (this.turnMetrics.chunks === 1) {
+      this.emit('playback_start', { startTime, leadMs: slackMs });
+    }
+  }
+
+  /**
+   * Emit turn metrics once nothing is playing or decoding
+   */
+  checkDrained() {
+    if (this.activeSources.size > 0 || this.pendingDecodes > 0) return;
+    if (this.turnMetrics.chunks === 0 && this.turnMetrics.decodeErrors === 0) return;
+
+    this.lastTurnMetrics = this.summarizeTurn();
+    this.resetTurnMetrics();
+    this.emit('drained', this.lastTurnMetrics);
+  }
+
+  /**
+   * Build a summary of the current turn
+   */
+  summarizeTurn() {
+    const m = this.turnMetrics;
+    return {
+      chunks: m.chunks,
+      bytes: m.bytes,
+      underruns: m.underruns,
+      decodeErrors: m.decodeErrors,
+      durationMs: Math.round(m.scheduledDuration * 1000),
+      bytesPerSecond: m.scheduledDuration > 0 ? Math.round(m.bytes / m.scheduledDuration) : 0,
+      minSlackMs: m.chunks > 0 ? Math.round(m.minSlackMs) : 0,
+      avgSlackMs: m.chunks > 0 ? Math.round(m.totalSlackMs / m.chunks) : 0
+    };
+  }
+
+  /**
+   * Milliseconds of audio queued ahead of the playhead
+   */
+  getBufferedMs() {
+    const ahead = this.nextStartTime - this.audioContext.currentTime;
+    return ahead > 0 ? Math.round(ahead * 1000) : 0;
+  }
+
+  /**
+   * Whether any audio is playing or waiting to be decoded
+   */
+  isActive() {
+    return this.activeSources.size > 0 || this.pendingDecodes > 0;
+  }
+
+  /**
+   * Stop everything, optionally fading out first
+   */
+  stop(fadeOutMs = 0) {
+    this.generation++;
+    this.pendingDecodes = 0;
+    this.scheduleChain = Promise.resolve();
+
+    const sources = Array.from(this.activeSources);
+    this.activeSources.clear();
+
+    const now = this.audioContext.currentTime;
+    const stopAt = fadeOutMs > 0 ? now + fadeOutMs / 1000 : now;
+
+    if (fadeOutMs > 0) {
+      const gain = this.output.gain;
+      gain.cancelScheduledValues(now);
+      gain.setValueAtTime(gain.value, now);
+      gain.linearRampToValueAtTime(0, stopAt);
+    }
+
+    sources.forEach((source) => {
+      source.onended = null;
+      try {
+        source.stop(stopAt);
+      } catch (error) {
+        // Source may not have started yet
+      }
+    });
+
+    // Restore gain for the next turn once the fade has finished
+    if (fadeOutMs > 0) {
+      this.output.gain.setValueAtTime(1, stopAt);
+    }
+
+    if (this.turnMetrics.chunks > 0) {
+      this.lastTurnMetrics = { ...this.summarizeTurn(), interrupted: true };
+    }
+    this.resetTurnMetrics();
+
+    // New audio must not start inside the fade
+    this.nextStartTime = fadeOutMs > 0 ? stopAt : 0;
+  }
+
+  /**
+   * Get metrics for the current and last completed turn
+   */
+  getMetrics() {
+    return {
+      current: this.summarizeTurn(),
+      lastTurn: this.lastTurnMetrics,
+      bufferedMs: this.getBufferedMs()
+    };
+  }
+
+  /**
+   * Disconnect output node
+   */
+  destroy() {
+    this.stop();
+    this.output.disconnect();
+    this.listeners = {};
+  }
+
+  /**
+   * Event listener system
+   */
+  on(event, callback) {
+    if (!this.listeners[event]) {
+      this.listeners[event] = [];
+    }
+    this.listeners[event].push(callback);
+  }
+
+  off(event, callback) {
+    if (this.listeners[event]) {
+      this.listeners[event] = this.listeners[event].filter(cb => cb !== callback);
+    }
+  }
+
+  emit(event, data) {
+    if (this.listeners[event]) {
+      this.listeners[event].forEach(callback => callback(data));
+    }
+  }
+}
+
+// Export for use in other modules
+if (typeof module !== 'undefined' && module.exports) {
+  module.exports = AudioPlaybackScheduler;
+}
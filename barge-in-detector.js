@@ -0,0 +1,276 @@
+/**
+ * Barge-In Detector
+ * Decides when the caller is talking over the AI, fusing three signals:
+ * - mic energy per VAD frame, gated against the TTS playback level so the
+ *   AI's own voice leaking into the mic (echo) is not taken for the caller
+ * - the local VAD's speech_start
+ * - Deepgram's SpeechStarted event
+ * Sustained echo-gated energy alone triggers within confirmMs, well before
+ * the VAD's minSpeechDuration; VAD or Deepgram onsets trigger at once when
+ * the mic is louder than the echo would explain. Reports onset-to-silence
+ * latency and how often a barge-in turned out not to be speech
+ */
+
+class BargeInDetector {
+  constructor(options = {}) {
+    this.options = {
+      enabled: true,
+      minLevel: 0.01,          // mic level that can be speech at all (VAD silenceThreshold)
+      confirmMs: 45,           // sustained echo-gated energy needed to trigger alone
+      echoMargin: 2,           // mic must exceed the expected echo by this factor
+      echoTailMs: 200,         // playback level is compared over this trailing window
+      initialCoupling: 0.5,    // echo path gain (mic / playback) before it is learned
+      couplingAlpha: 0.05,     // EMA rate for the learned echo path gain
+      fadeOutMs: 25,           // TTS fade on barge-in
+      targetMs: 100,           // onset-to-silence budget
+      falseWindowMs: 1500,     // no transcript within this means it was not speech
+      ...options
+    };
+
+    // Trailing playback levels (reference for the echo gate)
+    this.reference = new Float64Array(64);
+    this.referenceTimes = new Float64Array(64);
+    this.referenceHead = 0;
+
+    this.coupling = this.options.initialCoupling;
+    this.active = false;       // AI audio is playing
+    this.onsetAt = null;       // first echo-gated frame of the current run
+    this.lastGatedAt = null;
+    this.pending = null;       // stopped barge-in awaiting a transcript
+    this.falseTimer = null;
+    this.listeners = {};
+
+    this.latency = new MetricsStore({ windowSize: 100 });
+    this.resetStats();
+  }
+
+  static now() {
+    return typeof performance !== 'undefined' ? performance.now() : Date.now();
+  }
+
+  resetStats() {
+    this.stats = {
+      bargeIns: 0,
+      bySource: { energy: 0, vad: 0, deepgram: 0 },
+      confirmed: 0,
+      falseBargeIns: 0,
+      echoSuppressed: 0,       // VAD / Deepgram onsets rejected as echo
+      overTarget: 0
+    };
+  }
+
+  /**
+   * AI playback started or stopped; barge-in is only possible while it plays
+   */
+  setActive(active) {
+    if (this.active === active) return;
+    this.active = active;
+    this.onsetAt = null;
+    this.lastGatedAt = null;
+  }
+
+  /**
+   * One analysis frame: mic level and the playback level at the same time
+   * Levels are on the same scale (RMS of analyser bins, 0..1)
+   */
+  process(micLevel, playbackLevel = 0, time = BargeInDetector.now()) {
+    this.reference[this.referenceHead] = playbackLevel;
+    this.referenceTimes[this.referenceHead] = time;
+    this.referenceHead = (this.referenceHead + 1) % this.reference.length;
+
+    if (!this.active || !this.options.enabled) return;
+
+    const echo = this.expectedEcho(time);
+    const speech = micLevel >= this.options.minLevel && micLevel > echo * this.options.echoMargin;
+
+    if (!speech) {
+      // Mic level explained by playback - learn the echo path from it
+      const reference = this.referenceLevel(time);
+      if (reference > this.options.minLevel && micLevel > 0) {
+        const alpha = this.options.couplingAlpha;
+        const ratio = Math.min(1, micLevel / reference);
+        this.coupling += alpha * (ratio - this.coupling);
+      }
+      this.onsetAt = null;
+      return;
+    }
+
+    if (this.onsetAt === null) this.onsetAt = time;
+    this.lastGatedAt = time;
+
+    if (time - this.onsetAt >= this.options.confirmMs) {
+      this.trigger('energy', time);
+    }
+  }
+
+  /**
+   * Loudest playback level over the echo tail window
+   */
+  referenceLevel(time) {
+    let level = 0;
+    for (let i = 0; i < this.reference.length; i++) {
+      if (time - this.referenceTimes[i] <= this.options.echoTailMs && this.reference[i] > level) {
+        level = this.reference[i];
+      }
+    }
+    return level;
+  }
+
+  expectedEcho(time) {
+    return this.coupling * this.referenceLevel(time);
+  }
+
+  /**
+   * Whether the mic has recently been louder than echo explains
+   */
+  isGated(time) {
+    return this.lastGatedAt !== null && time - this.lastGatedAt <= this.options.echoTailMs;
+  }
+
+  /**
+   * Local VAD speech_start
+   */
+  vadSpeechStart(time = BargeInDetector.now()) {
+    this.onsetEvent('vad', time);
+  }
+
+  /**
+   * Deepgram SpeechStarted
+   */
+  remoteSpeechStart(time = BargeInDetector.now()) {
+    this.onsetEvent('deepgram', time);
+  }
+
+  onsetEvent(source, time) {
+    if (!this.active) return;
+
+    // Without fusion the onset event is trusted as is (legacy behaviour)
+    if (!this.options.enabled || this.isGated(time)) {
+      this.trigger(source, time);
+      return;
+    }
+
+    this.stats.echoSuppressed++;
+    console.log(`[BargeIn] Ignored ${source} onset - level explained by playback echo`);
+  }
+
+  trigger(source, time) {
+    if (!this.active) return;
+    this.active = false;
+
+    const onsetAt = this.onsetAt ?? this.lastGatedAt ?? time;
+    this.onsetAt = null;
+    this.lastGatedAt = null;
+    this.stats.bargeIns++;
+    this.stats.bySource[source]++;
+
+    const event = {
+      source,
+      onsetAt,
+      detectedAt: time,
+      detectMs: Math.round(time - onsetAt),
+      fadeOutMs: this.options.fadeOutMs
+    };
+
+    console.log(`[BargeIn] Caller barged in (${source}, ${event.detectMs}ms after onset)`);
+    this.emit('barge_in', event);
+  }
+
+  /**
+   * Playback was told to stop for a barge-in; outputLatencyMs is the audio
+   * output latency still to drain after the fade
+   */
+  stopped(event, outputLatencyMs = 0, time = BargeInDetector.now()) {
+    const stopMs = time - event.detectedAt + event.fadeOutMs + outputLatencyMs;
+    const totalMs = event.detectMs + stopMs;
+
+    this.latency.record('detect', event.detectMs);
+    this.latency.record('stop', stopMs);
+    this.latency.record('onset_to_silence', totalMs);
+    if (totalMs > this.options.targetMs) this.stats.overTarget++;
+
+    // A previous barge-in still unconfirmed is settled as false
+    this.settle(false);
+    this.pending = event;
+    this.falseTimer = setTimeout(() => this.settle(false), this.options.falseWindowMs);
+  }
+
+  /**
+   * A transcript with words arrived - the last barge-in was real speech
+   */
+  confirm() {
+    this.settle(true);
+  }
+
+  settle(real) {
+    if (!this.pending) return;
+    this.pending = null;
+    clearTimeout(this.falseTimer);
+    this.falseTimer = null;
+
+    if (real) {
+      this.stats.confirmed++;
+    } else {
+      this.stats.falseBargeIns++;
+      console.log('[BargeIn] No speech followed the barge-in - counted as false');
+    }
+  }
+
+  getStats() {
+    const settled = this.stats.confirmed + this.stats.falseBargeIns;
+    return {
+      ...this.stats,
+      bySource: { ...this.stats.bySource },
+      falseRate: settled > 0 ? +(this.stats.falseBargeIns / settled).toFixed(3) : 0,
+      echoCoupling: +this.coupling.toFixed(3),
+      targetMs: this.options.targetMs,
+      detectMs: this.latency.summary('detect'),
+      stopMs: this.latency.summary('stop'),
+      onsetToSilenceMs: this.latency.summary('onset_to_silence')
+    };
+  }
+
+  /**
+   * New session: counters, latencies and the learned echo path start over
+   */
+  reset() {
+    clearTimeout(this.falseTimer);
+    this.falseTimer = null;
+    this.pending = null;
+    this.active = false;
+    this.onsetAt = null;
+    this.lastGatedAt = null;
+    this.coupling = this.options.initialCoupling;
+    this.reference.fill(0);
+    this.referenceTimes.fill(0);
+    this.latency.reset();
+    this.resetStats();
+  }
+
+  /**
+   * Event listener system
+   */
+  on(event, callback) {
+    if (!this.listeners[event]) {
+      this.listeners[event] = [];
+    }
+    this.listeners[event].push(callback);
+  }
+
+  off(event, callback) {
+    if (this.listeners[event]) {
+      this.listeners[event] = this.listeners[event].filter(cb => cb !== callback);
+    }
+  }
+
+  emit(event, data) {
+    if (this.listeners[event]) {
+      this.listeners[event].forEach(callback => callback(data));
+    }
+  }
+}
+
+// Export for use in other modules
+if (typeof module !== 'undefined' && module.exports) {
+  module.exports = BargeInDetector;
+}
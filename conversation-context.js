@@ -0,0 +1,326 @@
+/**
+ * Conversation Context
+ * Token-budgeted prompt builder for GroqLLM
+ * The system prompt and added context (menu, specials) are pinned and sent
+ * with every request; recent turns fill the rest of the budget and older
+ * turns are compacted into a short rolling summary, so prompt size - and
+ * time to first token - stays flat over a long order call
+ */
+
+class ConversationContext {
+  constructor(options = {}) {
+    this.options = {
+      budgetTokens: 3000,      // prompt tokens per request (system + context + history)
+      maxHistoryTokens: 1200,  // turns kept verbatim; older ones are summarized
+      maxTurns: 16,            // ...and never more than this many
+      maxTurnTokens: 250,      // longer turns are clipped in the prompt
+      summaryTokens: 250,      // rolling summary cap, oldest lines dropped first
+      summaryLineWords: 24,    // words kept from each summarized turn
+      ...options
+    };
+
+    this.pinned = new Map();   // key -> { role, content, tokens }
+    this.pinnedTokens = 0;
+    this.turns = [];           // { role, content, promptContent, tokens }
+    this.historyTokens = 0;
+    this.summary = [];         // { text, tokens }
+    this.summaryTokens = 0;
+
+    this.stats = {
+      requests: 0,
+      compactedTurns: 0,
+      droppedSummaryLines: 0,
+      clippedTurns: 0,
+      omittedTurns: 0,         // turns left out of a prompt to stay in budget
+      lastPromptTokens: 0,
+      maxPromptTokens: 0
+    };
+  }
+
+  /**
+   * Rough token count without a tokenizer: short words ~1 token, long
+   * words ~4 chars per token, punctuation and non-ASCII 1 each.
+   * Errs slightly high for English, which is the safe side for a budget
+   */
+  static estimateTokens(text) {
+    if (!text) return 0;
+
+    let tokens = 0;
+    let run = 0;
+    for (let i = 0; i < text.length; i++) {
+      const code = text.charCodeAt(i);
+      if ((code >= 97 && code <= 122) || (code >= 65 && code <= 90) || (code >= 48 && code <= 57)) {
+        run++;
+        continue;
+      }
+      if (run > 0) {
+        tokens += run <= 6 ? 1 : Math.ceil(run / 4);
+        run = 0;
+      }
+      if (code !== 32 && code !== 10 && code !== 9) tokens++;
+    }
+    if (run > 0) {
+      tokens += run <= 6 ? 1 : Math.ceil(run / 4);
+    }
+    return tokens;
+  }
+
+  /**
+   * Tokens for a chat message including role/formatting overhead
+   */
+  static messageTokens(content) {
+    return ConversationContext.estimateTokens(content) + ConversationContext.MESSAGE_OVERHEAD;
+  }
+
+  /**
+   * Pin a system message sent with every request; pinning again under the
+   * same key replaces it (e.g. an updated menu) instead of piling up copies
+   */
+  pin(content, key = content) {
+    const existing = this.pinned.get(key);
+    if (existing) {
+      this.pinnedTokens -= existing.tokens;
+      this.pinned.delete(key);
+    }
+
+    const tokens = ConversationContext.messageTokens(content);
+    this.pinned.set(key, { role: 'system', content, tokens });
+    this.pinnedTokens += tokens;
+
+    if (this.pinnedTokens > this.options.budgetTokens / 2) {
+      console.warn(`[Context] Pinned context is ${this.pinnedTokens} tokens - over half the prompt budget`);
+    }
+  }
+
+  unpin(key) {
+    const existing = this.pinned.get(key);
+    if (!existing) return false;
+    this.pinnedTokens -= existing.tokens;
+    return this.pinned.delete(key);
+  }
+
+  /**
+   * Record a user or assistant turn, compacting old turns if needed
+   */
+  addTurn(role, content) {
+    let promptContent = content;
+    let tokens = ConversationContext.messageTokens(content);
+
+    // A runaway turn shouldn't crowd out the rest of the conversation
+    if (tokens > this.options.maxTurnTokens) {
+      let keep = content.length;
+      while (tokens > this.options.maxTurnTokens && keep > 0) {
+        keep = Math.floor(keep * this.options.maxTurnTokens / tokens * 0.95);
+        promptContent = `${content.slice(0, keep).trimEnd()}…`;
+        tokens = ConversationContext.messageTokens(promptContent);
+      }
+      this.stats.clippedTurns++;
+    }
+
+    this.turns.push({ role, content, promptContent, tokens });
+    this.historyTokens += tokens;
+    this.compact();
+  }
+
+  /**
+   * Fold the oldest turns into the rolling summary until history is
+   * within maxTurns / maxHistoryTokens
+   */
+  compact() {
+    while (this.turns.length > 1 &&
+           (this.turns.length > this.options.maxTurns ||
+            this.historyTokens > this.options.maxHistoryTokens)) {
+      const turn = this.turns.shift();
+      this.historyTokens -= turn.tokens;
+      this.summarize(turn);
+      this.stats.compactedTurns++;
+    }
+  }
+
+  /**
+   * Extractive summary line for a turn - no extra LLM call on the hot path
+   */
+  summarize(turn) {
+    const words = turn.content.replace(/\s+/g, ' ').trim().split(' ');
+    let text = words.slice(0, this.options.summaryLineWords).join(' ');
+    if (words.length > this.options.summaryLineWords) text += '…';
+    if (!text) return;
+
+    const speaker = turn.role === 'user' ? 'Customer' : 'Assistant';
+    const line = `- ${speaker}: ${text}`;
+    const tokens = ConversationContext.estimateTokens(line) + 1;
+
+    this.summary.push({ text: line, tokens });
+    this.summaryTokens += tokens;
+
+    while (this.summary.length > 1 && this.summaryTokens > this.options.summaryTokens) {
+      this.summaryTokens -= this.summary.shift().tokens;
+      this.stats.droppedSummaryLines++;
+    }
+  }
+
+  getSummaryMessage() {
+    if (this.summary.length === 0) return null;
+    return {
+      role: 'system',
+      content: `Earlier in this conversation:\n${this.summary.map(line => line.text).join('\n')}`
+    };
+  }
+
+  /**
+   * Messages for one request: system prompt, pinned context, summary and
+   * as many recent turns as fit in the budget, then the pending user turn
+   * if it isn't recorded yet (speculative generation)
+   */
+  buildMessages(systemPrompt, pendingEntry = null) {
+    const head = [{ role: 'system', content: systemPrompt }];
+    let used = ConversationContext.messageTokens(systemPrompt) + this.pinnedTokens;
+    this.pinned.forEach(({ role, content }) => head.push({ role, content }));
+
+    const tail = [];
+    if (pendingEntry) {
+      tail.push(pendingEntry);
+      used += ConversationContext.messageTokens(pendingEntry.content);
+    }
+
+    const summary = this.getSummaryMessage();
+    const summaryTokens = summary ? this.summaryTokens + ConversationContext.MESSAGE_OVERHEAD : 0;
+
+    // Newest turns first; the latest turn always goes in
+    const recent = [];
+    for (let i = this.turns.length - 1; i >= 0; i--) {
+      const turn = this.turns[i];
+      if (recent.length > 0 && used + turn.tokens > this.options.budgetTokens) {
+        this.stats.omittedTurns += i + 1;
+        break;
+      }
+      used += turn.tokens;
+      recent.push({ role: turn.role, content: turn.promptContent });
+    }
+    recent.reverse();
+
+    if (summary && used + summaryTokens <= this.options.budgetTokens) {
+      head.push(summary);
+      used += summaryTokens;
+    }
+
+    this.stats.requests++;
+    this.stats.lastPromptTokens = used;
+    if (used > this.stats.maxPromptTokens) this.stats.maxPromptTokens = used;
+
+    return [...head, ...recent, ...tail];
+  }
+
+  /**
+   * Pinned context contents, in pin order
+   */
+  getPinnedContents() {
+    return Array.from(this.pinned.values(), entry => entry.content);
+  }
+
+  /**
+   * Pinned context followed by the verbatim turns still in memory
+   */
+  getHistory() {
+    return [
+      ...Array.from(this.pinned.values(), ({ role, content }) => ({ role, content })),
+      ...this.turns.map(({ role, content }) => ({ role, content }))
+    ];
+  }
+
+  /**
+   * Forget the conversation; pinned context stays unless includePinned
+   */
+  clear(includePinned = false) {
+    this.turns = [];
+    this.historyTokens = 0;
+    this.summary = [];
+    this.summaryTokens = 0;
+    if (includePinned) {
+      this.pinned.clear();
+      this.pinnedTokens = 0;
+    }
+  }
+
+  getStats() {
+    return {
+      ...this.stats,
+      turns: this.turns.length,
+      historyTokens: this.historyTokens,
+      pinnedTokens: this.pinnedTokens,
+      summaryLines: this.summary.length,
+      summaryTokens: this.summaryTokens,
+      budgetTokens: this.options.budgetTokens
+    };
+  }
+
+  /**
+   * Simulate a long order call and compare prompt size per turn against
+   * the old "system prompt + last 10 messages" window
+   * Run from the browser console: ConversationContext.benchmark()
+   */
+  static benchmark({ turns = 60, options = {} } = {}) {
+    const now = () => (typeof performance !== 'undefined' ? performance.now() : Date.now());
+    const systemPrompt = 'You are a friendly and efficient AI assistant for OrderVoice, helping customers place food orders in Nigeria. Keep responses concise.';
+    const menu = 'Context: Menu - Jollof rice ₦2,500, Fried rice ₦2,500, Grilled chicken ₦2,000, ' +
+      'Suya (beef) ₦1,800, Moi moi ₦800, Dodo ₦600, Coleslaw ₦500, Chapman ₦1,200, Zobo ₦700. ' +
+      'Delivery to Lekki, VI and Ikoyi, 30-45 minutes, ₦1,000 fee.';
+    const userLines = [
+      'Can I get two plates of jollof rice please',
+      'Add grilled chicken to each one',
+      'Actually make one of them fried rice instead',
+      'Do you have Chapman? I want two of those too',
+      'How long will delivery to Lekki take',
+      'Okay and what is the total now'
+    ];
+    const reply = 'Sure - I have updated your order. That is two plates with grilled chicken, ' +
+      'one jollof and one fried rice, plus two Chapman. Anything else you would like to add before I confirm?';
+
+    const context = new ConversationContext(options);
+    context.pin(menu);
+    const legacy = [{ role: 'system', content: menu }];
+    const sum = messages => messages.reduce((total, message) =>
+      total + ConversationContext.messageTokens(message.content), 0);
+
+    const budgeted = [];
+    const window = [];
+    let menuDropped = 0;
+    const start = now();
+    for (let i = 0; i < turns; i++) {
+      const user = userLines[i % userLines.length];
+
+      context.addTurn('user', user);
+      budgeted.push(sum(context.buildMessages(systemPrompt)));
+      context.addTurn('assistant', reply);
+
+      legacy.push({ role: 'user', content: user });
+      const legacyMessages = [{ role: 'system', content: systemPrompt }, ...legacy.slice(-10)];
+      window.push(sum(legacyMessages));
+      if (!legacyMessages.some(message => message.content === menu)) menuDropped++;
+      legacy.push({ role: 'assistant', content: reply });
+    }
+    const elapsedMs = now() - start;
+
+    const result = {
+      turns,
+      budgetedFirst: budgeted[0],
+      budgetedLast: budgeted[turns - 1],
+      budgetedMax: Math.max(...budgeted),
+      windowLast: window[turns - 1],
+      menuDroppedTurns: menuDropped,   // requests where slice(-10) lost the menu
+      storedTurns: context.turns.length,
+      legacyStoredMessages: legacy.length,
+      usPerBuild: +((elapsedMs * 1000) / turns).toFixed(1)
+    };
+    console.table ? console.table(result) : console.log(result);
+    return result;
+  }
+}
+
+// Per-message role/formatting tokens in the chat template
+ConversationContext.MESSAGE_OVERHEAD = 4;
+
+// Export for use in other modules
+if (typeof module !== 'undefined' && module.exports) {
+  module.exports = ConversationContext;
+}
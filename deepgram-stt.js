@@ -16,6 +16,11 @@ class DeepgramSTT {
       endpointing: 300, // ms of silence to detect end of utterance
       vadEvents: true,
       utteranceEndMs: 1000,
+      sampleRate: 16000,  // rate sent to Deepgram, independent of the device rate
+      gateUplink: false,  // only send audio around local VAD speech
+      preRollMs: 300,     // audio before VAD speech onset sent when the gate opens
+      hangoverMs: 300,    // audio after VAD speech end still sent
+      keepAliveMs: 4000,  // KeepAlive interval while nothing is being sent
       ...config.deepgram
     };
 
@@ -24,12 +29,56 @@ class DeepgramSTT {
     this.audioContext = null;
     this.sourceNode = null;
     this.processorNode = null;
+    this.resampler = null;
     this.isConnected = false;
     this.isStreaming = false;
     this.listeners = {};
-    this.reconnectAttempts = 0;
-    this.maxReconnectAttempts = 5;
-    this.reconnectDelay = 1000;
+
+    // Mic audio that could not be delivered is kept here and sent once the
+    // socket is back, so nothing said during an outage is lost
+    this.backlog = new PcmBacklog({
+      sampleRate: this.config.sampleRate,
+      capacityMs: this.config.backlogMs || 5000
+    });
+
+    // Backoff reconnect; audio is buffered by the backlog, not the outbox
+    this.reconnector = new ReconnectManager('Deepgram', {
+      maxAttempts: 5,
+      ...config.deepgram?.reconnect,
+      connect: () => this.connect()
+    });
+
+    this.reconnector.on('reconnecting', (info) => {
+      this.emit('reconnecting', info);
+    });
+
+    this.reconnector.on('recovered', (info) => {
+      this.emit('recovered', info);
+    });
+
+    this.reconnector.on('gave_up', () => {
+      this.backlog.discardPending();
+    });
+
+    // Uplink gate state, driven by handleSpeechOnset / handleSpeechEnd
+    this.uplink = {
+      speaking: false,
+      hangoverUntil: 0,
+      open: !this.config.gateUplink,
+      closedAtSample: 0,
+      lastSendAt: 0,
+      speechEndAt: 0
+    };
+    this.keepAliveTimer = null;
+
+    this.uplinkStats = {
+      bytesSent: 0,
+      bytesAvoided: 0,
+      keepAlives: 0,
+      finalizes: 0,
+      // VAD speech end -> next final transcript (recent samples)
+      finalLatency: []
+    };
   }
 
   /**
@@ -47,19 +96,27 @@ class DeepgramSTT {
           punctuate: this.config.punctuate,
           endpointing: this.config.endpointing,
           vad_events: this.config.vadEvents,
-          utterance_end_ms: this.config.utteranceEndMs
+          utterance_end_ms: this.config.utteranceEndMs,
+          // Capture is resampled to exactly this rate before sending
+          encoding: 'linear16',
+          sample_rate: this.config.sampleRate,
+          channels: 1
         });
 
         const wsUrl = `wss://api.deepgram.com/v1/listen?${params}`;
 
-        this.ws = new WebSocket(wsUrl, ['token', this.apiKey]);
+        const ws = new WebSocket(wsUrl, ['token', this.apiKey]);
+        this.ws = ws;
 
         // Connection opened
         this.ws.onopen = () => {
           console.log('[Deepgram] WebSocket connected');
           this.isConnected = true;
-          this.reconnectAttempts = 0;
+          this.uplink.lastSendAt = Date.now();
+          this.startKeepAlive();
+          this.flushBacklog('reconnect');
           this.emit('connected');
+          this.reconnector.markConnected();
           resolve();
         };
 
@@ -76,24 +133,17 @@ class DeepgramSTT {
         // Connection closed
         this.ws.onclose = (event) => {
           console.log('[Deepgram] WebSocket closed:', event.code, event.reason);
+
+          // A newer socket has already replaced this one
+          if (ws !== this.ws) return;
+
+          this.stopKeepAlive();
           this.isConnected = false;
-          this.isStreaming = false;
           this.emit('disconnected');
 
-          // Auto-reconnect if streaming was active
-          if (this.reconnectAttempts < this.maxReconnectAttempts) {
-            this.reconnectAttempts++;
-            setTimeout(() => {
-              console.log(`[Deepgram] Reconnecting... (${this.reconnectAttempts}/${this.maxReconnectAttempts})`);
-              this.connect().then(() => {
-                if (this.isStreaming) {
-                  this.startStreaming();
-                }
-              }).catch(err => {
-                console.error('[Deepgram] Reconnection failed:', err);
-              });
-            }, this.reconnectDelay);
-          }
+          // Auto-reconnect with backoff; capture keeps running and
+          // records audio in the backlog until the socket is back
+          this.reconnector.connectionLost();
         };
 
         // Error handling
@@ -126,6 +176,7 @@ class DeepgramSTT {
         if (transcript) {
           if (isFinal) {
             console.log('[Deepgram] Final transcript:', transcript);
+            this.recordFinalLatency();
             this.emit('transcript_final', {
               transcript,
               confidence: result.confidence,
@@ -183,47 +234,30 @@ class DeepgramSTT {
     try {
       console.log('[Deepgram] Starting audio stream');
 
-      // Get microphone access
+      // Get microphone access at the device's native rate
       const stream = await navigator.mediaDevices.getUserMedia({
         audio: {
           echoCancellation: true,
           noiseSuppression: true,
-          autoGainControl: true,
-          sampleRate: 16000
+          autoGainControl: true
         }
       });
 
-      // Create audio context with optimal settings for streaming
+      // Create audio context at the native rate - we resample to
+      // config.sampleRate ourselves instead of trusting the browser
       this.audioContext = new (window.AudioContext || window.webkitAudioContext)({
-        sampleRate: 16000,
         latencyHint: 'interactive'
       });
 
       // Create source from microphone stream
       this.sourceNode = this.audioContext.createMediaStreamSource(stream);
 
-      // Create script processor for audio data
-      const bufferSize = 4096; // Larger buffer for better performance
-      this.processorNode = this.audioContext.createScriptProcessor(bufferSize, 1, 1);
-
-      // Process audio data and send to Deepgram
-      this.processorNode.onaudioprocess = (event) => {
-        if (!this.isConnected || !this.isStreaming) return;
-
-        const audioData = event.inputBuffer.getChannelData(0);
-
-        // Convert float32 to int16 for Deepgram
-        const int16Data = this.float32ToInt16(audioData);
-
-        // Send to Deepgram
-        if (this.ws.readyState === WebSocket.OPEN) {
-          this.ws.send(int16Data);
-        }
-      };
-
-      // Connect audio nodes
-      this.sourceNode.connect(this.processorNode);
-      this.processorNode.connect(this.audioContext.destination);
+      // Capture on the audio thread when AudioWorklet is available
+      if (this.audioContext.audioWorklet && typeof AudioWorkletNode !== 'undefined') {
+        await this.startWorkletCapture();
+      } else {
+        this.startScriptProcessorCapture();
+      }
 
       this.stream = stream;
       this.isStreaming = true;
@@ -238,6 +272,320 @@ class DeepgramSTT {
     }
   }
 
+  /**
+   * Capture with an AudioWorklet: small Int16 frames built on the audio
+   * thread and transferred to the main thread, unaffected by UI jank
+   */
+  async startWorkletCapture() {
+    if (this.audioContext.sampleRate !== this.config.sampleRate) {
+      await this.audioContext.audioWorklet.addModule(this.config.resamplerUrl || 'streaming-resampler.js');
+    }
+    await this.audioContext.audioWorklet.addModule(this.config.captureWorkletUrl || 'mic-capture-worklet.js');
+
+    // No outputs - the node is a sink and is not routed to the speakers
+    this.processorNode = new AudioWorkletNode(this.audioContext, 'mic-capture', {
+      numberOfInputs: 1,
+      numberOfOutputs: 0,
+      channelCount: 1,
+      processorOptions: {
+        frameMs: this.config.frameMs || 20,
+        targetSampleRate: this.config.sampleRate
+      }
+    });
+
+    this.processorNode.port.onmessage = (event) => {
+      if (event.data.type !== 'frame') return;
+
+      this.sendAudio(event.data.buffer);
+
+      // The socket and the backlog have both copied it - hand it back for reuse
+      this.processorNode.port.postMessage({ type: 'recycle', buffer: event.data.buffer }, [event.data.buffer]);
+    };
+
+    this.sourceNode.connect(this.processorNode);
+    console.log(`[Deepgram] AudioWorklet capture (${this.config.frameMs || 20}ms frames, ${this.audioContext.sampleRate} -> ${this.config.sampleRate} Hz)`);
+  }
+
+  /**
+   * Legacy capture for browsers without AudioWorklet
+   */
+  startScriptProcessorCapture() {
+    // Create script processor for audio data
+    const bufferSize = 4096; // Larger buffer for better performance
+    this.processorNode = this.audioContext.createScriptProcessor(bufferSize, 1, 1);
+
+    this.resampler = this.audioContext.sampleRate !== this.config.sampleRate
+      ? new StreamingResampler(this.audioContext.sampleRate, this.config.sampleRate)
+      : null;
+
+    // Process audio data and send to Deepgram
+    this.processorNode.onaudioprocess = (event) => {
+      const audioData = event.inputBuffer.getChannelData(0);
+
+      if (this.resampler) {
+        // Resampler output is a reused view; sendAudio copies it
+        this.sendAudio(this.resampler.process(audioData));
+      } else {
+        // Convert float32 to int16 for Deepgram
+        this.sendAudio(this.float32ToInt16(audioData));
+      }
+    };
+
+    // Connect audio nodes
+    this.sourceNode.connect(this.processorNode);
+    this.processorNode.connect(this.audioContext.destination);
+  }
+
+  /**
+   * Send an Int16 frame to Deepgram, or record it in the backlog until the
+   * socket recovers. The frame is copied, so the caller may reuse its buffer
+   * With gateUplink, frames outside speech (+ hangover) are only recorded
+   */
+  sendAudio(int16Buffer) {
+    if (!this.isStreaming) return;
+
+    if (!this.isGateOpen()) {
+      if (this.uplink.open) {
+        this.closeGate();
+      }
+
+      // Keep it for pre-roll, but don't count silence as undelivered
+      const caughtUp = this.backlog.pendingSamples() === 0;
+      this.backlog.write(int16Buffer);
+      if (caughtUp) {
+        this.backlog.markSent();
+        this.uplinkStats.bytesAvoided += int16Buffer.byteLength;
+      }
+      return;
+    }
+    this.uplink.open = true;
+
+    const open = this.isConnected && this.ws?.readyState === WebSocket.OPEN;
+
+    // Fast path: nothing pending, send straight through
+    if (open && this.backlog.pendingSamples() === 0) {
+      this.ws.send(int16Buffer);
+      this.backlog.write(int16Buffer);
+      this.backlog.markSent();
+      this.uplinkStats.bytesSent += int16Buffer.byteLength;
+      this.uplink.lastSendAt = Date.now();
+      return;
+    }
+
+    this.backlog.write(int16Buffer);
+    if (open) {
+      this.flushBacklog('catch_up');
+    }
+  }
+
+  /**
+   * Whether mic audio should currently go upstream
+   */
+  isGateOpen() {
+    return !this.config.gateUplink ||
+      this.uplink.speaking ||
+      Date.now() < this.uplink.hangoverUntil;
+  }
+
+  /**
+   * Speech and hangover are over: ask Deepgram to finalize now rather
+   * than wait for endpointing silence that will never arrive
+   */
+  closeGate() {
+    this.uplink.open = false;
+    this.uplink.closedAtSample = this.backlog.written;
+
+    if (this.isConnected && this.ws?.readyState === WebSocket.OPEN) {
+      this.ws.send(JSON.stringify({ type: 'Finalize' }));
+      this.uplinkStats.finalizes++;
+    }
+  }
+
+  /**
+   * Deepgram closes idle streams after ~10s without data - while the
+   * gate is closed, send KeepAlive instead of silence
+   */
+  startKeepAlive() {
+    this.stopKeepAlive();
+    if (!this.config.gateUplink) return;
+
+    this.keepAliveTimer = setInterval(() => {
+      if (!this.isConnected || this.ws?.readyState !== WebSocket.OPEN) return;
+      if (Date.now() - this.uplink.lastSendAt < this.config.keepAliveMs) return;
+
+      this.ws.send(JSON.stringify({ type: 'KeepAlive' }));
+      this.uplink.lastSendAt = Date.now();
+      this.uplinkStats.keepAlives++;
+    }, 1000);
+  }
+
+  stopKeepAlive() {
+    if (this.keepAliveTimer) {
+      clearInterval(this.keepAliveTimer);
+      this.keepAliveTimer = null;
+    }
+  }
+
+  /**
+   * Send audio held in the backlog, oldest first
+   * Emits 'audio_recovered' with how much audio was saved (and lost)
+   */
+  flushBacklog(reason) {
+    if (this.backlog.pendingSamples() === 0 || this.ws?.readyState !== WebSocket.OPEN) return;
+
+    this.uplinkStats.bytesSent += this.backlog.pendingSamples() * 2;
+    this.uplink.lastSendAt = Date.now();
+    const result = this.backlog.drain((chunk) => this.ws.send(chunk));
+    console.log(`[Deepgram] Recovered ${result.recoveredMs}ms of audio (${reason})` +
+      (result.lostMs ? `, ${result.lostMs}ms lost` : ''));
+    this.emit('audio_recovered', { ...result, reason });
+  }
+
+  /**
+   * Call at speech onset (local VAD): deliver anything held back right
+   * away, or cut short a reconnect backoff so the first syllables arrive
+   * With gateUplink this also opens the gate, starting preRollMs early
+   */
+  handleSpeechOnset() {
+    if (!this.isStreaming) return;
+
+    this.uplink.speaking = true;
+    this.uplink.speechEndAt = 0;
+
+    if (this.config.gateUplink && !this.uplink.open) {
+      // Re-send the audio just before onset, but nothing sent already
+      const preRoll = Math.round(this.config.sampleRate * this.config.preRollMs / 1000);
+      const skipped = this.backlog.written - this.uplink.closedAtSample;
+      const rewound = this.backlog.rewind(Math.min(preRoll, skipped));
+      this.uplinkStats.bytesAvoided -= rewound * 2;
+      this.uplink.open = true;
+    }
+
+    if (this.isConnected) {
+      this.flushBacklog('speech_onset');
+    } else {
+      this.reconnector.retryNow();
+    }
+  }
+
+  /**
+   * Call at speech end (local VAD): the gate stays open for hangoverMs
+   */
+  handleSpeechEnd() {
+    this.uplink.speaking = false;
+    this.uplink.hangoverUntil = Date.now() + this.config.hangoverMs;
+    this.uplink.speechEndAt = Date.now();
+  }
+
+  recordFinalLatency() {
+    if (!this.uplink.speechEndAt) return;
+
+    const samples = this.uplinkStats.finalLatency;
+    samples.push(Date.now() - this.uplink.speechEndAt);
+    if (samples.length > 50) {
+      samples.shift();
+    }
+    this.uplink.speechEndAt = 0;
+  }
+
+  /**
+   * Uplink savings and speech end -> final latency for this instance's
+   * mode; DeepgramSTT.compareUplinkModes() compares the two modes
+   */
+  getUplinkStats() {
+    const { bytesSent, bytesAvoided, keepAlives, finalizes, finalLatency } = this.uplinkStats;
+    const total = bytesSent + bytesAvoided;
+
+    return {
+      gated: this.config.gateUplink,
+      bytesSent,
+      bytesAvoided,
+      avoidedRatio: total > 0 ? +(bytesAvoided / total).toFixed(3) : 0,
+      secondsAvoided: Math.round(bytesAvoided / 2 / this.config.sampleRate),
+      keepAlives,
+      finalizes,
+      finalLatencyMs: finalLatency.length > 0
+        ? Math.round(finalLatency.reduce((a, b) => a + b, 0) / finalLatency.length)
+        : null,
+      finalLatencySamples: finalLatency.length
+    };
+  }
+
+  /**
+   * Gated vs continuous uplink on the same audio: two live streams are fed
+   * the same PCM (Int16Array at deepgram.sampleRate) in real time, with
+   * speech onset / end from a level threshold standing in for the VAD,
+   * and their speech end -> final latencies compared. Needs an API key.
+   * Run from the browser console: DeepgramSTT.compareUplinkModes(config, pcm)
+   */
+  static async compareUplinkModes(config, pcm, options = {}) {
+    const { frameMs = 20, threshold = 500, silenceMs = 300, settleMs = 2000, maxRegressionMs = 50 } = options;
+    const sleep = ms => new Promise(resolve => setTimeout(resolve, ms));
+
+    const streams = {};
+    for (const [mode, gateUplink] of [['gated', true], ['continuous', false]]) {
+      const stt = new DeepgramSTT({
+        ...config,
+        deepgram: { ...config.deepgram, gateUplink, reconnect: { maxAttempts: 0 } }
+      });
+      await stt.connect();
+      stt.isStreaming = true;   // fed below instead of from the mic
+      streams[mode] = stt;
+    }
+    const both = callback => Object.values(streams).forEach(callback);
+
+    const frameSamples = Math.round(streams.gated.config.sampleRate * frameMs / 1000);
+    let speaking = false;
+    let quietMs = 0;
+    for (let start = 0; start < pcm.length; start += frameSamples) {
+      const frame = pcm.subarray(start, start + frameSamples);
+      let peak = 0;
+      for (let i = 0; i < frame.length; i++) {
+        peak = Math.max(peak, Math.abs(frame[i]));
+      }
+
+      if (peak >= threshold) {
+        quietMs = 0;
+        if (!speaking) {
+          speaking = true;
+          both(stt => stt.handleSpeechOnset());
+        }
+      } else if (speaking && (quietMs += frameMs) >= silenceMs) {
+        speaking = false;
+        both(stt => stt.handleSpeechEnd());
+      }
+
+      both(stt => stt.sendAudio(frame.slice().buffer));
+      await sleep(frameMs);
+    }
+
+    if (speaking) both(stt => stt.handleSpeechEnd());
+    // Keep the streams fed with silence while the last finals arrive
+    const silence = new Int16Array(frameSamples);
+    for (let waited = 0; waited < settleMs; waited += frameMs) {
+      both(stt => stt.sendAudio(silence.slice().buffer));
+      await sleep(frameMs);
+    }
+
+    const gated = streams.gated.getUplinkStats();
+    const continuous = streams.continuous.getUplinkStats();
+    both(stt => stt.disconnect());
+
+    const result = {
+      gatedFinalMs: gated.finalLatencyMs,
+      continuousFinalMs: continuous.finalLatencyMs,
+      finals: Math.min(gated.finalLatencySamples, continuous.finalLatencySamples),
+      avoidedRatio: gated.avoidedRatio,
+      regressed: gated.finalLatencyMs !== null && continuous.finalLatencyMs !== null &&
+        gated.finalLatencyMs > continuous.finalLatencyMs + maxRegressionMs
+    };
+    if (result.regressed) {
+      console.warn(`[Deepgram] Gated uplink finalizes slower (${result.gatedFinalMs}ms vs ${result.continuousFinalMs}ms)`);
+    }
+    console.table ? console.table(result) : console.log(result);
+    return result;
+  }
+
   /**
    * Stop streaming audio
    */
@@ -251,6 +599,10 @@ class DeepgramSTT {
 
     // Disconnect audio nodes
     if (this.processorNode) {
+      if (this.processorNode.port) {
+        this.processorNode.port.onmessage = null;
+        this.processorNode.port.postMessage({ type: 'stop' });
+      }
       this.processorNode.disconnect();
       this.processorNode = null;
     }
@@ -259,6 +611,11 @@ class DeepgramSTT {
       this.sourceNode.disconnect();
       this.sourceNode = null;
     }
+    this.resampler = null;
+    this.backlog.reset();
+    this.uplink.open = !this.config.gateUplink;
+    this.uplink.speaking = false;
+    this.uplink.closedAtSample = 0;
 
     // Stop microphone tracks
     if (this.stream) {
@@ -287,6 +644,10 @@ class DeepgramSTT {
   disconnect() {
     console.log('[Deepgram] Disconnecting...');
 
+    // Intentional close - no reconnect
+    this.reconnector.stop();
+    this.stopKeepAlive();
+
     // Stop streaming first
     if (this.isStreaming) {
       this.stopStreaming();
@@ -329,6 +690,9 @@ class DeepgramSTT {
     return {
       connected: this.isConnected,
       streaming: this.isStreaming,
+      reconnect: this.reconnector.getMetrics(),
+      backlog: this.backlog.getStats(),
+      uplink: this.getUplinkStats(),
       config: this.config
     };
   }
@@ -8,18 +8,61 @@ class GroqLLM {
   constructor(config) {
     this.apiKey = config.groqApiKey;
     this.config = {
+      origin: GroqLLM.API_ORIGIN,       // API origin (proxies, local stand-ins)
       model: 'llama-3.3-70b-versatile', // Fast and high quality
       temperature: 0.7,
       maxTokens: 1024,
       topP: 1,
       stream: true,
+      recordStreams: false, // keep raw SSE bytes of recent responses for benchmarking
+      chunking: {},         // SentenceChunker options
+      chunker: null,        // (options) => custom chunker with push/flush/reset
+      warmup: true,         // preconnect + cheap authenticated request before the first turn
+      keepWarmMs: 30000,    // re-warm after this long without a request while active
+      hedging: {},          // TTFT deadline + hedged request, see below
       ...config.groq
     };
 
-    this.conversationHistory = [];
+    this.config.hedging = {
+      enabled: false,
+      deadlineMs: null,     // fixed TTFT deadline; null = adaptive from the model's p95
+      minDeadlineMs: 400,   // adaptive deadline bounds
+      maxDeadlineMs: 1500,
+      minSamples: 10,       // TTFT samples needed before the p95 is trusted
+      model: null,          // hedge model (e.g. a smaller, faster one); null = same model
+      ...this.config.hedging
+    };
+
+    // Pinned context + recent turns + rolling summary, within a token budget
+    this.context = new ConversationContext(config.context);
     this.systemPrompt = config.systemPrompt || this.getDefaultSystemPrompt();
     this.listeners = {};
     this.abortController = null;
+    this.recordedStreams = [];
+
+    // FAQ-style answers replayed without a Groq round trip
+    this.responseCache = new LLMResponseCache(config.llmCache);
+
+    // Connection warm-up and time-to-first-token tracking
+    this.warm = {
+      warmedAt: 0,
+      warmupMs: null,
+      lastActivityAt: 0,
+      pings: 0,
+      failures: 0,
+      timer: null
+    };
+    this.ttft = {
+      firstTurnMs: null,
+      firstTurnWarmed: false
+    };
+
+    // TTFT series: 'steady_state' and 'model:<name>' (request to first token)
+    this.latency = new MetricsStore({ windowSize: 100 });
+
+    // Per-model request counts and hedging outcomes
+    this.modelStats = new Map();
+    this.hedgeStats = { hedged: 0, hedgeWins: 0 };
   }
 
   /**
@@ -48,40 +91,125 @@ Current menu context will be provided for each conversation.`;
 
   /**
    * Generate streaming response from user input
+   * Resolves with the full response text, or null if cancelled
+   * With options.history === false the exchange is not recorded; the caller
+   * records it later with commitExchange() (speculative and scheduled turns)
    */
   async generateResponse(userMessage, options = {}) {
+    const recordHistory = options.history !== false;
+    const abortController = new AbortController();
+
     try {
       // Add user message to history
-      this.conversationHistory.push({
-        role: 'user',
-        content: userMessage
-      });
+      const userEntry = { role: 'user', content: userMessage };
+      if (recordHistory) {
+        this.context.addTurn('user', userMessage);
+      }
 
       // Create abort controller for cancellation
-      this.abortController = new AbortController();
+      this.abortController = abortController;
+
+      // Repeated FAQ question - replay the stored answer
+      const cacheKey = options.cache !== false && this.responseCache.isCacheable(userMessage)
+        ? this.responseCache.buildKey(userMessage, this.getCacheContext(options))
+        : null;
+      const cached = cacheKey ? this.responseCache.get(cacheKey) : null;
+      if (cached) {
+        console.log('[Groq] Response cache hit:', userMessage);
+        return this.replayResponse(cached.tokens, recordHistory);
+      }
+      const requestStart = Date.now();
+      this.warm.lastActivityAt = requestStart;
+
+      // Build messages array within the prompt token budget
+      const messages = this.context.buildMessages(this.systemPrompt, recordHistory ? null : userEntry);
+
+      // Call Groq API with streaming, hedged if no token arrives in time
+      const model = options.model || this.config.model;
+      const attempt = await this.raceAttempts(messages, model, options, abortController.signal);
 
-      // Build messages array
-      const messages = [
-        { role: 'system', content: this.systemPrompt },
-        ...this.conversationHistory.slice(-10) // Keep last 10 messages for context
-      ];
+      if (attempt.firstTokenAt) {
+        this.recordTtft(attempt.firstTokenAt - requestStart);
+      }
+
+      // Process streaming response
+      const output = await this.processStream(attempt, {
+        recordHistory,
+        collectTokens: cacheKey !== null
+      });
+      if (cacheKey) {
+        this.responseCache.set(cacheKey, output, Date.now() - requestStart);
+      }
+      return output.response;
 
-      // Call Groq API with streaming
-      const response = await fetch('https://api.groq.com/openai/v1/chat/completions', {
+    } catch (error) {
+      if (error.name === 'AbortError') {
+        console.log('[Groq] Request cancelled');
+        this.emit('cancelled');
+        return null;
+      } else {
+        console.error('[Groq] Error generating response:', error);
+        this.emit('error', error);
+        throw error;
+      }
+    } finally {
+      // A newer request may already own the controller
+      if (this.abortController === abortController) {
+        this.abortController = null;
+      }
+    }
+  }
+
+  /**
+   * Start one streaming request and read it up to its first token
+   * attempt.ready resolves with the attempt once a token (or the end of
+   * the stream) has arrived; aborting `signal` aborts every attempt
+   */
+  openAttempt(messages, model, options, signal, hedged = false) {
+    const controller = new AbortController();
+    signal.addEventListener('abort', () => controller.abort());
+
+    const stats = this.getModelEntry(model);
+    stats.requests++;
+
+    const attempt = {
+      model,
+      hedged,
+      controller,
+      startedAt: Date.now(),
+      firstTokenAt: 0,
+      reader: null,
+      parser: new SSEParser(),
+      pending: [],          // deltas read before the attempt won the race
+      // Raw chunks kept for SSEParser.benchmark({ streams: groq.recordedStreams })
+      recording: this.config.recordStreams ? [] : null,
+      failed: false,
+      ready: null
+    };
+
+    const hold = (content, finishReason) => {
+      if (content && attempt.firstTokenAt === 0) {
+        attempt.firstTokenAt = Date.now();
+      }
+      attempt.pending.push([content, finishReason]);
+    };
+
+    attempt.ready = (async () => {
+      const response = await fetch(`${this.config.origin}/openai/v1/chat/completions`, {
         method: 'POST',
         headers: {
           'Authorization': `Bearer ${this.apiKey}`,
           'Content-Type': 'application/json'
         },
         body: JSON.stringify({
-          model: options.model || this.config.model,
+          model: model,
           messages: messages,
           temperature: options.temperature || this.config.temperature,
           max_tokens: options.maxTokens || this.config.maxTokens,
           top_p: options.topP || this.config.topP,
           stream: true
         }),
-        signal: this.abortController.signal
+        signal: controller.signal
       });
 
       if (!response.ok) {
@@ -89,109 +217,207 @@ Current menu context will be provided for each conversation.`;
         throw new Error(`Groq API error: ${error.error?.message || response.statusText}`);
       }
 
-      // Process streaming response
-      await this.processStream(response);
+      attempt.reader = response.body.getReader();
+      while (attempt.firstTokenAt === 0) {
+        const { done, value } = await attempt.reader.read();
+        if (done) break;
+        if (attempt.recording) {
+          attempt.recording.push(value.slice());
+        }
+        attempt.parser.push(value, hold);
+      }
 
-    } catch (error) {
-      if (error.name === 'AbortError') {
-        console.log('[Groq] Request cancelled');
-        this.emit('cancelled');
-      } else {
-        console.error('[Groq] Error generating response:', error);
-        this.emit('error', error);
-        throw error;
+      this.recordModelTtft(model, (attempt.firstTokenAt || Date.now()) - attempt.startedAt);
+      return attempt;
+    })();
+
+    // A hedge loser's AbortError is expected; other failures are counted here
+    // and surface through the race
+    attempt.ready.catch((error) => {
+      attempt.failed = true;
+      if (error.name !== 'AbortError') {
+        stats.errors++;
       }
-    } finally {
-      this.abortController = null;
+    });
+
+    return attempt;
+  }
+
+  /**
+   * Send the request and, if no token arrives before the TTFT deadline (or
+   * it fails first), fire a hedged request and keep whichever streams
+   * first. The loser is aborted through its own AbortController
+   */
+  async raceAttempts(messages, model, options, signal) {
+    const primary = this.openAttempt(messages, model, options, signal);
+
+    const deadlineMs = this.getHedgeDeadline(model, options);
+    if (deadlineMs === null) {
+      return this.claimWinner(await primary.ready);
+    }
+
+    let timer = null;
+    const expired = new Promise((resolve) => {
+      timer = setTimeout(resolve, deadlineMs, null);
+    });
+    const first = await Promise.race([primary.ready.catch(() => null), expired]);
+    clearTimeout(timer);
+
+    if (first) return this.claimWinner(first);
+    if (signal.aborted) return primary.ready; // surfaces the AbortError
+
+    const hedgeModel = this.config.hedging.model || model;
+    console.log(primary.failed
+      ? `[Groq] Request to ${model} failed - hedging with ${hedgeModel}`
+      : `[Groq] No token from ${model} in ${deadlineMs}ms - hedging with ${hedgeModel}`);
+    this.hedgeStats.hedged++;
+    const hedge = this.openAttempt(messages, hedgeModel, options, signal, true);
+
+    const winner = await this.firstReady([primary, hedge]);
+    const loser = winner === primary ? hedge : primary;
+
+    // Censored sample - the loser was at least this slow
+    if (!loser.failed && loser.firstTokenAt === 0) {
+      this.recordModelTtft(loser.model, Date.now() - loser.startedAt);
+    }
+    loser.controller.abort();
+
+    if (winner.hedged) {
+      this.hedgeStats.hedgeWins++;
+      console.log(`[Groq] Hedged request on ${winner.model} won`);
+    }
+    return this.claimWinner(winner);
+  }
+
+  claimWinner(attempt) {
+    this.getModelEntry(attempt.model).wins++;
+    return attempt;
+  }
+
+  /**
+   * Resolve with the first attempt to become ready; reject only if all fail
+   */
+  firstReady(attempts) {
+    return new Promise((resolve, reject) => {
+      let failures = 0;
+      attempts.forEach((attempt) => {
+        attempt.ready.then(resolve, (error) => {
+          failures++;
+          if (failures === attempts.length) reject(error);
+        });
+      });
+    });
+  }
+
+  /**
+   * TTFT deadline for a model: options.deadlineMs, the configured fixed
+   * deadline, or the model's recent p95 within bounds. null = no hedging
+   */
+  getHedgeDeadline(model, options = {}) {
+    if (options.deadlineMs !== undefined) return options.deadlineMs;
+
+    const hedging = this.config.hedging;
+    if (!hedging.enabled) return null;
+    if (hedging.deadlineMs) return hedging.deadlineMs;
+
+    const series = `model:${model}`;
+    const p95 = this.latency.count(series) >= hedging.minSamples
+      ? this.latency.percentile(series, 0.95)
+      : hedging.maxDeadlineMs;
+    return Math.min(hedging.maxDeadlineMs, Math.max(hedging.minDeadlineMs, p95));
+  }
+
+  getModelEntry(model) {
+    let entry = this.modelStats.get(model);
+    if (!entry) {
+      entry = { requests: 0, wins: 0, errors: 0 };
+      this.modelStats.set(model, entry);
     }
+    return entry;
+  }
+
+  recordModelTtft(model, ms) {
+    this.latency.record(`model:${model}`, ms);
+  }
+
+  /**
+   * Per-model TTFT p50/p95 and hedging outcomes
+   */
+  getRoutingStats() {
+    const models = {};
+    this.modelStats.forEach((entry, model) => {
+      const summary = this.latency.summary(`model:${model}`);
+      models[model] = {
+        p50: summary.p50,
+        p95: summary.p95,
+        p99: summary.p99,
+        samples: summary.count,
+        requests: entry.requests,
+        wins: entry.wins,
+        errors: entry.errors
+      };
+    });
+
+    return {
+      ...this.hedgeStats,
+      deadlineMs: this.getHedgeDeadline(this.config.model),
+      models
+    };
   }
 
   /**
    * Process streaming response from Groq
+   * SSEParser scans the bytes once and hands over only the delta text
+   * Deltas read while the attempt was racing are replayed first
    */
-  async processStream(response) {
-    const reader = response.body.getReader();
-    const decoder = new TextDecoder();
+  async processStream(attempt, { recordHistory = true, collectTokens = false } = {}) {
+    const { reader, parser, recording } = attempt;
 
-    let fullResponse = '';
-    let currentSentence = '';
-    let buffer = '';
+    const tokens = collectTokens ? [] : null;
+    const writer = this.createResponseWriter(recordHistory);
+
+    const onDelta = (content, finishReason) => {
+      if (content) {
+        if (tokens) tokens.push(content);
+        writer.write(content);
+      }
+
+      // Check for finish reason
+      if (finishReason) {
+        console.log('[Groq] Finish reason:', finishReason);
+      }
+    };
 
     try {
+      const pending = attempt.pending;
+      attempt.pending = [];
+      for (let i = 0; i < pending.length; i++) {
+        onDelta(pending[i][0], pending[i][1]);
+      }
+
       while (true) {
         const { done, value } = await reader.read();
 
-        if (done) {
-          // Send any remaining content
-          if (currentSentence.trim()) {
-            this.emit('sentence', currentSentence.trim());
-          }
-          break;
-        }
+        if (done) break;
 
-        // Decode chunk
-        buffer += decoder.decode(value, { stream: true });
-
-        // Process complete lines
-        const lines = buffer.split('\n');
-        buffer = lines.pop() || ''; // Keep incomplete line in buffer
-
-        for (const line of lines) {
-          const trimmed = line.trim();
-
-          // Skip empty lines and comments
-          if (!trimmed || trimmed.startsWith(':')) continue;
-
-          // Parse SSE format
-          if (trimmed.startsWith('data: ')) {
-            const data = trimmed.slice(6);
-
-            // Check for end of stream
-            if (data === '[DONE]') {
-              continue;
-            }
-
-            try {
-              const parsed = JSON.parse(data);
-              const delta = parsed.choices?.[0]?.delta;
-
-              if (delta?.content) {
-                const content = delta.content;
-                fullResponse += content;
-                currentSentence += content;
-
-                // Emit word-level updates for real-time feedback
-                this.emit('token', content);
-
-                // Check for sentence boundaries
-                if (this.isSentenceBoundary(currentSentence)) {
-                  const sentence = currentSentence.trim();
-                  console.log('[Groq] Complete sentence:', sentence);
-                  this.emit('sentence', sentence);
-                  currentSentence = '';
-                }
-              }
-
-              // Check for finish reason
-              if (parsed.choices?.[0]?.finish_reason) {
-                console.log('[Groq] Finish reason:', parsed.choices[0].finish_reason);
-              }
-
-            } catch (error) {
-              console.error('[Groq] Error parsing chunk:', error);
-            }
-          }
+        if (recording) {
+          recording.push(value.slice());
         }
+
+        parser.push(value, onDelta);
       }
 
-      // Add complete response to history
-      this.conversationHistory.push({
-        role: 'assistant',
-        content: fullResponse
-      });
+      this.warm.lastActivityAt = Date.now();
+
+      if (recording) {
+        this.recordedStreams.push(recording);
+        if (this.recordedStreams.length > 20) {
+          this.recordedStreams.shift();
+        }
+      }
 
-      console.log('[Groq] Complete response:', fullResponse);
-      this.emit('complete', fullResponse);
+      const fullResponse = writer.finish();
+      return { tokens, response: fullResponse };
 
     } catch (error) {
       if (error.name !== 'AbortError') {
@@ -203,16 +429,195 @@ Current menu context will be provided for each conversation.`;
   }
 
   /**
-   * Check if current text contains a sentence boundary
-   * This enables early TTS start for lower latency
+   * Turns response text into token / sentence / complete events and
+   * records the answer; shared by live streams and cache replays
+   */
+  createResponseWriter(recordHistory) {
+    // Splits the stream into TTS-sized chunks, looking only at new text
+    const chunker = this.createChunker();
+    let fullResponse = '';
+
+    return {
+      write: (content) => {
+        fullResponse += content;
+
+        // Emit word-level updates for real-time feedback
+        this.emit('token', content);
+
+        const sentences = chunker.push(content);
+        for (let i = 0; i < sentences.length; i++) {
+          console.log('[Groq] Complete sentence:', sentences[i]);
+          this.emit('sentence', sentences[i]);
+        }
+      },
+
+      finish: () => {
+        // Send any remaining content
+        const rest = chunker.flush();
+        if (rest) {
+          this.emit('sentence', rest);
+        }
+
+        // Add complete response to history
+        if (recordHistory) {
+          this.context.addTurn('assistant', fullResponse);
+        }
+
+        console.log('[Groq] Complete response:', fullResponse);
+        this.emit('complete', fullResponse);
+        return fullResponse;
+      }
+    };
+  }
+
+  /**
+   * Play a cached answer through the same events as a live stream
+   */
+  replayResponse(tokens, recordHistory = true) {
+    const writer = this.createResponseWriter(recordHistory);
+    tokens.forEach(token => writer.write(token));
+    return writer.finish();
+  }
+
+  /**
+   * What besides the question shapes an answer, for cache keys
+   */
+  getCacheContext(options = {}) {
+    return {
+      systemPrompt: this.systemPrompt,
+      model: options.model || this.config.model,
+      context: this.context.getPinnedContents()
+    };
+  }
+
+  /**
+   * Hint the browser to open the DNS/TCP/TLS connection to Groq early
+   */
+  preconnect() {
+    if (typeof document === 'undefined' || GroqLLM.preconnected) return;
+    GroqLLM.preconnected = true;
+
+    const link = document.createElement('link');
+    link.rel = 'preconnect';
+    link.href = this.config.origin;
+    // fetch() to Groq is CORS without credentials - the pooled socket must match
+    link.crossOrigin = 'anonymous';
+    document.head.appendChild(link);
+  }
+
+  /**
+   * Open and authenticate the HTTP connection before the first turn
+   * A small GET on the same origin leaves a pooled HTTP/2 connection the
+   * first chat completion reuses. Never throws; returns whether it worked
+   */
+  async warmUp() {
+    if (!this.config.warmup || !this.apiKey) return false;
+    this.preconnect();
+
+    const startTime = Date.now();
+    try {
+      const response = await fetch(`${this.config.origin}/openai/v1/models`, {
+        headers: {
+          'Authorization': `Bearer ${this.apiKey}`
+        },
+        cache: 'no-store'
+      });
+      // Read the body so the connection goes back to the pool
+      await response.arrayBuffer();
+
+      if (!response.ok) {
+        throw new Error(`Warm-up failed: ${response.status} ${response.statusText}`);
+      }
+
+      this.warm.warmupMs = Date.now() - startTime;
+      this.warm.warmedAt = Date.now();
+      this.warm.lastActivityAt = this.warm.warmedAt;
+      console.log(`[Groq] Connection warmed in ${this.warm.warmupMs}ms`);
+      return true;
+
+    } catch (error) {
+      this.warm.failures++;
+      console.warn('[Groq] Connection warm-up failed:', error.message);
+      return false;
+    }
+  }
+
+  /**
+   * Re-warm periodically while a session is active so a pause in the
+   * conversation doesn't let the pooled connection idle out
+   */
+  startKeepWarm() {
+    if (!this.config.warmup || this.warm.timer) return;
+
+    this.warm.timer = setInterval(() => {
+      if (this.abortController) return;
+      if (Date.now() - this.warm.lastActivityAt < this.config.keepWarmMs) return;
+
+      this.warm.pings++;
+      this.warmUp();
+    }, Math.max(1000, this.config.keepWarmMs / 2));
+  }
+
+  stopKeepWarm() {
+    clearInterval(this.warm.timer);
+    this.warm.timer = null;
+  }
+
+  /**
+   * Record time from request to first streamed token
+   */
+  recordTtft(ms) {
+    this.emit('first_token', ms);
+
+    if (this.ttft.firstTurnMs === null) {
+      this.ttft.firstTurnMs = ms;
+      this.ttft.firstTurnWarmed = this.warm.warmedAt > 0;
+      console.log(`[Groq] First-turn TTFT: ${ms}ms (${this.ttft.firstTurnWarmed ? 'warm' : 'cold'})`);
+      return;
+    }
+
+    this.latency.record('steady_state', ms);
+  }
+
+  /**
+   * First-turn vs steady-state time to first token
+   */
+  getTtftStats() {
+    const steady = this.latency.summary('steady_state');
+    const median = steady.p50;
+
+    return {
+      firstTurnMs: this.ttft.firstTurnMs,
+      firstTurnWarmed: this.ttft.firstTurnWarmed,
+      steadyStateMedianMs: median,
+      steadyStateP95Ms: steady.p95,
+      steadyStateAvgMs: steady.count > 0 ? Math.round(steady.mean) : null,
+      steadyStateSamples: steady.count,
+      firstTurnPenaltyMs: this.ttft.firstTurnMs !== null && median !== null
+        ? this.ttft.firstTurnMs - median
+        : null,
+      warmupMs: this.warm.warmupMs,
+      keepWarmPings: this.warm.pings,
+      warmupFailures: this.warm.failures
+    };
+  }
+
+  /**
+   * Get response cache counters (hits, misses, latency saved)
    */
-  isSentenceBoundary(text) {
-    // Don't process very short text
-    if (text.trim().length < 10) return false;
+  getCacheStats() {
+    return this.responseCache.getStats();
+  }
 
-    // Check for sentence-ending punctuation followed by space or end
-    const sentenceEnders = /[.!?]\s+|[.!?]$/;
-    return sentenceEnders.test(text);
+  /**
+   * Sentence chunker for one response - SentenceChunker unless a custom
+   * factory is configured
+   */
+  createChunker() {
+    if (typeof this.config.chunker === 'function') {
+      return this.config.chunker(this.config.chunking);
+    }
+    return new SentenceChunker(this.config.chunking);
   }
 
   /**
@@ -228,11 +633,19 @@ Current menu context will be provided for each conversation.`;
   }
 
   /**
-   * Clear conversation history
+   * Record an exchange generated with { history: false }
+   */
+  commitExchange(userMessage, assistantMessage) {
+    this.context.addTurn('user', userMessage);
+    this.context.addTurn('assistant', assistantMessage);
+  }
+
+  /**
+   * Clear conversation history (added context stays pinned)
    */
   clearHistory() {
     console.log('[Groq] Clearing conversation history');
-    this.conversationHistory = [];
+    this.context.clear();
     this.emit('history_cleared');
   }
 
@@ -247,22 +660,27 @@ Current menu context will be provided for each conversation.`;
 
   /**
    * Add context to conversation (e.g., menu items)
+   * Context is pinned to every request; passing a key replaces the
+   * context previously added under it (e.g. key 'menu')
    */
-  addContext(context) {
-    const contextMessage = {
-      role: 'system',
-      content: `Context: ${context}`
-    };
-
-    this.conversationHistory.push(contextMessage);
+  addContext(context, key) {
+    const content = `Context: ${context}`;
+    this.context.pin(content, key ?? content);
     console.log('[Groq] Context added to conversation');
   }
 
   /**
-   * Get conversation history
+   * Get conversation history (pinned context, then recent turns)
    */
   getHistory() {
-    return this.conversationHistory;
+    return this.context.getHistory();
+  }
+
+  /**
+   * Get prompt budget counters (prompt tokens, compacted turns)
+   */
+  getContextStats() {
+    return this.context.getStats();
   }
 
   /**
@@ -279,7 +697,8 @@ Current menu context will be provided for each conversation.`;
   getStatus() {
     return {
       model: this.config.model,
-      conversationLength: this.conversationHistory.length,
+      conversationLength: this.context.turns.length,
+      promptTokens: this.context.stats.lastPromptTokens,
       isGenerating: this.abortController !== null
     };
   }
@@ -311,7 +730,7 @@ Current menu context will be provided for each conversation.`;
    */
   async testConnection() {
     try {
-      const response = await fetch('https://api.groq.com/openai/v1/models', {
+      const response = await fetch(`${this.config.origin}/openai/v1/models`, {
         headers: {
           'Authorization': `Bearer ${this.apiKey}`
         }
@@ -331,6 +750,9 @@ Current menu context will be provided for each conversation.`;
   }
 }
 
+GroqLLM.API_ORIGIN = 'https://api.groq.com';
+GroqLLM.preconnected = false;
+
 // Export for use in other modules
 if (typeof module !== 'undefined' && module.exports) {
   module.exports = GroqLLM;
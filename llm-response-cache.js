@@ -0,0 +1,246 @@
+/**
+ * LLM Response Cache
+ * TTL + LRU cache of LLM answers to FAQ-style questions (opening hours,
+ * delivery areas, "what's on the menu") so repeats skip the Groq round trip
+ * Keys combine the normalized question with a hash of the context that
+ * shapes the answer (system prompt, model, menu version, added context)
+ */
+
+class LLMResponseCache {
+  constructor(options = {}) {
+    this.options = {
+      enabled: true,
+      maxEntries: 200,
+      ttl: 30 * 60 * 1000,     // ms an answer stays valid
+      minWords: 2,
+      maxWords: 20,            // long turns are rarely repeated verbatim
+      menuVersion: '',         // bump when the menu or prices change
+      patterns: LLMResponseCache.FAQ_PATTERNS,
+      contextPatterns: LLMResponseCache.CONTEXT_PATTERNS,
+      ...options
+    };
+
+    // Map keeps insertion order - most recently used entries are last
+    this.entries = new Map();
+
+    this.stats = {
+      hits: 0,
+      misses: 0,
+      expired: 0,
+      evictions: 0,
+      latencySavedMs: 0
+    };
+
+    // Smoothed full-response latency of cacheable misses, used to
+    // estimate what each hit saved
+    this.missLatencyMs = 0;
+  }
+
+  /**
+   * Normalize text so trivially different questions share an entry
+   */
+  static normalizeText(text) {
+    return text.normalize('NFC').toLowerCase()
+      .replace(/[^\p{L}\p{N}\s]/gu, ' ')
+      .replace(/\s+/g, ' ')
+      .trim();
+  }
+
+  /**
+   * 32-bit FNV-1a, as 8 hex chars
+   */
+  static hash(text) {
+    let hash = 0x811C9DC5;
+    for (let i = 0; i < text.length; i++) {
+      hash ^= text.charCodeAt(i);
+      hash = Math.imul(hash, 0x01000193);
+    }
+    return (hash >>> 0).toString(16).padStart(8, '0');
+  }
+
+  /**
+   * Hash of everything besides the question that affects the answer
+   */
+  contextHash({ systemPrompt = '', model = '', context = [] }) {
+    return LLMResponseCache.hash([systemPrompt, model, this.options.menuVersion, ...context].join('\u0000'));
+  }
+
+  buildKey(userText, context) {
+    return `${this.contextHash(context)}|${LLMResponseCache.normalizeText(userText)}`;
+  }
+
+  /**
+   * Only standalone FAQ-style questions are cached; answers to "yes" or
+   * "two please" depend on the conversation and never are. The key leaves
+   * out the history, so the whole question has to match an FAQ shape and
+   * nothing in it may point at the caller's order, address or quantities
+   */
+  isCacheable(text) {
+    if (!this.options.enabled) return false;
+
+    const normalized = LLMResponseCache.normalizeText(text)
+      .replace(LLMResponseCache.FILLER, '')
+      .trim();
+    const words = normalized ? normalized.split(' ').length : 0;
+    if (words < this.options.minWords || words > this.options.maxWords) return false;
+
+    if (this.options.contextPatterns.some(pattern => pattern.test(normalized))) return false;
+    return this.options.patterns.some(pattern => pattern.test(normalized));
+  }
+
+  /**
+   * Look up an answer; returns { tokens, response } or null
+   */
+  get(key) {
+    const entry = this.entries.get(key);
+    if (!entry) {
+      this.stats.misses++;
+      return null;
+    }
+
+    if (Date.now() - entry.createdAt > this.options.ttl) {
+      this.entries.delete(key);
+      this.stats.expired++;
+      this.stats.misses++;
+      return null;
+    }
+
+    // Move to most-recently-used position
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+
+    this.stats.hits++;
+    this.stats.latencySavedMs += entry.latencyMs || this.missLatencyMs;
+    return entry;
+  }
+
+  /**
+   * Store an answer with the latency it took to generate
+   */
+  set(key, { tokens, response }, latencyMs) {
+    if (!response) return;
+
+    this.missLatencyMs = this.missLatencyMs
+      ? Math.round(this.missLatencyMs * 0.8 + latencyMs * 0.2)
+      : latencyMs;
+
+    this.entries.delete(key);
+    this.entries.set(key, { tokens, response, latencyMs, createdAt: Date.now() });
+    this.evict();
+  }
+
+  /**
+   * Evict least recently used entries until within limits
+   */
+  evict() {
+    while (this.entries.size > this.options.maxEntries) {
+      const oldestKey = this.entries.keys().next().value;
+      this.entries.delete(oldestKey);
+      this.stats.evictions++;
+    }
+  }
+
+  /**
+   * Invalidate every answer built on the old menu
+   */
+  setMenuVersion(version) {
+    this.options.menuVersion = String(version);
+  }
+
+  clear() {
+    this.entries.clear();
+  }
+
+  /**
+   * Check isCacheable against the corpus of questions that must and must
+   * not be cached
+   * Run from the browser console: LLMResponseCache.runCorpus()
+   */
+  static runCorpus(corpus = LLMResponseCache.CORPUS) {
+    const cache = new LLMResponseCache();
+    const failures = corpus.filter(({ text, cacheable }) => cache.isCacheable(text) !== cacheable);
+
+    const result = { cases: corpus.length, passed: corpus.length - failures.length, failures };
+    if (failures.length > 0) {
+      console.warn(`[LLMCache] ${failures.length}/${corpus.length} corpus case(s) failed`, failures);
+    } else {
+      console.log(`[LLMCache] All ${corpus.length} corpus cases passed`);
+    }
+    return result;
+  }
+
+  getStats() {
+    const lookups = this.stats.hits + this.stats.misses;
+    return {
+      ...this.stats,
+      hitRate: lookups > 0 ? +(this.stats.hits / lookups).toFixed(3) : 0,
+      avgMissLatencyMs: this.missLatencyMs,
+      entries: this.entries.size
+    };
+  }
+}
+
+// Greetings and politeness around a question (normalized text)
+LLMResponseCache.FILLER = /^((hi|hello|hey|please|sorry|excuse me|ok|okay|so) )+|( please)+$/;
+
+// Questions whose answers don't depend on the conversation so far -
+// matched against the whole normalized question, never a fragment
+LLMResponseCache.FAQ_PATTERNS = [
+  /^(what time|when) (do|does|will) (you|the (restaurant|kitchen|shop)) (open|close)( today| tonight| tomorrow| on (sundays?|saturdays?|weekends?|weekdays|public holidays))?$/,
+  /^what (are|s|is) (your|the) (opening |closing |business )?hours( today| on (sundays?|saturdays?|weekends?|weekdays|public holidays))?$/,
+  /^are you (open|closed) (today|tonight|tomorrow|now|on (sundays?|saturdays?|weekends?|weekdays|public holidays))$/,
+  /^(where|which areas?|what areas?) do you deliver( to)?$/,
+  /^(do you (do|offer) delivery|how much is (the )?delivery( fee)?|what is (the|your) delivery (fee|charge|cost|time)|how long does delivery (usually )?take)$/,
+  /^what (s|is) on (the|your) menu( today)?$/,
+  /^(can you |could you )?(read|show|tell) (me |us )?(the|your) menu$/,
+  /^(where are you( located)?|what is your address|where is the restaurant)$/,
+  /^(do|can) (you|i) (accept|take|pay (with|by)) (a )?(cards?|cash|transfers?|bank transfer|pos|credit cards?|debit cards?)$/,
+  /^(what|which) payment (methods|options) do you (accept|take)$/,
+  /^do you have (any )?(vegetarian|vegan|halal|gluten free) (options|dishes|meals|food)$/
+];
+
+// Anything that refers to the caller's own order, address, quantities or
+// earlier turns - the answer would differ per caller
+LLMResponseCache.CONTEXT_PATTERNS = [
+  /\b(my|mine|our|ours)\b/,
+  /\b(the|this|that|current) (order|food|meal|rider|driver|bill|total|basket|cart|address)\b/,
+  /\b(the|this|that|current) delivery\b(?! (fee|charge|cost|time|areas?)$)/,
+  /\d/,
+  /\b(one|two|three|four|five|six|seven|eight|nine|ten|twelve|dozen|couple|half)\b/,
+  /\b(street|road|avenue|lane|crescent|drive|estate|junction|phase|flat|apartment|house|close to|off)\b/,
+  /\b(it|this|that|these|those|them|same|again|instead|still)\b/
+];
+
+// Questions that must and must not be cached (LLMResponseCache.runCorpus())
+LLMResponseCache.CORPUS = [
+  { text: 'What time do you open today?', cacheable: true },
+  { text: 'Hi, when does the kitchen close on Sundays?', cacheable: true },
+  { text: 'What are your opening hours?', cacheable: true },
+  { text: 'Are you open on public holidays?', cacheable: true },
+  { text: 'Which areas do you deliver to?', cacheable: true },
+  { text: 'How much is the delivery fee?', cacheable: true },
+  { text: "What's on the menu today?", cacheable: true },
+  { text: 'Can you read me the menu, please?', cacheable: true },
+  { text: 'Where are you located?', cacheable: true },
+  { text: 'Do you accept bank transfer?', cacheable: true },
+  { text: 'Do you have any vegetarian options?', cacheable: true },
+  { text: 'Can you deliver my order to 5 Admiralty Way?', cacheable: false },
+  { text: 'I need it in two hours', cacheable: false },
+  { text: 'How many hours until my food arrives?', cacheable: false },
+  { text: 'What time will the delivery get here?', cacheable: false },
+  { text: 'Where is my order?', cacheable: false },
+  { text: 'Can you deliver to Bode Thomas Street?', cacheable: false },
+  { text: 'How long does delivery take to Lekki Phase 1?', cacheable: false },
+  { text: 'Change the delivery address to my office', cacheable: false },
+  { text: 'Add two more plates to the order', cacheable: false },
+  { text: 'How much is the total?', cacheable: false },
+  { text: 'Is it open on Sundays?', cacheable: false },
+  { text: 'Can I pay by card for this order?', cacheable: false },
+  { text: 'Do you have vegetarian options for the party of 12?', cacheable: false },
+  { text: 'Two please', cacheable: false }
+];
+
+// Export for use in other modules
+if (typeof module !== 'undefined' && module.exports) {
+  module.exports = LLMResponseCache;
+}
@@ -0,0 +1,297 @@
+/**
+ * Metrics Store
+ * Constant-memory latency/size metrics for any component
+ * Each named series keeps the last `windowSize` samples in a Float64Array
+ * ring (exact mean/percentiles over recent windows) and a lifetime
+ * log-linear histogram in a Uint32Array (HDR-style, ~3% relative error)
+ * so tail latency over the whole session stays visible.
+ * Recording is O(1) and allocates nothing
+ */
+
+class MetricsStore {
+  constructor(options = {}) {
+    this.options = {
+      windowSize: 256,   // recent samples kept per series
+      ...options
+    };
+
+    this.series = new Map();
+    // Shared sort buffer for windowed percentiles
+    this.scratch = new Float64Array(this.options.windowSize);
+  }
+
+  /**
+   * Get or create a series; options.windowSize overrides the default
+   */
+  getSeries(name, options = {}) {
+    let series = this.series.get(name);
+    if (!series) {
+      const windowSize = options.windowSize || this.options.windowSize;
+      series = {
+        ring: new Float64Array(windowSize),
+        head: 0,            // next write position
+        size: 0,            // samples in the ring
+        buckets: new Uint32Array(MetricsStore.BUCKET_COUNT),
+        count: 0,           // lifetime
+        sum: 0,
+        min: Infinity,
+        max: -Infinity,
+        last: 0
+      };
+      this.series.set(name, series);
+
+      if (windowSize > this.scratch.length) {
+        this.scratch = new Float64Array(windowSize);
+      }
+    }
+    return series;
+  }
+
+  /**
+   * Record one sample - O(1), no allocation
+   */
+  record(name, value) {
+    if (!Number.isFinite(value)) return;
+    const series = this.series.get(name) || this.getSeries(name);
+
+    series.ring[series.head] = value;
+    series.head = (series.head + 1) % series.ring.length;
+    if (series.size < series.ring.length) series.size++;
+
+    series.buckets[MetricsStore.bucketIndex(value)]++;
+    series.count++;
+    series.sum += value;
+    if (value < series.min) series.min = value;
+    if (value > series.max) series.max = value;
+    series.last = value;
+  }
+
+  count(name) {
+    const series = this.series.get(name);
+    return series ? series.count : 0;
+  }
+
+  /**
+   * Mean of the last `window` samples (default: the whole ring)
+   */
+  mean(name, window = Infinity) {
+    const series = this.series.get(name);
+    if (!series || series.size === 0) return 0;
+
+    const n = Math.min(window, series.size);
+    const length = series.ring.length;
+    let sum = 0;
+    for (let i = 1; i <= n; i++) {
+      sum += series.ring[(series.head - i + length) % length];
+    }
+    return sum / n;
+  }
+
+  /**
+   * Exact quantiles (0..1) over the last `window` samples
+   * Returns an array matching `quantiles`
+   */
+  windowQuantiles(name, quantiles, window = Infinity) {
+    const series = this.series.get(name);
+    if (!series || series.size === 0) return quantiles.map(() => null);
+
+    const n = Math.min(window, series.size);
+    const length = series.ring.length;
+    const sorted = this.scratch.subarray(0, n);
+    for (let i = 1; i <= n; i++) {
+      sorted[n - i] = series.ring[(series.head - i + length) % length];
+    }
+    sorted.sort();
+
+    return quantiles.map(q => sorted[Math.min(n - 1, Math.floor(q * n))]);
+  }
+
+  percentile(name, q, window = Infinity) {
+    return this.windowQuantiles(name, [q], window)[0];
+  }
+
+  /**
+   * Approximate quantiles over every sample ever recorded
+   */
+  lifetimeQuantiles(name, quantiles) {
+    const series = this.series.get(name);
+    if (!series || series.count === 0) return quantiles.map(() => null);
+
+    const results = new Array(quantiles.length).fill(null);
+    const targets = quantiles.map(q => Math.min(series.count, Math.floor(q * series.count) + 1));
+
+    let seen = 0;
+    let next = 0;
+    const order = quantiles.map((q, i) => i).sort((a, b) => targets[a] - targets[b]);
+    for (let index = 0; index < series.buckets.length && next < order.length; index++) {
+      seen += series.buckets[index];
+      while (next < order.length && seen >= targets[order[next]]) {
+        // Clamp the bucket midpoint to what was actually observed
+        const value = MetricsStore.bucketValue(index);
+        results[order[next]] = Math.min(series.max, Math.max(series.min, value));
+        next++;
+      }
+    }
+    return results;
+  }
+
+  /**
+   * Recent-window and lifetime summary of a series
+   */
+  summary(name, window = Infinity) {
+    const series = this.series.get(name);
+    if (!series || series.count === 0) {
+      return { count: 0, last: null, mean: 0, p50: null, p95: null, p99: null, max: null, lifetime: null };
+    }
+
+    const [p50, p95, p99, max] = this.windowQuantiles(name, [...MetricsStore.QUANTILES, 1], window);
+    const [lp50, lp95, lp99] = this.lifetimeQuantiles(name, MetricsStore.QUANTILES);
+    const round = value => Math.round(value * 10) / 10;
+
+    return {
+      count: Math.min(window, series.size),
+      last: round(series.last),
+      mean: round(this.mean(name, window)),
+      p50: round(p50),
+      p95: round(p95),
+      p99: round(p99),
+      max: round(max),
+      lifetime: {
+        count: series.count,
+        mean: round(series.sum / series.count),
+        p50: round(lp50),
+        p95: round(lp95),
+        p99: round(lp99),
+        min: round(series.min),
+        max: round(series.max)
+      }
+    };
+  }
+
+  /**
+   * Summaries of every series
+   */
+  snapshot(window = Infinity) {
+    const result = {};
+    this.series.forEach((series, name) => {
+      result[name] = this.summary(name, window);
+    });
+    return result;
+  }
+
+  reset(name = null) {
+    if (name !== null) {
+      this.series.delete(name);
+      return;
+    }
+    this.series.clear();
+  }
+
+  /**
+   * Log-linear bucket for a value: [0, 1) is bucket 0, then SUB_BUCKETS
+   * linear steps per power of two
+   */
+  static bucketIndex(value) {
+    if (value < 1) return 0;
+
+    const exponent = Math.floor(Math.log2(value));
+    if (exponent >= MetricsStore.MAX_EXPONENT) {
+      return MetricsStore.BUCKET_COUNT - 1;
+    }
+    const base = 2 ** exponent;
+    const sub = Math.floor(((value - base) / base) * MetricsStore.SUB_BUCKETS);
+    return 1 + exponent * MetricsStore.SUB_BUCKETS + sub;
+  }
+
+  /**
+   * Midpoint of a bucket
+   */
+  static bucketValue(index) {
+    if (index === 0) return 0.5;
+
+    const exponent = Math.floor((index - 1) / MetricsStore.SUB_BUCKETS);
+    const sub = (index - 1) % MetricsStore.SUB_BUCKETS;
+    const base = 2 ** exponent;
+    return base + (sub + 0.5) * (base / MetricsStore.SUB_BUCKETS);
+  }
+
+  /**
+   * Compare against the array pattern the components used (push, trim,
+   * copy + sort for a p95 on every query), and check lifetime quantile
+   * error against an exact sort
+   * Run from the browser console: MetricsStore.benchmark()
+   */
+  static benchmark({ samples = 200000, queryEvery = 10, windowSize = 256 } = {}) {
+    const now = () => (typeof performance !== 'undefined' ? performance.now() : Date.now());
+
+    // Log-normal-ish latencies around 400 ms with a long tail
+    const values = new Float64Array(samples);
+    for (let i = 0; i < samples; i++) {
+      const u = Math.random() || 1e-9;
+      values[i] = Math.exp(6 + 0.5 * Math.sqrt(-2 * Math.log(u)) * Math.cos(2 * Math.PI * Math.random()));
+    }
+
+    let sink = 0;
+    let start = now();
+    const legacy = [];
+    for (let i = 0; i < samples; i++) {
+      legacy.push(values[i]);
+      if (legacy.length > windowSize) legacy.shift();
+      if (i % queryEvery === 0) {
+        const sorted = legacy.slice().sort((a, b) => a - b);
+        sink += legacy.reduce((a, b) => a + b, 0) / legacy.length;
+        sink += sorted[Math.floor(sorted.length * 0.95)];
+      }
+    }
+    const legacyMs = now() - start;
+
+    const store = new MetricsStore({ windowSize });
+    start = now();
+    for (let i = 0; i < samples; i++) {
+      store.record('latency', values[i]);
+      if (i % queryEvery === 0) {
+        sink += store.mean('latency');
+        sink += store.percentile('latency', 0.95);
+      }
+    }
+    const storeMs = now() - start;
+
+    start = now();
+    for (let i = 0; i < samples; i++) {
+      store.record('record_only', values[i]);
+    }
+    const recordMs = now() - start;
+
+    const exact = Array.from(values).sort((a, b) => a - b);
+    const [p50, p95, p99] = store.lifetimeQuantiles('latency', MetricsStore.QUANTILES);
+    const error = (estimate, q) => {
+      const truth = exact[Math.min(samples - 1, Math.floor(q * samples))];
+      return +(Math.abs(estimate - truth) / truth * 100).toFixed(2);
+    };
+
+    const result = {
+      samples,
+      legacyMs: Math.round(legacyMs),
+      storeMs: Math.round(storeMs),
+      speedup: +(legacyMs / storeMs).toFixed(2),
+      nsPerRecord: Math.round((recordMs * 1e6) / samples),
+      p50ErrorPct: error(p50, 0.5),
+      p95ErrorPct: error(p95, 0.95),
+      p99ErrorPct: error(p99, 0.99),
+      bytesPerSeries: store.getSeries('latency').ring.byteLength + store.getSeries('latency').buckets.byteLength
+    };
+    console.table ? console.table(result) : console.log(result);
+    result.checksum = sink;
+    return result;
+  }
+}
+
+MetricsStore.SUB_BUCKETS = 16;
+MetricsStore.MAX_EXPONENT = 32;   // values up to 2^32 (ms, bytes...)
+MetricsStore.BUCKET_COUNT = 1 + MetricsStore.MAX_EXPONENT * MetricsStore.SUB_BUCKETS;
+MetricsStore.QUANTILES = [0.5, 0.95, 0.99];
+
+// Export for use in other modules
+if (typeof module !== 'undefined' && module.exports) {
+  module.exports = MetricsStore;
+}
@@ -0,0 +1,95 @@
+/**
+ * Microphone Capture Worklet
+ * AudioWorkletProcessor that slices microphone input into small frames
+ * (20 ms by default), converts them to Int16 on the audio thread and posts
+ * them to the main thread as transferable buffers
+ * Buffers sent back with { type: 'recycle' } are reused
+ *
+ * When targetSampleRate differs from the context rate, input is run through
+ * StreamingResampler (streaming-resampler.js must be added to the worklet first)
+ */
+
+class MicCaptureProcessor extends AudioWorkletProcessor {
+  constructor(options) {
+    super();
+
+    const opts = options.processorOptions || {};
+    const frameMs = opts.frameMs || 20;
+    const outputRate = opts.targetSampleRate || sampleRate;
+    this.frameSamples = Math.max(128, Math.round(outputRate * frameMs / 1000));
+
+    this.resampler = outputRate !== sampleRate
+      ? new globalThis.StreamingResampler(sampleRate, outputRate)
+      : null;
+
+    this.pool = [];
+    this.frame = this.takeBuffer();
+    this.offset = 0;
+    this.active = true;
+
+    this.port.onmessage = (event) => {
+      const message = event.data;
+      if (message.type === 'recycle' && message.buffer.byteLength === this.frameSamples * 2) {
+        if (this.pool.length < 16) {
+          this.pool.push(new Int16Array(message.buffer));
+        }
+      } else if (message.type === 'stop') {
+        this.active = false;
+      }
+    };
+  }
+
+  takeBuffer() {
+    return this.pool.pop() || new Int16Array(this.frameSamples);
+  }
+
+  /**
+   * Append already-converted Int16 samples to the current frame
+   */
+  pushSamples(samples) {
+    let i = 0;
+    while (i < samples.length) {
+      const count = Math.min(samples.length - i, this.frameSamples - this.offset);
+      this.frame.set(samples.subarray(i, i + count), this.offset);
+      this.offset += count;
+      i += count;
+
+      if (this.offset === this.frameSamples) {
+        this.postFrame();
+      }
+    }
+  }
+
+  postFrame() {
+    const buffer = this.frame.buffer;
+    this.port.postMessage({ type: 'frame', buffer, frame: currentFrame }, [buffer]);
+    this.frame = this.takeBuffer();
+    this.offset = 0;
+  }
+
+  process(inputs) {
+    const input = inputs[0];
+    if (!this.active) return false;
+    if (!input || input.length === 0) return true;
+
+    const channel = input[0];
+
+    if (this.resampler) {
+      this.pushSamples(this.resampler.process(channel));
+      return true;
+    }
+
+    for (let i = 0; i < channel.length; i++) {
+      const s = channel[i] < -1 ? -1 : channel[i] > 1 ? 1 : channel[i];
+      this.frame[this.offset++] = s < 0 ? s * 0x8000 : s * 0x7FFF;
+
+      if (this.offset === this.frameSamples) {
+        this.postFrame();
+      }
+    }
+
+    return true;
+  }
+}
+
+registerProcessor('mic-capture', MicCaptureProcessor);
@@ -8,13 +8,52 @@ class MiniMaxAPI {
   constructor(config) {
     this.config = config;
     this.ws = null;
-    this.audioQueue = [];
+    this.connections = new Map();   // voiceId -> pooled connection
+    this.activeConnection = null;
     this.isPlaying = false;
     this.audioContext = null;
-    this.currentSource = null;
-    this.reconnectAttempts = 0;
+    this.player = null;
+    this.outputAnalyser = null;  // playback level, the barge-in echo reference
+    this.outputLevelData = null;
+    this.ingestor = new AudioChunkIngestor();
+    this.binaryFraming = false;
+    this.cache = new TTSPhraseCache(config.ttsCache);
+    this.cacheLoaded = null;
+    this.ttsRequests = [];     // in-flight requests, in playback order
+    this.turnId = 1;           // tags every request so stale audio can be dropped
+    this.turnSeq = 0;
+    this.cancelledTurnId = 0;  // turns at or below this id were interrupted
+    this.turnStats = {
+      requests: 0,
+      maxInFlight: 0,
+      staleChunksDropped: 0,
+      staleBytesDropped: 0
+    };
+    this.voiceId = null;
     this.sessionId = null;
+    this.evictTimer = null;    // closes idle pooled sockets
     this.listeners = {};
+
+    // Negotiated downlink format (see TTSFormatNegotiator)
+    this.streamFormat = null;
+    this.transportStats = { bytes: 0, durationMs: 0 };
+
+    // Backoff reconnect; text sent during an outage is replayed afterwards
+    this.reconnector = new ReconnectManager('MiniMax', {
+      baseDelay: config.performance.reconnectDelay ?? 250,
+      maxAttempts: config.performance.maxReconnectAttempts ?? 8,
+      ...config.performance.reconnect,
+      connect: () => this.connect(this.voiceId),
+      send: ({ text, options }) => this.streamText(text, options)
+    });
+
+    this.reconnector.on('reconnecting', (info) => {
+      this.emit('reconnecting', info);
+    });
+
+    this.reconnector.on('recovered', (info) => {
+      this.emit('recovered', info);
+    });
   }
 
   /**
@@ -27,124 +66,415 @@ class MiniMaxAPI {
         latencyHint: this.config.audioContext.latencyHint
       });
     }
+
+    if (!this.player) {
+      this.player = this.createPlayer();
+
+      this.player.on('playback_start', (info) => {
+        this.emit('playback_start', info);
+      });
+
+      this.player.on('underrun', (info) => {
+        console.warn('[MiniMax] Playback underrun at chunk', info.chunk);
+      });
+
+      this.player.on('drained', (turnMetrics) => {
+        this.isPlaying = false;
+        this.transportStats.bytes += turnMetrics.bytes || 0;
+        this.transportStats.durationMs += turnMetrics.durationMs || 0;
+        this.emit('playback_complete', turnMetrics);
+      });
+
+      this.player.on('error', (error) => {
+        this.emit('error', error);
+      });
+
+      // Measured the same way as the VAD mic level so the two compare
+      this.outputAnalyser = this.audioContext.createAnalyser();
+      this.outputAnalyser.fftSize = 2048;
+      this.outputAnalyser.smoothingTimeConstant = 0.3;
+      this.outputLevelData = new Uint8Array(this.outputAnalyser.frequencyBinCount);
+      this.player.output.connect(this.outputAnalyser);
+    }
+
     return this.audioContext;
   }
 
   /**
-   * Connect to MiniMax streaming WebSocket
+   * Create the playback engine for the configured streaming format
+   * Raw PCM goes straight to an AudioWorklet ring buffer; anything
+   * else is decoded and scheduled on the audio clock
+   */
+  createPlayer() {
+    const sourceSampleRate = this.getStreamFormat().sampleRate || this.audioContext.sampleRate;
+
+    if (this.isPcmStreaming()) {
+      return new PcmStreamPlayer(this.audioContext, {
+        ...this.config.playback,
+        sourceSampleRate
+      });
+    }
+
+    if (this.getStreamFormat().format === 'opus' && typeof AudioDecoder !== 'undefined') {
+      return new OpusStreamPlayer(this.audioContext, {
+        ...this.config.playback,
+        sourceSampleRate
+      });
+    }
+
+    return new AudioPlaybackScheduler(this.audioContext, this.config.playback);
+  }
+
+  /**
+   * Check if the TTS stream is raw PCM
+   */
+  isPcmStreaming() {
+    return this.getStreamFormat().format === 'pcm' &&
+      typeof AudioWorkletNode !== 'undefined';
+  }
+
+  /**
+   * Downlink format in use - negotiated, or straight from config
+   */
+  getStreamFormat() {
+    return this.streamFormat || {
+      format: this.config.streaming.format,
+      sampleRate: this.config.streaming.sampleRate,
+      bitrate: this.config.streaming.bitrate
+    };
+  }
+
+  /**
+   * Negotiate the most compact format this browser can decode (once)
+   */
+  async negotiateFormat() {
+    if (!this.streamFormat) {
+      this.streamFormat = await TTSFormatNegotiator.negotiate(this.config.streaming);
+      this.emit('format_negotiated', this.streamFormat);
+    }
+    return this.streamFormat;
+  }
+
+  /**
+   * Get downlink bandwidth per second of speech for the negotiated format
+   */
+  getTransportStats() {
+    const { bytes, durationMs } = this.transportStats;
+    return {
+      ...this.getStreamFormat(),
+      bytes,
+      speechMs: durationMs,
+      bytesPerSecond: durationMs > 0 ? Math.round(bytes / (durationMs / 1000)) : 0
+    };
+  }
+
+  /**
+   * Connect to MiniMax streaming WebSocket and make voiceId the active voice
    */
   async connect(voiceId) {
-    return new Promise((resolve, reject) => {
-      try {
-        // Initialize audio context
-        this.initAudioContext();
+    // Pick the downlink format before the player is created
+    await this.negotiateFormat();
+
+    // Initialize audio context
+    this.initAudioContext();
+
+    // Warm the phrase cache from IndexedDB (once)
+    if (!this.cacheLoaded) {
+      this.cacheLoaded = this.cache.load();
+    }
+
+    const connection = await this.openConnection(voiceId);
+    this.activate(connection);
+
+    this.emit('connected');
+    this.reconnector.markConnected();
+  }
+
+  /**
+   * Open (or reuse) an authenticated socket for a voice
+   */
+  openConnection(voiceId) {
+    const existing = this.connections.get(voiceId);
+    if (existing && existing.ws.readyState <= WebSocket.OPEN) {
+      return existing.ready;
+    }
+
+    const connection = {
+      voiceId,
+      ws: null,
+      ready: null,
+      sessionId: null,
+      binaryFraming: false,
+      lastUsed: Date.now()
+    };
 
+    connection.ready = new Promise((resolve, reject) => {
+      try {
         // Build WebSocket URL with authentication
         const wsUrl = `${this.config.endpoints.websocket}?voice_id=${voiceId}&group_id=${this.config.groupId}`;
 
-        this.ws = new WebSocket(wsUrl);
-        this.ws.binaryType = 'arraybuffer';
+        const ws = new WebSocket(wsUrl);
+        ws.binaryType = 'arraybuffer';
+        connection.ws = ws;
 
         // Connection opened
-        this.ws.onopen = () => {
-          console.log('[MiniMax] WebSocket connected');
-          this.reconnectAttempts = 0;
+        ws.onopen = () => {
+          console.log(`[MiniMax] WebSocket connected (${voiceId})`);
 
           // Send authentication
-          this.ws.send(JSON.stringify({
+          ws.send(JSON.stringify({
             type: 'auth',
             api_key: this.config.apiKey,
             group_id: this.config.groupId,
             model: this.config.model,
-            voice_id: voiceId
+            voice_id: voiceId,
+            format: this.getStreamFormat().format,
+            binary_frames: this.config.streaming.binaryFraming !== false
           }));
 
-          this.emit('connected');
-          resolve();
+          resolve(connection);
         };
 
         // Message received
-        this.ws.onmessage = (event) => {
-          this.handleMessage(event);
+        ws.onmessage = (event) => {
+          this.handleMessage(event, connection);
         };
 
         // Connection closed
-        this.ws.onclose = () => {
-          console.log('[MiniMax] WebSocket closed');
-          this.emit('disconnected');
-
-          // Auto-reconnect if enabled
-          if (this.config.performance.autoReconnect &&
-              this.reconnectAttempts < this.config.performance.maxReconnectAttempts) {
-            this.reconnectAttempts++;
-            setTimeout(() => {
-              console.log(`[MiniMax] Reconnecting... (${this.reconnectAttempts}/${this.config.performance.maxReconnectAttempts})`);
-              this.connect(voiceId);
-            }, this.config.performance.reconnectDelay);
-          }
+        ws.onclose = () => {
+          console.log(`[MiniMax] WebSocket closed (${voiceId})`);
+          this.handleConnectionClosed(connection);
         };
 
         // Error handling
-        this.ws.onerror = (error) => {
+        ws.onerror = (error) => {
           console.error('[MiniMax] WebSocket error:', error);
-          this.emit('error', error);
+          if (connection === this.activeConnection) {
+            this.emit('error', error);
+          }
           reject(error);
         };
 
-        // Keep-alive ping
-        if (this.config.performance.pingInterval) {
-          this.pingInterval = setInterval(() => {
-            if (this.ws && this.ws.readyState === WebSocket.OPEN) {
-              this.ws.send(JSON.stringify({ type: 'ping' }));
-            }
-          }, this.config.performance.pingInterval);
-        }
+        this.connections.set(voiceId, connection);
+        this.startKeepAlive();
+        this.startEviction();
 
       } catch (error) {
         console.error('[MiniMax] Connection error:', error);
         reject(error);
       }
     });
+
+    return connection.ready;
+  }
+
+  /**
+   * Route TTS requests to a connection
+   */
+  activate(connection) {
+    this.activeConnection = connection;
+    this.ws = connection.ws;
+    this.voiceId = connection.voiceId;
+    this.sessionId = connection.sessionId;
+    this.binaryFraming = connection.binaryFraming;
+    connection.lastUsed = Date.now();
+  }
+
+  /**
+   * Clean up after a pooled socket closes
+   */
+  handleConnectionClosed(connection) {
+    if (this.connections.get(connection.voiceId) === connection) {
+      this.connections.delete(connection.voiceId);
+    }
+
+    const isActive = connection === this.activeConnection;
+
+    // Requests on this socket will never complete. Ones that had not
+    // produced audio yet are replayed once the active voice reconnects
+    const lost = this.ttsRequests.filter(request => request.connection === connection);
+    this.ttsRequests = this.ttsRequests.filter(request => request.connection !== connection);
+
+    if (isActive && this.config.performance.autoReconnect) {
+      lost
+        .filter(request => request.received === 0 && !this.isStale(request))
+        .forEach(request => this.reconnector.enqueue(
+          { text: request.text, options: request.options },
+          request.text.length
+        ));
+    }
+    this.advanceQueue();
+
+    if (!isActive) return;
+
+    this.ws = null;
+    this.emit('disconnected');
+
+    // Auto-reconnect the active voice with backoff and jitter
+    if (this.config.performance.autoReconnect) {
+      this.reconnector.connectionLost();
+    }
+  }
+
+  /**
+   * Keep sockets for other voices authenticated and ready
+   */
+  async prewarm(voiceIds) {
+    const maxWarm = this.config.pool?.maxWarm ?? 3;
+    const targets = voiceIds
+      .filter(voiceId => !this.connections.has(voiceId))
+      .slice(0, Math.max(0, maxWarm - this.connections.size));
+
+    const results = await Promise.allSettled(targets.map(voiceId => this.openConnection(voiceId)));
+    results.forEach((result, i) => {
+      if (result.status === 'rejected') {
+        console.warn(`[MiniMax] Could not pre-warm voice ${targets[i]}`);
+      }
+    });
+
+    this.evictIdleConnections();
+    console.log(`[MiniMax] Warm connections: ${Array.from(this.connections.keys()).join(', ')}`);
+  }
+
+  /**
+   * Switch the active voice - a pointer swap when the socket is warm
+   * Audio already queued keeps playing on the shared AudioContext
+   */
+  async switchVoice(voiceId) {
+    if (this.activeConnection && this.activeConnection.voiceId === voiceId &&
+        this.isConnected()) {
+      return;
+    }
+
+    const warm = this.connections.get(voiceId);
+    const connection = warm && warm.ws.readyState === WebSocket.OPEN
+      ? warm
+      : await this.openConnection(voiceId);
+
+    this.activate(connection);
+    this.reconnector.markConnected();
+    this.evictIdleConnections();
+    this.emit('voice_switched', { voiceId, warm: connection === warm });
+  }
+
+  /**
+   * Shared keep-alive: ping every pooled socket
+   */
+  startKeepAlive() {
+    if (this.pingInterval || !this.config.performance.pingInterval) return;
+
+    this.pingInterval = setInterval(() => {
+      this.connections.forEach((connection) => {
+        if (connection.ws.readyState === WebSocket.OPEN) {
+          connection.ws.send(JSON.stringify({ type: 'ping' }));
+        }
+      });
+    }, this.config.performance.pingInterval);
+  }
+
+  /**
+   * Evict idle sockets on their own timer - keep-alive pings may be off
+   * Checks four times per idleTimeout, so a socket closes within 1.25x of it
+   */
+  startEviction() {
+    if (this.evictTimer) return;
+
+    const idleTimeout = this.config.pool?.idleTimeout ?? 120000;
+    this.evictTimer = setInterval(() => this.evictIdleConnections(),
+      Math.max(1000, Math.round(idleTimeout / 4)));
+  }
+
+  /**
+   * Close warm sockets that exceed the keep-alive budget
+   */
+  evictIdleConnections() {
+    const idleTimeout = this.config.pool?.idleTimeout ?? 120000;
+    const maxWarm = this.config.pool?.maxWarm ?? 3;
+    const now = Date.now();
+
+    const idle = Array.from(this.connections.values())
+      .filter(connection => connection !== this.activeConnection)
+      .sort((a, b) => a.lastUsed - b.lastUsed);
+
+    let warmCount = this.connections.size;
+    idle.forEach((connection) => {
+      const busy = this.ttsRequests.some(request => request.connection === connection);
+      if (busy) return;
+
+      if (now - connection.lastUsed > idleTimeout || warmCount > maxWarm) {
+        console.log(`[MiniMax] Evicting idle connection (${connection.voiceId})`);
+        this.connections.delete(connection.voiceId);
+        connection.ws.close();
+        warmCount--;
+      }
+    });
   }
 
   /**
    * Handle incoming WebSocket messages
    */
-  handleMessage(event) {
-    // Binary audio data
+  handleMessage(event, connection = this.activeConnection) {
+    // Binary audio data - only TTS traffic counts as use, so pongs
+    // do not keep an idle socket from being evicted
     if (event.data instanceof ArrayBuffer) {
-      this.handleAudioChunk(event.data);
+      connection.lastUsed = Date.now();
+      const frame = connection.binaryFraming ? this.ingestor.parseBinaryFrame(event.data) : null;
+      if (frame) {
+        this.handleAudioChunk(frame.payload, connection, frame);
+      } else {
+        this.handleAudioChunk(event.data, connection);
+      }
       return;
     }
 
-    // JSON messages
+    // JSON messages - audio_chunk payloads are decoded without a full JSON.parse
     try {
-      const message = JSON.parse(event.data);
+      const pooled = this.player && this.player.copiesInput === true;
+      const { message, audio } = this.ingestor.parseTextMessage(event.data, { pooled });
 
       switch (message.type) {
         case 'auth_success':
           console.log('[MiniMax] Authentication successful');
-          this.sessionId = message.session_id;
+          connection.sessionId = message.session_id;
+          connection.binaryFraming = message.binary_frames === true;
+          if (connection === this.activeConnection) {
+            this.sessionId = connection.sessionId;
+            this.binaryFraming = connection.binaryFraming;
+          }
           this.emit('authenticated', message);
           break;
 
-        case 'audio_start':
+        case 'audio_start': {
+          const request = this.findRequest(connection, message);
+          if (request && this.isStale(request)) break;
           console.log('[MiniMax] Audio stream started');
           this.emit('audio_start');
           break;
+        }
 
         case 'audio_chunk':
-          // Audio data in base64 format
-          if (message.audio) {
-            const audioData = this.base64ToArrayBuffer(message.audio);
-            this.handleAudioChunk(audioData);
+          // Audio data in base64 format, already decoded by the ingestor
+          connection.lastUsed = Date.now();
+          if (audio && audio.byteLength > 0) {
+            this.handleAudioChunk(audio, connection, message);
+            if (pooled) {
+              this.ingestor.release(audio);
+            }
           }
           break;
 
-        case 'audio_end':
-          console.log('[MiniMax] Audio stream ended');
-          this.emit('audio_end');
+        case 'audio_end': {
+          connection.lastUsed = Date.now();
+          const request = this.findRequest(connection, message);
+          const stale = request && this.isStale(request);
+          this.completeRequest(request);
+          if (!stale) {
+            console.log('[MiniMax] Audio stream ended');
+            this.emit('audio_end');
+          }
+          this.advanceQueue();
           break;
+        }
 
         case 'transcript':
           console.log('[MiniMax] Transcript:', message.text);
@@ -170,62 +500,204 @@ class MiniMaxAPI {
 
   /**
    * Handle incoming audio chunks
+   * Chunks of interrupted turns are dropped; chunks of later requests
+   * are held until every earlier request has finished playing
    */
-  handleAudioChunk(arrayBuffer) {
-    // Add to queue for sequential playback
-    this.audioQueue.push(arrayBuffer);
-    this.emit('audio_chunk', arrayBuffer);
+  handleAudioChunk(audioData, connection = this.activeConnection, tag = null) {
+    const request = this.findRequest(connection, tag);
+
+    if (request) {
+      request.received++;
 
-    // Start playback if not already playing
-    if (!this.isPlaying) {
-      this.playNextChunk();
+      // Keep a copy for the phrase cache before the player consumes it
+      if (request.chunks) {
+        request.chunks.push(audioData instanceof ArrayBuffer ? audioData.slice(0) : audioData.slice().buffer);
+      }
+
+      if (this.isStale(request)) {
+        this.turnStats.staleChunksDropped++;
+        this.turnStats.staleBytesDropped += audioData.byteLength;
+        return;
+      }
+
+      if (request !== this.getPlayhead()) {
+        // Pooled views are recycled by the caller, so hold a private copy
+        request.buffered.push(audioData instanceof ArrayBuffer ? audioData : audioData.slice());
+        return;
+      }
     }
+
+    this.playChunk(audioData);
   }
 
   /**
-   * Play audio chunks from queue
+   * Send a chunk to the player
    */
-  async playNextChunk() {
-    if (this.audioQueue.length === 0) {
-      this.isPlaying = false;
-      this.emit('playback_complete');
-      return;
-    }
+  playChunk(audioData) {
+    this.emit('audio_chunk', audioData);
 
+    // PCM frames go straight to the ring buffer; encoded chunks are
+    // decoded ahead and scheduled back to back on the audio clock
     this.isPlaying = true;
-    const audioData = this.audioQueue.shift();
+    this.player.enqueue(audioData);
+  }
 
-    try {
-      // Decode audio data
-      const audioBuffer = await this.audioContext.decodeAudioData(audioData);
+  /**
+   * Find the request a server message belongs to
+   * Uses the echoed turn id / sequence when present, otherwise the oldest
+   * unfinished request on the connection (the server answers in order)
+   */
+  findRequest(connection, tag) {
+    const turnId = tag?.turnId ?? tag?.turn_id;
+    const seq = tag?.seq;
+
+    if (turnId !== undefined && seq !== undefined) {
+      const tagged = this.ttsRequests.find(request =>
+        !request.cached &&
+        (request.turnId & 0xFFFF) === (turnId & 0xFFFF) &&
+        request.seq === seq);
+      if (tagged) return tagged;
+    }
+
+    return this.ttsRequests.find(request =>
+      !request.cached && !request.done && request.connection === connection);
+  }
 
-      // Create buffer source
-      const source = this.audioContext.createBufferSource();
-      source.buffer = audioBuffer;
-      source.connect(this.audioContext.destination);
+  /**
+   * Whether a request belongs to an interrupted turn
+   */
+  isStale(request) {
+    return request.turnId <= this.cancelledTurnId;
+  }
+
+  /**
+   * The live request whose audio should be playing now
+   */
+  getPlayhead() {
+    return this.ttsRequests.find(request => !this.isStale(request));
+  }
 
-      // Store current source for interruption handling
-      this.currentSource = source;
+  /**
+   * Start a new turn; later streamText calls are tagged with it
+   */
+  beginTurn() {
+    this.turnId++;
+    this.turnSeq = 0;
+    return this.turnId;
+  }
 
-      // Play next chunk when this one finishes
-      source.onended = () => {
-        this.currentSource = null;
-        this.playNextChunk();
-      };
+  /**
+   * Get turn multiplexing counters
+   */
+  getTurnStats() {
+    return {
+      ...this.turnStats,
+      turnId: this.turnId,
+      inFlight: this.ttsRequests.filter(request => !request.cached && !request.done).length
+    };
+  }
 
-      source.start(0);
+  /**
+   * Milliseconds of decoded audio queued ahead of the playhead
+   */
+  getBufferedMs() {
+    return this.player ? this.player.getBufferedMs() : 0;
+  }
 
-    } catch (error) {
-      console.error('[MiniMax] Error decoding audio:', error);
-      this.playNextChunk(); // Continue to next chunk
+  /**
+   * Current playback level (RMS of analyser bins, 0..1)
+   */
+  getOutputLevel() {
+    if (!this.outputAnalyser || !this.isPlaying) return 0;
+
+    this.outputAnalyser.getByteFrequencyData(this.outputLevelData);
+    let sum = 0;
+    for (let i = 0; i < this.outputLevelData.length; i++) {
+      const normalized = this.outputLevelData[i] / 255.0;
+      sum += normalized * normalized;
     }
+    return Math.sqrt(sum / this.outputLevelData.length);
+  }
+
+  /**
+   * Time from scheduling a sample to hearing it
+   */
+  getOutputLatencyMs() {
+    if (!this.audioContext) return 0;
+    return Math.round((this.audioContext.outputLatency || this.audioContext.baseLatency || 0) * 1000);
+  }
+
+  /**
+   * Characters of live requests whose audio hasn't started arriving -
+   * speech that is coming but not yet in the player
+   */
+  getUnstartedChars() {
+    let chars = 0;
+    this.ttsRequests.forEach((request) => {
+      if (!request.cached && !request.done && request.received === 0 && !this.isStale(request)) {
+        chars += request.text.length;
+      }
+    });
+    return chars;
+  }
+
+  /**
+   * Whether the reply is still audible or more of it is on the way - a
+   * request's stream ending says nothing about its audio having played
+   */
+  hasPendingAudio() {
+    if (this.player && this.player.isActive()) return true;
+    return this.ttsRequests.some(request => !request.cached && !request.done && !this.isStale(request));
+  }
+
+  /**
+   * Get playback metrics (underruns and scheduling slack per turn)
+   */
+  getPlaybackMetrics() {
+    return this.player ? this.player.getMetrics() : null;
   }
 
   /**
    * Stream text to speech with ultra-low latency
+   * Cached phrases play immediately without touching the network
    */
   streamText(text, options = {}) {
+    const voiceSettings = {
+      ...this.config.streaming.voiceSettings,
+      ...options.voiceSettings
+    };
+    const speed = options.speed || this.config.streaming.speed;
+
+    const cacheKey = this.cache.isCacheable(text)
+      ? TTSPhraseCache.buildKey({
+        voiceId: this.voiceId,
+        model: this.config.model,
+        text,
+        voiceSettings,
+        speed,
+        // Cached bytes only play back in the format they were synthesized in
+        format: `${this.getStreamFormat().format}@${this.getStreamFormat().bitrate || ''}`
+      })
+      : null;
+
+    const turnId = options.turnId || this.turnId;
+    const seq = this.turnSeq++;
+
+    const cached = cacheKey ? this.cache.get(cacheKey) : null;
+    if (cached) {
+      console.log('[MiniMax] Phrase cache hit:', text.substring(0, 50));
+      // Keep sentence order behind requests still streaming
+      this.ttsRequests.push({ cached, turnId, seq });
+      this.advanceQueue();
+      return;
+    }
+
     if (!this.ws || this.ws.readyState !== WebSocket.OPEN) {
+      if (this.reconnector.isRecovering()) {
+        console.warn('[MiniMax] Reconnecting - text queued for replay');
+        this.reconnector.enqueue({ text, options }, text.length);
+        return;
+      }
       console.error('[MiniMax] WebSocket not connected');
       return;
     }
@@ -234,55 +706,152 @@ class MiniMaxAPI {
       type: 'tts',
       text: text,
       model: this.config.model,
-      voice_settings: {
-        ...this.config.streaming.voiceSettings,
-        ...options.voiceSettings
-      },
+      voice_settings: voiceSettings,
       streaming: true,
-      format: this.config.streaming.format,
-      sample_rate: this.config.streaming.sampleRate,
-      speed: options.speed || this.config.streaming.speed
+      format: this.getStreamFormat().format,
+      sample_rate: this.getStreamFormat().sampleRate,
+      bitrate: this.getStreamFormat().bitrate,
+      speed: speed,
+      turn_id: turnId,
+      seq: seq
     };
 
+    this.activeConnection.lastUsed = Date.now();
+    this.ttsRequests.push({
+      connection: this.activeConnection,
+      text,
+      options,
+      turnId,
+      seq,
+      received: 0,
+      buffered: [],
+      done: false,
+      key: cacheKey,
+      chunks: cacheKey ? [] : null
+    });
+
+    this.turnStats.requests++;
+    this.turnStats.maxInFlight = Math.max(this.turnStats.maxInFlight, this.getTurnStats().inFlight);
+
     console.log('[MiniMax] Streaming text:', text.substring(0, 50) + '...');
     this.ws.send(JSON.stringify(payload));
   }
 
+  /**
+   * Mark a request finished and cache its audio
+   */
+  completeRequest(request) {
+    if (!request) return;
+
+    request.done = true;
+    if (request.key && request.chunks.length > 0) {
+      this.cache.set(request.key, request.chunks);
+    }
+  }
+
+  /**
+   * Play whatever is now at the head of the queue, in order
+   * Finished and stale requests are removed; cached phrases replay
+   * as soon as everything ahead of them has been played
+   */
+  advanceQueue() {
+    let i = 0;
+    while (i < this.ttsRequests.length) {
+      const request = this.ttsRequests[i];
+
+      if (this.isStale(request)) {
+        // Stale network requests stay until their audio_end so in-order
+        // matching keeps working for untagged servers
+        if (request.cached || request.done) {
+          this.ttsRequests.splice(i, 1);
+        } else {
+          i++;
+        }
+        continue;
+      }
+
+      if (request.cached) {
+        this.ttsRequests.splice(i, 1);
+        this.replayPhrase(request.cached);
+        continue;
+      }
+
+      // Live request at the playhead - release anything it buffered
+      request.buffered.forEach(chunk => this.playChunk(chunk));
+      request.buffered = [];
+
+      if (request.done) {
+        this.ttsRequests.splice(i, 1);
+        continue;
+      }
+      break;
+    }
+  }
+
+  /**
+   * Play cached audio through the normal playback path
+   */
+  replayPhrase(chunks) {
+    this.emit('audio_start');
+    this.isPlaying = true;
+
+    // Players may detach their input, so hand them copies
+    chunks.forEach((chunk) => {
+      const copy = chunk.slice(0);
+      this.emit('audio_chunk', copy);
+      this.player.enqueue(copy);
+    });
+
+    this.emit('audio_end');
+  }
+
+  /**
+   * Get reconnect metrics (time to recover, replayed and dropped text)
+   */
+  getConnectionMetrics() {
+    return this.reconnector.getMetrics();
+  }
+
+  /**
+   * Get phrase cache counters (hits, misses, bytes saved)
+   */
+  getCacheStats() {
+    return this.cache.getStats();
+  }
+
   /**
    * Interrupt current audio playback
+   * Returns the fade applied - 0 when nothing was playing
    */
-  interrupt() {
+  interrupt(fadeOutMs = this.config.interruption.fadeOutDuration) {
     console.log('[MiniMax] Interrupting playback');
 
-    // Stop current audio source
-    if (this.currentSource) {
+    // Stop scheduled audio, fading out for smooth interruption
+    let fadedMs = 0;
+    if (this.player) {
       try {
-        // Fade out for smooth interruption
-        if (this.config.interruption.fadeOutDuration > 0) {
-          const gainNode = this.audioContext.createGain();
-          this.currentSource.disconnect();
-          this.currentSource.connect(gainNode);
-          gainNode.connect(this.audioContext.destination);
-          gainNode.gain.exponentialRampToValueAtTime(
-            0.01,
-            this.audioContext.currentTime + (this.config.interruption.fadeOutDuration / 1000)
-          );
-        }
-
-        this.currentSource.stop();
-        this.currentSource = null;
+        if (this.player.isActive()) fadedMs = fadeOutMs || 0;
+        this.player.stop(fadeOutMs);
       } catch (error) {
         console.error('[MiniMax] Error stopping audio:', error);
       }
     }
 
-    // Clear audio queue if configured
-    if (this.config.interruption.clearQueueOnInterrupt) {
-      this.audioQueue = [];
-    }
+    // Everything sent so far belongs to a cancelled turn: audio still
+    // arriving for it is discarded, and later requests start a new turn
+    this.cancelledTurnId = this.turnId;
+    this.beginTurn();
+    this.ttsRequests.forEach((request) => {
+      request.buffered = [];
+    });
+    this.advanceQueue();
+
+    // Text waiting for a reconnect has not started yet - drop it
+    this.reconnector.clearOutbox();
 
     this.isPlaying = false;
     this.emit('interrupted');
+    return fadedMs;
   }
 
   /**
@@ -313,21 +882,42 @@ class MiniMaxAPI {
   disconnect() {
     console.log('[MiniMax] Disconnecting...');
 
-    // Clear ping interval
+    // Intentional close - no reconnect
+    this.reconnector.stop();
+
+    // Clear ping and eviction timers
     if (this.pingInterval) {
       clearInterval(this.pingInterval);
+      this.pingInterval = null;
+    }
+    if (this.evictTimer) {
+      clearInterval(this.evictTimer);
+      this.evictTimer = null;
     }
 
     // Stop playback
     this.interrupt();
 
-    // Close WebSocket
-    if (this.ws) {
-      this.ws.close();
-      this.ws = null;
-    }
+    // Close every pooled WebSocket
+    this.activeConnection = null;
+    this.connections.forEach((connection) => {
+      connection.ws.close();
+    });
+    this.connections.clear();
+    this.ws = null;
+    this.ttsRequests = [];
 
     // Close audio context
+    if (this.outputAnalyser) {
+      this.outputAnalyser.disconnect();
+      this.outputAnalyser = null;
+    }
+
+    if (this.player) {
+      this.player.destroy();
+      this.player = null;
+    }
+
     if (this.audioContext) {
       this.audioContext.close();
       this.audioContext = null;
@@ -340,13 +930,7 @@ class MiniMaxAPI {
    * Utility: Convert base64 to ArrayBuffer
    */
   base64ToArrayBuffer(base64) {
-    const binaryString = window.atob(base64);
-    const len = binaryString.length;
-    const bytes = new Uint8Array(len);
-    for (let i = 0; i < len; i++) {
-      bytes[i] = binaryString.charCodeAt(i);
-    }
-    return bytes.buffer;
+    return this.ingestor.decodeBase64(base64).buffer;
   }
 
   /**
@@ -0,0 +1,103 @@
+/**
+ * Opus Stream Player
+ * Decodes raw Opus packets with WebCodecs AudioDecoder and schedules the
+ * output gaplessly through AudioPlaybackScheduler
+ * Each enqueued chunk must hold exactly one Opus packet
+ */
+
+class OpusStreamPlayer extends AudioPlaybackScheduler {
+  constructor(audioContext, options = {}) {
+    super(audioContext, options);
+
+    this.decoderConfig = {
+      codec: 'opus',
+      sampleRate: options.sourceSampleRate || 48000,
+      numberOfChannels: 1
+    };
+    this.timestamp = 0;   // microseconds, required by EncodedAudioChunk
+
+    // EncodedAudioChunk copies its input synchronously
+    this.copiesInput = true;
+    this.createDecoder();
+  }
+
+  createDecoder() {
+    this.decoder = new AudioDecoder({
+      output: (audioData) => this.handleDecoded(audioData),
+      error: (error) => {
+        console.error('[Opus] Decoder error:', error);
+        this.turnMetrics.decodeErrors++;
+        this.pendingDecodes = 0;
+        this.emit('error', error);
+        // A failed decoder is closed - start a fresh one
+        this.createDecoder();
+      }
+    });
+    this.decoder.configure(this.decoderConfig);
+  }
+
+  /**
+   * Queue one Opus packet (ArrayBuffer or Uint8Array view)
+   */
+  enqueue(data) {
+    const bytes = data instanceof ArrayBuffer ? new Uint8Array(data) : data;
+    this.turnMetrics.bytes += bytes.byteLength;
+    this.pendingDecodes++;
+
+    this.decoder.decode(new EncodedAudioChunk({
+      type: 'key',
+      timestamp: this.timestamp,
+      data: bytes
+    }));
+
+    // Opus packets are 20 ms unless told otherwise; only used for ordering
+    this.timestamp += 20000;
+  }
+
+  /**
+   * Copy decoder output into an AudioBuffer and schedule it
+   */
+  handleDecoded(audioData) {
+    try {
+      const buffer = this.audioContext.createBuffer(
+        audioData.numberOfChannels,
+        audioData.numberOfFrames,
+        audioData.sampleRate
+      );
+
+      for (let channel = 0; channel < audioData.numberOfChannels; channel++) {
+        audioData.copyTo(buffer.getChannelData(channel), {
+          planeIndex: channel,
+          format: 'f32-planar'
+        });
+      }
+
+      this.scheduleBuffer(buffer);
+    } finally {
+      audioData.close();
+      this.pendingDecodes = Math.max(0, this.pendingDecodes - 1);
+      this.checkDrained();
+    }
+  }
+
+  stop(fadeOutMs = 0) {
+    // Drop packets still inside the decoder
+    if (this.decoder.state === 'configured') {
+      this.decoder.reset();
+      this.decoder.configure(this.decoderConfig);
+    }
+    super.stop(fadeOutMs);
+  }
+
+  destroy() {
+    super.destroy();
+    if (this.decoder.state !== 'closed') {
+      this.decoder.close();
+    }
+  }
+}
+
+// Export for use in other modules
+if (typeof module !== 'undefined' && module.exports) {
+  module.exports = OpusStreamPlayer;
+}
@@ -0,0 +1,155 @@
+/**
+ * PCM Backlog
+ * Bounded ring buffer of captured Int16 mic audio, sized in milliseconds
+ * Every frame is recorded; frames that could not be delivered (socket down
+ * or still connecting) stay pending and are drained, oldest first, once the
+ * socket is back - so words spoken during an outage still reach STT
+ */
+
+class PcmBacklog {
+  constructor(options = {}) {
+    this.options = {
+      sampleRate: 16000,
+      capacityMs: 5000,     // oldest pending audio is overwritten beyond this
+      chunkMs: 250,         // size of each message when draining
+      ...options
+    };
+
+    this.capacity = Math.round(this.options.sampleRate * this.options.capacityMs / 1000);
+    this.ring = new Int16Array(this.capacity);
+
+    // Absolute sample counters; position in the ring is counter % capacity
+    this.written = 0;
+    this.sent = 0;
+
+    this.stats = {
+      drains: 0,
+      recoveredMs: 0,
+      lostMs: 0,
+      lastRecoveredMs: 0
+    };
+    this.lostSinceDrain = 0;
+  }
+
+  /**
+   * Record a frame (ArrayBuffer or Int16Array); the data is copied
+   */
+  write(frame) {
+    const samples = frame instanceof ArrayBuffer ? new Int16Array(frame) : frame;
+    let input = samples;
+
+    // Only the newest `capacity` samples of an oversized frame can be kept
+    if (input.length > this.capacity) {
+      input = input.subarray(input.length - this.capacity);
+    }
+
+    let position = (this.written + samples.length - input.length) % this.capacity;
+    let offset = 0;
+    while (offset < input.length) {
+      const count = Math.min(input.length - offset, this.capacity - position);
+      this.ring.set(input.subarray(offset, offset + count), position);
+      offset += count;
+      position = (position + count) % this.capacity;
+    }
+    this.written += samples.length;
+
+    // Pending audio older than the ring is gone
+    const overflow = this.written - this.sent - this.capacity;
+    if (overflow > 0) {
+      this.sent += overflow;
+      this.lostSinceDrain += overflow;
+    }
+  }
+
+  /**
+   * Mark everything recorded so far as delivered
+   */
+  markSent() {
+    this.sent = this.written;
+  }
+
+  /**
+   * Mark up to `samples` of the most recently skipped audio as pending
+   * again (pre-roll); returns how many samples were rewound
+   */
+  rewind(samples) {
+    const count = Math.max(0, Math.min(samples, this.sent, this.capacity - this.pendingSamples()));
+    this.sent -= count;
+    return count;
+  }
+
+  pendingSamples() {
+    return this.written - this.sent;
+  }
+
+  pendingMs() {
+    return this.toMs(this.pendingSamples());
+  }
+
+  toMs(samples) {
+    return Math.round(samples * 1000 / this.options.sampleRate);
+  }
+
+  /**
+   * Send pending audio in order through send(ArrayBuffer)
+   * Returns { recoveredMs, lostMs } for this drain
+   */
+  drain(send) {
+    const pending = this.pendingSamples();
+    const lostMs = this.toMs(this.lostSinceDrain);
+    this.lostSinceDrain = 0;
+
+    const chunkSamples = Math.round(this.options.sampleRate * this.options.chunkMs / 1000);
+    while (this.sent < this.written) {
+      const count = Math.min(this.written - this.sent, chunkSamples);
+      const chunk = new Int16Array(count);
+      const start = this.sent % this.capacity;
+      const first = Math.min(count, this.capacity - start);
+
+      chunk.set(this.ring.subarray(start, start + first));
+      if (first < count) {
+        chunk.set(this.ring.subarray(0, count - first), first);
+      }
+
+      send(chunk.buffer);
+      this.sent += count;
+    }
+
+    const recoveredMs = this.toMs(pending);
+    this.stats.drains++;
+    this.stats.recoveredMs += recoveredMs;
+    this.stats.lostMs += lostMs;
+    this.stats.lastRecoveredMs = recoveredMs;
+
+    return { recoveredMs, lostMs };
+  }
+
+  /**
+   * Drop pending audio without sending it (e.g. reconnect gave up)
+   */
+  discardPending() {
+    this.lostSinceDrain += this.pendingSamples();
+    this.stats.lostMs += this.toMs(this.lostSinceDrain);
+    this.lostSinceDrain = 0;
+    this.sent = this.written;
+  }
+
+  reset() {
+    this.written = 0;
+    this.sent = 0;
+    this.lostSinceDrain = 0;
+  }
+
+  getStats() {
+    return {
+      ...this.stats,
+      pendingMs: this.pendingMs(),
+      capacityMs: this.options.capacityMs
+    };
+  }
+}
+
+// Export for use in other modules
+if (typeof module !== 'undefined' && module.exports) {
+  module.exports = PcmBacklog;
+}
@@ -0,0 +1,185 @@
+/**
+ * PCM Player Worklet
+ * AudioWorkletProcessor that plays 16-bit PCM straight out of a ring buffer
+ * Runs on the audio rendering thread - no decode step, no per-chunk allocation
+ *
+ * Ring buffer layout (shared with PcmStreamPlayer):
+ *   state[0] = read index   (owned by this processor)
+ *   state[1] = write index  (owned by the main thread)
+ *   state[2] = flush sequence - bumped by the main thread to request a reset
+ *   state[3] = flush target - write index at the time of the flush request
+ *   state[4] = flush fade - output frames to fade out over before the reset
+ */
+
+const STATE_READ = 0;
+const STATE_WRITE = 1;
+const STATE_FLUSH_SEQ = 2;
+const STATE_FLUSH_TO = 3;
+const STATE_FLUSH_FADE = 4;
+
+class PcmPlayerProcessor extends AudioWorkletProcessor {
+  constructor(options) {
+    super();
+
+    const opts = options.processorOptions || {};
+    this.step = (opts.sourceSampleRate || sampleRate) / sampleRate;
+    this.position = 0;       // fractional read position for resampling
+    this.playing = false;
+    this.lastFlushSeq = 0;
+    this.fadeFrames = 0;     // length of the fade-out in progress
+    this.fadeLeft = 0;       // output frames left in it
+    this.fadeTo = 0;         // read index to jump to once it ends
+
+    if (opts.sharedBuffer) {
+      // Lock-free single-producer/single-consumer mode
+      this.state = new Int32Array(opts.sharedState);
+      this.data = new Int16Array(opts.sharedBuffer);
+      this.shared = true;
+    } else {
+      // Fallback: frames are transferred over the port into a local ring
+      this.state = new Int32Array(5);
+      this.data = new Int16Array(opts.capacity || sampleRate * 10);
+      this.shared = false;
+      this.port.onmessage = (event) => this.handleMessage(event.data);
+    }
+
+    this.capacity = this.data.length;
+  }
+
+  /**
+   * Fallback mode: receive frames and flush requests from the main thread
+   */
+  handleMessage(message) {
+    if (message.type === 'write') {
+      this.writeLocal(new Int16Array(message.buffer));
+    } else if (message.type === 'flush') {
+      this.flush(this.state[STATE_WRITE], message.fadeFrames || 0);
+    }
+  }
+
+  /**
+   * Skip to `target`, first fading out what is playing over `fadeFrames`
+   * Frames written after the request lie beyond `target` and are kept
+   */
+  flush(target, fadeFrames) {
+    if (this.fadeLeft > 0) {
+      this.fadeTo = target;
+      return;
+    }
+    if (fadeFrames > 0 && this.playing) {
+      this.fadeFrames = fadeFrames;
+      this.fadeLeft = fadeFrames;
+      this.fadeTo = target;
+      return;
+    }
+    this.storeState(STATE_READ, target);
+    this.position = 0;
+  }
+
+  writeLocal(samples) {
+    let write = this.state[STATE_WRITE];
+    const read = this.state[STATE_READ];
+    const free = (read - write - 1 + this.capacity) % this.capacity;
+    const count = Math.min(samples.length, free);
+
+    const first = Math.min(count, this.capacity - write);
+    this.data.set(samples.subarray(0, first), write);
+    if (count > first) {
+      this.data.set(samples.subarray(first, count), 0);
+    }
+
+    write = (write + count) % this.capacity;
+    this.state[STATE_WRITE] = write;
+
+    if (count < samples.length) {
+      this.port.postMessage({ type: 'overflow', dropped: samples.length - count });
+    }
+  }
+
+  loadState(index) {
+    return this.shared ? Atomics.load(this.state, index) : this.state[index];
+  }
+
+  storeState(index, value) {
+    if (this.shared) {
+      Atomics.store(this.state, index, value);
+    } else {
+      this.state[index] = value;
+    }
+  }
+
+  process(inputs, outputs) {
+    const output = outputs[0][0];
+    const capacity = this.capacity;
+
+    // Honour a pending flush (interruption) by jumping the read index
+    if (this.shared) {
+      const flushSeq = Atomics.load(this.state, STATE_FLUSH_SEQ);
+      if (flushSeq !== this.lastFlushSeq) {
+        this.lastFlushSeq = flushSeq;
+        this.flush(Atomics.load(this.state, STATE_FLUSH_TO), Atomics.load(this.state, STATE_FLUSH_FADE));
+      }
+    }
+
+    // While fading out, play only up to the flush target
+    const fading = this.fadeLeft > 0;
+    let read = this.loadState(STATE_READ);
+    const write = fading ? this.fadeTo : this.loadState(STATE_WRITE);
+    let available = (write - read + capacity) % capacity;
+    let position = this.position;
+    let fadeLeft = this.fadeLeft;
+    let i = 0;
+
+    // Need two samples for linear interpolation
+    while (i < output.length && available > 1 && !(fading && fadeLeft === 0)) {
+      const s0 = this.data[read];
+      const s1 = this.data[(read + 1) % capacity];
+      let sample = (s0 + (s1 - s0) * position) / 32768;
+      if (fading) {
+        sample *= fadeLeft / this.fadeFrames;
+        fadeLeft--;
+      }
+      output[i++] = sample;
+
+      position += this.step;
+      while (position >= 1 && available > 1) {
+        position -= 1;
+        read = (read + 1) % capacity;
+        available--;
+      }
+    }
+
+    this.position = position;
+    this.fadeLeft = fadeLeft;
+    this.storeState(STATE_READ, read);
+
+    // Fade finished (or the old audio ran out first) - drop the rest
+    if (fading && (fadeLeft === 0 || available <= 1)) {
+      this.fadeLeft = 0;
+      this.storeState(STATE_READ, this.fadeTo);
+      this.position = 0;
+    }
+
+    if (i > 0 && !this.playing) {
+      this.playing = true;
+      this.port.postMessage({ type: 'playback_start', frame: currentFrame });
+    }
+
+    if (i < output.length) {
+      output.fill(0, i);
+      if (this.playing) {
+        this.playing = false;
+        this.port.postMessage({ type: 'drained', frame: currentFrame + i });
+      }
+    }
+
+    // Copy to any additional output channels
+    for (let c = 1; c < outputs[0].length; c++) {
+      outputs[0][c].set(output);
+    }
+
+    return true;
+  }
+}
+
+registerProcessor('pcm-player', PcmPlayerProcessor);
@@ -0,0 +1,297 @@
+/**
+ * PCM Stream Player
+ * Raw PCM playback for the MiniMax 'pcm' streaming format
+ * Writes incoming frames straight into a ring buffer read by an
+ * AudioWorkletProcessor - no decodeAudioData, no AudioBuffer per chunk
+ */
+
+class PcmStreamPlayer {
+  constructor(audioContext, options = {}) {
+    this.audioContext = audioContext;
+    this.options = {
+      workletUrl: 'pcm-player-worklet.js',
+      sourceSampleRate: audioContext.sampleRate,
+      bufferSeconds: 10,
+      ...options
+    };
+
+    this.sourceSampleRate = this.options.sourceSampleRate;
+    this.capacity = Math.ceil(this.sourceSampleRate * this.options.bufferSeconds);
+
+    // SharedArrayBuffer needs a cross-origin isolated page
+    this.shared = typeof SharedArrayBuffer !== 'undefined' &&
+      (typeof crossOriginIsolated === 'undefined' || crossOriginIsolated);
+
+    if (this.shared) {
+      this.state = new Int32Array(new SharedArrayBuffer(5 * Int32Array.BYTES_PER_ELEMENT));
+      this.data = new Int16Array(new SharedArrayBuffer(this.capacity * Int16Array.BYTES_PER_ELEMENT));
+    }
+
+    this.output = audioContext.createGain();
+    this.output.connect(audioContext.destination);
+
+    // Input is copied synchronously only when writing to the shared ring
+    this.copiesInput = this.shared;
+
+    this.node = null;
+    this.pending = [];
+    this.carryByte = -1;       // odd trailing byte from the previous frame
+    this.playing = false;
+    this.playStartTime = 0;
+    this.samplesWritten = 0;
+    this.listeners = {};
+
+    this.resetTurnMetrics();
+    this.lastTurnMetrics = null;
+
+    this.ready = this.loadWorklet();
+  }
+
+  /**
+   * Load the worklet module and create the player node
+   */
+  async loadWorklet() {
+    try {
+      await this.audioContext.audioWorklet.addModule(this.options.workletUrl);
+
+      this.node = new AudioWorkletNode(this.audioContext, 'pcm-player', {
+        numberOfInputs: 0,
+        numberOfOutputs: 1,
+        outputChannelCount: [1],
+        processorOptions: {
+          sourceSampleRate: this.sourceSampleRate,
+          capacity: this.capacity,
+          sharedState: this.shared ? this.state.buffer : null,
+          sharedBuffer: this.shared ? this.data.buffer : null
+        }
+      });
+
+      this.node.port.onmessage = (event) => this.handleWorkletMessage(event.data);
+      this.node.connect(this.output);
+
+      console.log(`[PCM] Player ready (${this.shared ? 'shared ring buffer' : 'message port'})`);
+
+      // Flush frames that arrived while the module was loading
+      const pending = this.pending;
+      this.pending = [];
+      pending.forEach(frame => this.enqueue(frame));
+    } catch (error) {
+      console.error('[PCM] Failed to load worklet:', error);
+      this.emit('error', error);
+    }
+  }
+
+  resetTurnMetrics() {
+    this.turnMetrics = {
+      chunks: 0,
+      bytes: 0,
+      droppedSamples: 0
+    };
+  }
+
+  /**
+   * Queue a frame of 16-bit little-endian mono PCM (ArrayBuffer or Uint8Array view)
+   * In shared mode the samples are copied into the ring before this returns,
+   * so callers may reuse the input buffer afterwards
+   */
+  enqueue(data) {
+    if (!this.node) {
+      // Keep a private copy - the caller may recycle its buffer
+      this.pending.push(data instanceof ArrayBuffer ? data : data.slice());
+      return;
+    }
+
+    const bytes = data instanceof ArrayBuffer ? new Uint8Array(data) : data;
+
+    this.turnMetrics.chunks++;
+    this.turnMetrics.bytes += bytes.byteLength;
+
+    let offset = 0;
+    let byteLength = bytes.byteLength;
+
+    // Stitch a sample split across frame boundaries
+    if (this.carryByte >= 0 && byteLength > 0) {
+      const sample = ((bytes[0] << 8) | this.carryByte) << 16 >> 16;
+      this.writeSamples(Int16Array.of(sample));
+      this.carryByte = -1;
+      offset = 1;
+      byteLength -= 1;
+    }
+
+    if (byteLength % 2 === 1) {
+      this.carryByte = bytes[offset + byteLength - 1];
+      byteLength -= 1;
+    }
+
+    if (byteLength === 0) return;
+
+    const byteOffset = bytes.byteOffset + offset;
+    if (byteOffset % 2 === 0) {
+      this.writeSamples(new Int16Array(bytes.buffer, byteOffset, byteLength / 2));
+    } else {
+      // Unaligned view - copy once into an aligned buffer
+      this.writeSamples(new Int16Array(bytes.slice(offset, offset + byteLength).buffer));
+    }
+  }
+
+  /**
+   * Write samples into the ring buffer (or post them in fallback mode)
+   */
+  writeSamples(samples) {
+    this.samplesWritten += samples.length;
+
+    if (!this.shared) {
+      const buffer = samples.byteOffset === 0 && samples.byteLength === samples.buffer.byteLength
+        ? samples.buffer
+        : samples.slice().buffer;
+      this.node.port.postMessage({ type: 'write', buffer }, [buffer]);
+      return;
+    }
+
+    const capacity = this.capacity;
+    const read = Atomics.load(this.state, 0);
+    let write = Atomics.load(this.state, 1);
+    const free = (read - write - 1 + capacity) % capacity;
+    const count = Math.min(samples.length, free);
+
+    const first = Math.min(count, capacity - write);
+    this.data.set(samples.subarray(0, first), write);
+    if (count > first) {
+      this.data.set(samples.subarray(first, count), 0);
+    }
+
+    write = (write + count) % capacity;
+    Atomics.store(this.state, 1, write);
+
+    if (count < samples.length) {
+      this.turnMetrics.droppedSamples += samples.length - count;
+    }
+  }
+
+  handleWorkletMessage(message) {
+    switch (message.type) {
+      case 'playback_start':
+        this.playing = true;
+        this.playStartTime = this.audioContext.currentTime;
+        this.emit('playback_start', { startTime: this.playStartTime, leadMs: 0 });
+        break;
+
+      case 'drained':
+        this.playing = false;
+        this.samplesWritten = 0;
+        this.lastTurnMetrics = this.summarizeTurn();
+        this.resetTurnMetrics();
+        this.emit('drained', this.lastTurnMetrics);
+        break;
+
+      case 'overflow':
+        this.turnMetrics.droppedSamples += message.dropped;
+        break;
+    }
+  }
+
+  summarizeTurn() {
+    const m = this.turnMetrics;
+    return {
+      chunks: m.chunks,
+      bytes: m.bytes,
+      droppedSamples: m.droppedSamples,
+      durationMs: Math.round((m.bytes / 2 / this.sourceSampleRate) * 1000),
+      bytesPerSecond: this.sourceSampleRate * 2
+    };
+  }
+
+  /**
+   * Milliseconds of audio queued ahead of the playhead
+   */
+  getBufferedMs() {
+    if (this.shared) {
+      const available = (Atomics.load(this.state, 1) - Atomics.load(this.state, 0) + this.capacity) % this.capacity;
+      return Math.round((available / this.sourceSampleRate) * 1000);
+    }
+
+    // Fallback: estimate from what was written since playback started
+    const writtenMs = (this.samplesWritten / this.sourceSampleRate) * 1000;
+    const playedMs = this.playing ? (this.audioContext.currentTime - this.playStartTime) * 1000 : 0;
+    return Math.max(0, Math.round(writtenMs - playedMs));
+  }
+
+  isActive() {
+    return this.playing || this.pending.length > 0 || this.getBufferedMs() > 0;
+  }
+
+  /**
+   * Interrupt playback by resetting the ring buffer indices, optionally
+   * fading out first
+   * No nodes are stopped; the worklet ramps what is playing down to
+   * silence over fadeOutMs, then skips the rest of what is queued
+   */
+  stop(fadeOutMs = 0) {
+    this.pending = [];
+    this.carryByte = -1;
+    this.samplesWritten = 0;
+
+    const fadeFrames = Math.max(0, Math.round((fadeOutMs / 1000) * this.audioContext.sampleRate));
+
+    if (this.shared) {
+      // The worklet owns the read index; ask it to jump to the current write index
+      Atomics.store(this.state, 3, Atomics.load(this.state, 1));
+      Atomics.store(this.state, 4, fadeFrames);
+      Atomics.add(this.state, 2, 1);
+    } else if (this.node) {
+      this.node.port.postMessage({ type: 'flush', fadeFrames });
+    }
+
+    if (this.turnMetrics.chunks > 0) {
+      this.lastTurnMetrics = { ...this.summarizeTurn(), interrupted: true };
+    }
+    this.resetTurnMetrics();
+  }
+
+  getMetrics() {
+    return {
+      current: this.summarizeTurn(),
+      lastTurn: this.lastTurnMetrics,
+      bufferedMs: this.getBufferedMs(),
+      mode: this.shared ? 'shared' : 'message'
+    };
+  }
+
+  destroy() {
+    this.stop();
+    if (this.node) {
+      this.node.port.onmessage = null;
+      this.node.disconnect();
+      this.node = null;
+    }
+    this.output.disconnect();
+    this.listeners = {};
+  }
+
+  /**
+   * Event listener system
+   */
+  on(event, callback) {
+    if (!this.listeners[event]) {
+      this.listeners[event] = [];
+    }
+    this.listeners[event].push(callback);
+  }
+
+  off(event, callback) {
+    if (this.listeners[event]) {
+      this.listeners[event] = this.listeners[event].filter(cb => cb !== callback);
+    }
+  }
+
+  emit(event, data) {
+    if (this.listeners[event]) {
+      this.listeners[event].forEach(callback => callback(data));
+    }
+  }
+}
+
+// Export for use in other modules
+if (typeof module !== 'undefined' && module.exports) {
+  module.exports = PcmStreamPlayer;
+}
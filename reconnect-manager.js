@@ -0,0 +1,254 @@
+/**
+ * Reconnect Manager
+ * Shared reconnect engine for the streaming WebSockets
+ * Exponential backoff with jitter, tracked timers, a bounded outbox that
+ * is replayed after reconnect, and time-to-recover metrics
+ */
+
+class ReconnectManager {
+  constructor(name, options = {}) {
+    this.name = name;
+    this.options = {
+      baseDelay: 250,        // ms before the first retry
+      maxDelay: 10000,       // ms cap on any single wait
+      multiplier: 2,
+      jitter: 0.5,           // fraction of the delay that is randomized
+      maxAttempts: 8,
+      outboxLimit: 50,       // max queued items
+      outboxBytes: 256000,   // max queued bytes
+      outboxMaxAge: 15000,   // ms - older items are not replayed
+      ...options
+    };
+
+    this.connectFn = this.options.connect;
+    this.sendFn = this.options.send;
+
+    this.state = 'idle';     // idle | connected | waiting | connecting | stopped
+    this.attempts = 0;
+    this.timer = null;
+    this.lostAt = 0;
+
+    this.outbox = [];
+    this.outboxBytes = 0;
+    this.listeners = {};
+
+    this.metrics = {
+      disconnects: 0,
+      recoveries: 0,
+      failedAttempts: 0,
+      gaveUp: 0,
+      replayed: 0,
+      dropped: 0,
+      expired: 0,
+      recoverTimes: []
+    };
+  }
+
+  /**
+   * Call when the socket has opened (first connect or reconnect)
+   */
+  markConnected() {
+    const recovering = this.state === 'waiting' || this.state === 'connecting';
+    this.clearTimer();
+    this.state = 'connected';
+    this.attempts = 0;
+
+    if (recovering) {
+      const recoverMs = Date.now() - this.lostAt;
+      this.metrics.recoveries++;
+      this.metrics.recoverTimes.push(recoverMs);
+      if (this.metrics.recoverTimes.length > 50) {
+        this.metrics.recoverTimes.shift();
+      }
+
+      const replayed = this.flush();
+      console.log(`[${this.name}] Recovered in ${recoverMs}ms, replayed ${replayed} item(s)`);
+      this.emit('recovered', { recoverMs, replayed });
+    }
+  }
+
+  /**
+   * Call when the socket closed unexpectedly
+   */
+  connectionLost() {
+    if (this.state !== 'connected') return;
+
+    this.state = 'waiting';
+    this.lostAt = Date.now();
+    this.metrics.disconnects++;
+    this.scheduleAttempt();
+  }
+
+  /**
+   * Wait with backoff and jitter, then try to reconnect
+   */
+  scheduleAttempt() {
+    if (this.attempts >= this.options.maxAttempts) {
+      console.error(`[${this.name}] Giving up after ${this.attempts} reconnect attempts`);
+      this.state = 'idle';
+      this.metrics.gaveUp++;
+      this.clearOutbox();
+      this.emit('gave_up', { attempts: this.attempts });
+      return;
+    }
+
+    const delay = this.getDelay(this.attempts);
+    this.emit('reconnecting', { attempt: this.attempts + 1, delay });
+
+    this.clearTimer();
+    this.timer = setTimeout(() => {
+      this.timer = null;
+      this.attempt();
+    }, delay);
+  }
+
+  /**
+   * Backoff delay for an attempt number
+   */
+  getDelay(attempt) {
+    const { baseDelay, maxDelay, multiplier, jitter } = this.options;
+    const exponential = Math.min(maxDelay, baseDelay * Math.pow(multiplier, attempt));
+    const randomized = exponential * (1 - jitter + Math.random() * jitter);
+    return Math.round(randomized);
+  }
+
+  attempt() {
+    if (this.state !== 'waiting') return;
+
+    this.state = 'connecting';
+    this.attempts++;
+    console.log(`[${this.name}] Reconnecting... (${this.attempts}/${this.options.maxAttempts})`);
+
+    Promise.resolve()
+      .then(() => this.connectFn())
+      .catch((error) => {
+        if (this.state !== 'connecting') return;
+        console.warn(`[${this.name}] Reconnect attempt failed:`, error?.message || error);
+        this.metrics.failedAttempts++;
+        this.state = 'waiting';
+        this.scheduleAttempt();
+      });
+  }
+
+  /**
+   * Skip the rest of the current backoff wait (e.g. the user started talking)
+   */
+  retryNow() {
+    if (this.state !== 'waiting') return;
+    this.clearTimer();
+    this.attempt();
+  }
+
+  /**
+   * Whether a reconnect is in progress
+   */
+  isRecovering() {
+    return this.state === 'waiting' || this.state === 'connecting';
+  }
+
+  /**
+   * Queue an item for replay after reconnect (oldest dropped when full)
+   */
+  enqueue(item, bytes = 1) {
+    this.outbox.push({ item, bytes, queuedAt: Date.now() });
+    this.outboxBytes += bytes;
+
+    while (this.outbox.length > this.options.outboxLimit ||
+           this.outboxBytes > this.options.outboxBytes) {
+      const dropped = this.outbox.shift();
+      this.outboxBytes -= dropped.bytes;
+      this.metrics.dropped++;
+    }
+  }
+
+  /**
+   * Replay queued items in order, skipping expired ones
+   */
+  flush() {
+    const items = this.outbox;
+    const now = Date.now();
+    this.outbox = [];
+    this.outboxBytes = 0;
+
+    let replayed = 0;
+    items.forEach((entry) => {
+      if (now - entry.queuedAt > this.options.outboxMaxAge) {
+        this.metrics.expired++;
+        return;
+      }
+      this.sendFn(entry.item);
+      replayed++;
+    });
+
+    this.metrics.replayed += replayed;
+    return replayed;
+  }
+
+  clearOutbox() {
+    this.outbox = [];
+    this.outboxBytes = 0;
+  }
+
+  clearTimer() {
+    if (this.timer) {
+      clearTimeout(this.timer);
+      this.timer = null;
+    }
+  }
+
+  /**
+   * Stop reconnecting (intentional disconnect)
+   */
+  stop() {
+    this.clearTimer();
+    this.clearOutbox();
+    this.state = 'stopped';
+    this.attempts = 0;
+  }
+
+  getMetrics() {
+    const times = this.metrics.recoverTimes;
+    const total = times.reduce((a, b) => a + b, 0);
+    return {
+      state: this.state,
+      disconnects: this.metrics.disconnects,
+      recoveries: this.metrics.recoveries,
+      failedAttempts: this.metrics.failedAttempts,
+      gaveUp: this.metrics.gaveUp,
+      replayed: this.metrics.replayed,
+      dropped: this.metrics.dropped,
+      expired: this.metrics.expired,
+      queued: this.outbox.length,
+      lastRecoverMs: times.length > 0 ? times[times.length - 1] : 0,
+      avgRecoverMs: times.length > 0 ? Math.round(total / times.length) : 0,
+      maxRecoverMs: times.length > 0 ? Math.max(...times) : 0
+    };
+  }
+
+  /**
+   * Event listener system
+   */
+  on(event, callback) {
+    if (!this.listeners[event]) {
+      this.listeners[event] = [];
+    }
+    this.listeners[event].push(callback);
+  }
+
+  off(event, callback) {
+    if (this.listeners[event]) {
+      this.listeners[event] = this.listeners[event].filter(cb => cb !== callback);
+    }
+  }
+
+  emit(event, data) {
+    if (this.listeners[event]) {
+      this.listeners[event].forEach(callback => callback(data));
+    }
+  }
+}
+
+// Export for use in other modules
+if (typeof module !== 'undefined' && module.exports) {
+  module.exports = ReconnectManager;
+}
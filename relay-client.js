@@ -0,0 +1,232 @@
+/**
+ * Relay Client
+ * Browser side of the server relay (server/voice-relay-server.js): one
+ * WebSocket to /relay carrying any number of sessions
+ *
+ * Control goes up as JSON (open, close, interrupt, text) and comes back as
+ * events named after the message type, each with its `session` id.
+ * Binary frames carry a 4-byte mux header - kind (1 = mic PCM up, 2 = TTS
+ * audio down), reserved, session id (uint16, little-endian) - then 16 kHz
+ * linear16 mic audio or an AudioChunkIngestor TTS frame, whose seq field
+ * holds the sentence index within the turn.
+ *
+ * Thin on purpose: capture, barge-in and playback stay with the existing
+ * components (feed 'audio' payloads to the player, send `interrupt` when
+ * BargeInDetector fires)
+ */
+
+const MUX_HEADER_BYTES = 4;
+const MUX_MIC = 1;
+const MUX_TTS = 2;
+
+class RelayClient {
+  constructor(options = {}) {
+    this.options = {
+      url: 'ws://localhost:8787/relay',   // include ?token=... if the relay requires one
+      ...options
+    };
+
+    this.ws = null;
+    this.isConnected = false;
+    this.sessions = new Set();
+    this.opening = new Set();     // opened, no 'ready' yet
+    this.nextSessionId = 0;
+    this.ingestor = new AudioChunkIngestor();
+    this.listeners = {};
+
+    this.stats = {
+      bytesUp: 0,
+      bytesDown: 0,
+      audioFrames: 0,
+      droppedFrames: 0
+    };
+  }
+
+  /**
+   * Open the relay socket; resolves once it is connected
+   */
+  connect() {
+    return new Promise((resolve, reject) => {
+      const ws = new WebSocket(this.options.url);
+      ws.binaryType = 'arraybuffer';
+      this.ws = ws;
+
+      ws.onopen = () => {
+        console.log('[Relay] Connected');
+        this.isConnected = true;
+        this.emit('connected');
+        resolve();
+      };
+
+      ws.onmessage = (event) => this.handleMessage(event);
+
+      ws.onerror = (error) => {
+        console.error('[Relay] WebSocket error:', error);
+        this.emit('error', error);
+        if (!this.isConnected) reject(error);
+      };
+
+      ws.onclose = () => {
+        console.log('[Relay] Disconnected');
+        this.isConnected = false;
+        // The server closes every session with the socket
+        this.sessions.clear();
+        this.opening.clear();
+        this.emit('disconnected');
+      };
+    });
+  }
+
+  disconnect() {
+    if (this.ws) {
+      this.ws.close();
+      this.ws = null;
+    }
+    this.isConnected = false;
+    this.sessions.clear();
+    this.opening.clear();
+  }
+
+  /**
+   * Start a conversation; returns its session id. 'ready' follows once
+   * the relay has its upstreams, or 'error' if it cannot take the session
+   */
+  openSession({ voice, context } = {}) {
+    if (this.sessions.size > 0xFFFF) {
+      throw new Error('No free session ids');
+    }
+    let id = this.nextSessionId;
+    while (this.sessions.has(id)) {
+      id = (id + 1) & 0xFFFF;
+    }
+    this.nextSessionId = (id + 1) & 0xFFFF;
+
+    this.sessions.add(id);
+    this.opening.add(id);
+    this.sendControl({ type: 'open', session: id, voice, context });
+    return id;
+  }
+
+  closeSession(session) {
+    if (!this.sessions.delete(session)) return;
+    this.opening.delete(session);
+    this.sendControl({ type: 'close', session });
+  }
+
+  /**
+   * Barge-in: cancel the session's current response
+   */
+  interrupt(session) {
+    this.sendControl({ type: 'interrupt', session });
+  }
+
+  /**
+   * Send a typed user message instead of speech
+   */
+  sendText(session, text) {
+    this.sendControl({ type: 'text', session, text });
+  }
+
+  /**
+   * Send a frame of 16 kHz linear16 mic audio (Int16Array or ArrayBuffer)
+   */
+  sendAudio(session, pcm) {
+    if (!this.isConnected || !this.sessions.has(session)) return;
+
+    const bytes = pcm instanceof ArrayBuffer
+      ? new Uint8Array(pcm)
+      : new Uint8Array(pcm.buffer, pcm.byteOffset, pcm.byteLength);
+    const out = new Uint8Array(MUX_HEADER_BYTES + bytes.byteLength);
+    out[0] = MUX_MIC;
+    out[2] = session & 0xFF;
+    out[3] = session >> 8;
+    out.set(bytes, MUX_HEADER_BYTES);
+
+    this.stats.bytesUp += out.byteLength;
+    this.ws.send(out.buffer);
+  }
+
+  sendControl(message) {
+    if (!this.isConnected) {
+      console.warn('[Relay] Not connected, dropping', message.type);
+      return;
+    }
+    this.ws.send(JSON.stringify(message));
+  }
+
+  handleMessage(event) {
+    // TTS audio: mux header, then an AudioChunkIngestor frame (no copy)
+    if (event.data instanceof ArrayBuffer) {
+      const data = event.data;
+      this.stats.bytesDown += data.byteLength;
+
+      const header = new Uint8Array(data, 0, Math.min(MUX_HEADER_BYTES, data.byteLength));
+      const frame = header[0] === MUX_TTS && data.byteLength > MUX_HEADER_BYTES
+        ? this.ingestor.parseBinaryFrame(data, MUX_HEADER_BYTES)
+        : null;
+      if (!frame) {
+        this.stats.droppedFrames++;
+        return;
+      }
+
+      this.stats.audioFrames++;
+      this.emit('audio', {
+        session: header[2] | (header[3] << 8),
+        codec: frame.codec,
+        turnId: frame.turnId,
+        sentence: frame.seq,
+        payload: frame.payload
+      });
+      return;
+    }
+
+    let message;
+    try {
+      message = JSON.parse(event.data);
+    } catch (error) {
+      console.error('[Relay] Error parsing message:', error);
+      return;
+    }
+
+    // An error before 'ready' means the relay refused or dropped the open
+    if (message.type === 'ready') {
+      this.opening.delete(message.session);
+    } else if (message.type === 'error' && this.opening.delete(message.session)) {
+      this.sessions.delete(message.session);
+    }
+    this.emit(message.type, message);
+  }
+
+  getStats() {
+    return {
+      ...this.stats,
+      sessions: this.sessions.size,
+      ingestor: this.ingestor.getStats()
+    };
+  }
+
+  // Event emitter methods
+  on(event, callback) {
+    if (!this.listeners[event]) {
+      this.listeners[event] = [];
+    }
+    this.listeners[event].push(callback);
+  }
+
+  off(event, callback) {
+    if (this.listeners[event]) {
+      this.listeners[event] = this.listeners[event].filter(cb => cb !== callback);
+    }
+  }
+
+  emit(event, data) {
+    if (this.listeners[event]) {
+      this.listeners[event].forEach(callback => callback(data));
+    }
+  }
+}
+
+// Export for use in other modules
+if (typeof module !== 'undefined' && module.exports) {
+  module.exports = RelayClient;
+}
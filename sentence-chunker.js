@@ -0,0 +1,561 @@
+/**
+ * Sentence Chunker
+ * Incremental text chunker between the LLM token stream and TTS
+ * Only newly added characters are examined. The first chunk of a response
+ * may end early at a clause boundary (comma, or before a conjunction) to cut
+ * time-to-first-audio; after that, chunks are full sentences
+ * "Dr.", "e.g.", initials, decimals and currency ("₦2.50", "₦4,500") never split
+ *
+ * Interface (for custom chunkers passed as groq.chunker):
+ *   push(text) -> array of ready chunks
+ *   flush()    -> remaining text or null
+ *   reset()
+ */
+
+class SentenceChunker {
+  constructor(options = {}) {
+    this.options = {
+      minChars: 10,            // shortest sentence worth a TTS request
+      firstClause: true,       // allow an early first chunk at a clause boundary
+      firstClauseMinChars: 30, // ...once at least this long
+      maxChars: 220,           // force a split at the last clause boundary beyond this
+      abbreviations: SentenceChunker.ABBREVIATIONS,
+      ...options
+    };
+    this.reset();
+  }
+
+  reset() {
+    this.buffer = '';
+    this.scanned = 0;          // next index to examine
+    this.emitted = 0;          // chunks emitted for this response
+    this.lastClause = -1;      // end of the last clause boundary seen
+    this.wordStart = 0;        // index after the last space seen
+    this.wordInitial = 0;      // lowercased char code at wordStart
+    this.text = '';            // last pushed token and its buffer index
+    this.textAt = 0;
+    this.previous = '';        // the two tokens before it
+    this.previousAt = 0;
+    this.older = '';
+    this.olderAt = 0;
+  }
+
+  /**
+   * Add streamed text; returns the chunks that became ready
+   */
+  push(text) {
+    if (text.length === 0) return SentenceChunker.NONE;
+    this.older = this.previous;
+    this.olderAt = this.previousAt;
+    this.previous = this.text;
+    this.previousAt = this.textAt;
+    this.text = text;
+    this.textAt = this.buffer.length;
+    this.buffer += text;
+    let chunks = SentenceChunker.NONE;
+
+    const maxChars = this.options.maxChars;
+    const firstClause = this.options.firstClause;
+    let wordStart = this.wordStart;
+    let wordInitial = this.wordInitial;
+
+    // The last character is only judged once the next one arrives
+    let i = this.scanned;
+    let length = this.buffer.length;
+    while (i < length - 1) {
+      const code = this.codeAt(i);
+      if (i === wordStart) wordInitial = code | 0x20;
+
+      // Only sentence / clause punctuation and whitespace can be boundaries
+      if (code < 0x80 ? SentenceChunker.BOUNDARY_CHARS[code] === 0
+        : code !== 0x2026 && code !== 0x2014 && code !== 0xA0) {
+        i++;
+        continue;
+      }
+
+      // A space can only split after a conjunction (first chunk, or a long
+      // sentence) or in a runaway sentence - rule the rest out here
+      if (code === 0x20 || SentenceChunker.isSpace(code)) {
+        const wordLength = i - wordStart;
+        const conjunctionMatters = (firstClause && this.emitted === 0) || i > maxChars / 2;
+        if (i <= maxChars && !(conjunctionMatters && wordStart > 0 && wordLength < 32 && wordInitial < 0x80 &&
+            (SentenceChunker.CONJUNCTION_SHAPES[wordInitial] & (1 << wordLength)) !== 0)) {
+          if (code === 0x20) wordStart = i + 1;
+          i++;
+          continue;
+        }
+      }
+
+      const end = this.boundaryAt(i, code);
+      if (end === -1) break;     // undecided until more text arrives
+      if (end > 0) {
+        if (chunks === SentenceChunker.NONE) chunks = [];
+        chunks.push(this.buffer.slice(0, end).trim());
+        this.take(end);
+        length = this.buffer.length;
+        wordStart = 0;
+        i = 0;
+        continue;
+      }
+      if (code === 0x20) wordStart = i + 1;
+      i++;
+    }
+    this.scanned = i;
+    this.wordStart = wordStart;
+    this.wordInitial = wordInitial;
+
+    return chunks;
+  }
+
+  /**
+   * Whatever is left at the end of the stream
+   */
+  flush() {
+    const rest = this.buffer.trim();
+    this.reset();
+    return rest || null;
+  }
+
+  /**
+   * Drop the first `end` characters (and the whitespace after them) once
+   * emitted
+   */
+  take(end) {
+    let next = end;
+    while (next < this.buffer.length && SentenceChunker.isSpace(this.codeAt(next))) next++;
+    this.buffer = this.buffer.slice(next);
+    this.textAt -= next;
+    this.previousAt -= next;
+    this.olderAt -= next;
+    this.scanned = 0;
+    this.lastClause = -1;
+    this.emitted++;
+  }
+
+  /**
+   * Char code at buffer index k, read from the last three tokens where
+   * possible ("week", ".", " Reorder"): reading the appended buffer
+   * copies (flattens) all of it
+   */
+  codeAt(k) {
+    if (k >= this.textAt) return this.text.charCodeAt(k - this.textAt);
+    if (k >= this.previousAt) return this.previous.charCodeAt(k - this.previousAt);
+    if (k >= this.olderAt) return this.older.charCodeAt(k - this.olderAt);
+    return this.buffer.charCodeAt(k);
+  }
+
+  sliceAt(from, to) {
+    if (from >= this.textAt) return this.text.slice(from - this.textAt, to - this.textAt);
+    if (from >= this.previousAt && to <= this.textAt) {
+      return this.previous.slice(from - this.previousAt, to - this.previousAt);
+    }
+    if (from >= this.olderAt && to <= this.previousAt) {
+      return this.older.slice(from - this.olderAt, to - this.olderAt);
+    }
+    return this.buffer.slice(from, to);
+  }
+
+  /**
+   * If position i completes a chunk, return the chunk's end index
+   * (exclusive); 0 if it does not, -1 if that depends on text not yet seen
+   */
+  boundaryAt(i, code = this.codeAt(i)) {
+    const length = this.buffer.length;
+
+    // Fast reject: letters and digits are never boundaries
+    if (code > 0x3F && code < 0x2000) return 0;
+    if (code >= 0x30 && code <= 0x39) return 0;
+
+    // . ! ? …
+    if (code === 0x2E || code === 0x21 || code === 0x3F || code === 0x2026) {
+      // Skip closing quotes/brackets: 'He said "yes." Then'
+      let after = i + 1;
+      while (after < length && SentenceChunker.CLOSER_CODES.includes(this.codeAt(after))) after++;
+      if (after >= length) return -1;
+
+      // Decimals, "e.g." internals and "..." are not followed by a space
+      if (!SentenceChunker.isSpace(this.codeAt(after))) return 0;
+      if (i + 1 < this.options.minChars) return 0;
+      if (code === 0x2E) {
+        const abbreviation = this.isAbbreviation(i, after);
+        if (abbreviation === null) return -1;
+        if (abbreviation) return 0;
+      }
+
+      return after;
+    }
+
+    // , ; : —
+    const clause = code === 0x2C || code === 0x3B || code === 0x3A || code === 0x2014;
+    if (clause && SentenceChunker.isSpace(this.codeAt(i + 1))) {
+      const end = i + 1;
+      const listSoFar = this.lastClause > 0;
+      this.lastClause = end;
+      if (!listSoFar && this.wantsFirstClause(end)) return end;
+      return this.overLength(i);
+    }
+
+    // Word just completed - split before a conjunction (only matters for
+    // the first chunk and for runaway sentences)
+    if (SentenceChunker.isSpace(code) && i > 0 && !SentenceChunker.isSpace(this.codeAt(i - 1))) {
+      const early = this.options.firstClause && this.emitted === 0;
+      if (!early && i <= this.options.maxChars / 2) return 0;
+
+      let wordStart = i - 1;
+      while (wordStart > 0 && this.codeAt(wordStart - 1) !== 0x20) wordStart--;
+      const wordLength = i - wordStart;
+      const initial = this.codeAt(wordStart) | 0x20;   // lowercase ASCII
+      if (wordStart > 0 && wordLength >= 2 && wordLength <= 7 &&
+          SentenceChunker.CONJUNCTION_INITIALS.includes(initial)) {
+        const word = this.sliceAt(wordStart, i).toLowerCase();
+
+        // "dodo, moi moi and coleslaw" is a list, not a clause
+        const inList = (word === 'and' || word === 'or') && this.lastClause > 0;
+
+        if (SentenceChunker.CONJUNCTIONS.has(word) && !inList) {
+          const before = wordStart - 1;
+          this.lastClause = before;
+          if (this.wantsFirstClause(before)) return before;
+        }
+      }
+      return this.overLength(i);
+    }
+
+    return 0;
+  }
+
+  wantsFirstClause(end) {
+    return this.options.firstClause &&
+      this.emitted === 0 &&
+      end >= this.options.firstClauseMinChars;
+  }
+
+  /**
+   * Runaway sentence: split at the most recent clause boundary
+   */
+  overLength(position) {
+    if (position <= this.options.maxChars || this.lastClause <= 0) return 0;
+    return this.lastClause;
+  }
+
+  /**
+   * Whether the '.' at position i ends an abbreviation, initial or
+   * initialism; `after` is the whitespace following it
+   * Returns null when the answer depends on the next word
+   */
+  isAbbreviation(i, after) {
+    let start = i;
+    let dotted = false;
+    while (start > 0) {
+      const code = this.codeAt(start - 1);
+      if (code > 0x40 && code < 0x7B && code !== 0x5B) {   // ASCII letters, not '['
+        start--;
+        continue;
+      }
+      if (SentenceChunker.isSpace(code) || SentenceChunker.OPENER_CODES.includes(code)) break;
+      if (code === 0x2E) dotted = true;
+      start--;
+    }
+    if (start === i) return false;
+
+    // "J." / "U.S." / "e.g."
+    if (i - start === 1) return SentenceChunker.isLetter(this.codeAt(start));
+    if (dotted) return true;
+
+    const lower = this.sliceAt(start, i).toLowerCase();
+    if (this.options.abbreviations.has(lower)) return true;
+
+    // "No. 4521" but "Sorry, no. We..."; "30 min. or so" but "30 min. Anything else?"
+    const number = SentenceChunker.NUMBER_ABBREVIATIONS.has(lower);
+    const trailing = SentenceChunker.TRAILING_ABBREVIATIONS.has(lower);
+    if (!number && !trailing) return false;
+
+    // "on St. Finbarr" is Saint, "Allen St. Anything else?" is a street
+    if (lower === 'st' && !this.followsCapitalized(start)) return true;
+
+    if (after + 1 >= this.buffer.length) return null;
+    const next = this.codeAt(after + 1);
+    if (next >= 0x30 && next <= 0x39) return true;
+    return trailing && SentenceChunker.isLetter(next) &&
+      String.fromCharCode(next) !== String.fromCharCode(next).toUpperCase();
+  }
+
+  /**
+   * Whether the word before position `start` begins with a capital
+   */
+  followsCapitalized(start) {
+    let end = start;
+    while (end > 0 && SentenceChunker.isSpace(this.codeAt(end - 1))) end--;
+    if (end === 0 || end === start) return false;
+    let begin = end;
+    while (begin > 0 && !SentenceChunker.isSpace(this.codeAt(begin - 1))) begin--;
+    const first = this.codeAt(begin);
+    return SentenceChunker.isLetter(first) &&
+      String.fromCharCode(first) === String.fromCharCode(first).toUpperCase();
+  }
+
+  static isLetter(code) {
+    const char = String.fromCharCode(code);
+    return char.toLowerCase() !== char.toUpperCase();
+  }
+
+  static isSpace(code) {
+    return code === 0x20 || code === 0x0A || code === 0x09 || code === 0x0D || code === 0xA0;
+  }
+
+  /**
+   * The boundary test GroqLLM used before: regex over the whole sentence
+   * on every token. Kept as the benchmark baseline
+   */
+  static legacySplit(tokens) {
+    const chunks = [];
+    let current = '';
+    for (const token of tokens) {
+      current += token;
+      if (current.trim().length >= 10 && /[.!?]\s+|[.!?]$/.test(current)) {
+        chunks.push(current.trim());
+        current = '';
+      }
+    }
+    if (current.trim()) chunks.push(current.trim());
+    return chunks;
+  }
+
+  /**
+   * Split text the way an LLM streams it: words, single digits and
+   * punctuation arrive as separate tokens
+   */
+  static tokenize(text) {
+    return text.match(/\s*\p{L}+|\s*\d|\s*[^\s\p{L}\d]/gu) || [];
+  }
+
+  static chunkAll(tokens, options) {
+    const chunker = new SentenceChunker(options);
+    const chunks = [];
+    for (const token of tokens) {
+      const ready = chunker.push(token);
+      for (let k = 0; k < ready.length; k++) chunks.push(ready[k]);
+    }
+    const rest = chunker.flush();
+    if (rest) chunks.push(rest);
+    return chunks;
+  }
+
+  /**
+   * Check the chunker against the corpus of expected splits
+   * Run from the browser console: SentenceChunker.runCorpus()
+   */
+  static runCorpus(corpus = SentenceChunker.CORPUS) {
+    const failures = [];
+    corpus.forEach(({ text, expected, options }) => {
+      const actual = SentenceChunker.chunkAll(SentenceChunker.tokenize(text), options);
+      if (JSON.stringify(actual) !== JSON.stringify(expected)) {
+        failures.push({ text, expected, actual });
+      }
+    });
+
+    const result = { cases: corpus.length, passed: corpus.length - failures.length, failures };
+    if (failures.length > 0) {
+      console.warn(`[Chunker] ${failures.length}/${corpus.length} corpus case(s) failed`, failures);
+    } else {
+      console.log(`[Chunker] All ${corpus.length} corpus cases passed`);
+    }
+    return result;
+  }
+
+  /**
+   * Throughput and time-to-first-chunk vs the legacy regex splitter
+   * Run from the browser console: SentenceChunker.benchmark()
+   */
+  static benchmark({ iterations = 500 } = {}) {
+    const now = () => (typeof performance !== 'undefined' ? performance.now() : Date.now());
+    const responses = SentenceChunker.CORPUS.map(entry => SentenceChunker.tokenize(entry.text));
+
+    // Characters streamed before the first chunk can go to TTS, on
+    // replies whose first sentence is long (where early emit matters)
+    const longFirst = responses.filter(tokens =>
+      SentenceChunker.chunkAll(tokens, { firstClause: false })[0].length >= 60);
+    const firstChunkChars = (split) => {
+      const total = longFirst.reduce((sum, tokens) => sum + split(tokens)[0].length, 0);
+      return Math.round(total / Math.max(1, longFirst.length));
+    };
+
+    // Wrong splits: a chunk ending in '.' followed by one starting with a
+    // digit or lowercase letter ("Dr." | "Ade", "₦2." | "50")
+    const misplits = (split) => responses.reduce((sum, tokens) => {
+      const chunks = split(tokens);
+      return sum + chunks.slice(1).filter((chunk, k) =>
+        chunks[k].endsWith('.') && /^[\p{Ll}\d]/u.test(chunk)).length;
+    }, 0);
+
+    const run = (split) => {
+      const start = now();
+      for (let i = 0; i < iterations; i++) {
+        responses.forEach(tokens => split(tokens));
+      }
+      return now() - start;
+    };
+
+    const legacy = tokens => SentenceChunker.legacySplit(tokens);
+    const chunker = tokens => SentenceChunker.chunkAll(tokens);
+
+    // One rambling ~2.5k character reply: the legacy regex rescans the
+    // growing sentence on every token
+    const longReply = SentenceChunker.tokenize(
+      Array(60).fill('we have jollof, fried rice and ofada today').join(' ') + '.');
+    const runLong = (split) => {
+      const start = now();
+      for (let i = 0; i < iterations / 10; i++) split(longReply);
+      return now() - start;
+    };
+
+    // Untimed first pass: let both reach optimized code before timing
+    run(legacy);
+    run(chunker);
+
+    const result = {
+      responses: responses.length,
+      longFirstSentences: longFirst.length,
+      legacyMs: Math.round(run(legacy)),
+      chunkerMs: Math.round(run(chunker)),
+      legacyLongMs: Math.round(runLong(legacy)),
+      chunkerLongMs: Math.round(runLong(chunker)),
+      legacyFirstChunkChars: firstChunkChars(legacy),
+      chunkerFirstChunkChars: firstChunkChars(chunker),
+      legacyMisplits: misplits(legacy),
+      chunkerMisplits: misplits(chunker),
+      corpusPassed: SentenceChunker.runCorpus().passed
+    };
+    console.table ? console.table(result) : console.log(result);
+    return result;
+  }
+}
+
+// Titles - always followed by a name, never the end of a sentence
+SentenceChunker.ABBREVIATIONS = new Set([
+  'dr', 'mr', 'mrs', 'ms', 'prof', 'sr', 'jr', 'vs', 'approx', 'dept', 'tel', 'fig'
+]);
+
+// Units, company and street suffixes and months often end a sentence
+// ("takes 30 min. Anything else?") - abbreviations only when a lowercase
+// word or a number follows
+SentenceChunker.TRAILING_ABBREVIATIONS = new Set([
+  'min', 'mins', 'max', 'hrs', 'est', 'etc', 'pcs', 'qty',
+  'co', 'ltd', 'inc', 'corp', 'st', 'rd', 'ave', 'blvd',
+  'jan', 'feb', 'mar', 'apr', 'jun', 'jul', 'aug', 'sep', 'sept', 'oct', 'nov', 'dec'
+]);
+
+// Only abbreviations when a number follows
+SentenceChunker.NUMBER_ABBREVIATIONS = new Set(['no', 'nos']);
+
+// ASCII characters boundaryAt() can act on: . ! ? , ; : and whitespace
+SentenceChunker.BOUNDARY_CHARS = new Uint8Array(0x80);
+[0x2E, 0x21, 0x3F, 0x2C, 0x3B, 0x3A, 0x20, 0x0A, 0x09, 0x0D].forEach((code) => {
+  SentenceChunker.BOUNDARY_CHARS[code] = 1;
+});
+
+SentenceChunker.CONJUNCTIONS = new Set(['and', 'but', 'so', 'because', 'which', 'or']);
+SentenceChunker.CONJUNCTION_INITIALS = [0x61, 0x62, 0x73, 0x77, 0x6F];   // a b s w o
+// Lengths of the conjunctions by initial (one bit per length), so push()
+// can rule out a word without a call
+SentenceChunker.CONJUNCTION_SHAPES = new Uint32Array(0x80);
+SentenceChunker.CONJUNCTIONS.forEach((word) => {
+  SentenceChunker.CONJUNCTION_SHAPES[word.charCodeAt(0)] |= 1 << word.length;
+});
+
+// Returned by push() when nothing is ready (callers must not modify it)
+SentenceChunker.NONE = Object.freeze([]);
+SentenceChunker.CLOSERS = ['"', "'", ')', ']', '”', '’'];
+SentenceChunker.OPENERS = ['"', "'", '(', '[', '“', '‘'];
+SentenceChunker.CLOSER_CODES = SentenceChunker.CLOSERS.map(char => char.charCodeAt(0));
+SentenceChunker.OPENER_CODES = SentenceChunker.OPENERS.map(char => char.charCodeAt(0));
+
+// Expected chunks for representative order-taking replies
+SentenceChunker.CORPUS = [
+  {
+    text: 'Great choice! Would you like a drink with that?',
+    expected: ['Great choice!', 'Would you like a drink with that?']
+  },
+  {
+    text: 'One jollof rice with grilled chicken, extra plantain and a bottle of Zobo comes to ₦4,500. Shall I confirm?',
+    expected: ['One jollof rice with grilled chicken,', 'extra plantain and a bottle of Zobo comes to ₦4,500.', 'Shall I confirm?']
+  },
+  {
+    text: 'The small Chapman is ₦2.50 more than the Zobo. Want one?',
+    expected: ['The small Chapman is ₦2.50 more than the Zobo.', 'Want one?']
+  },
+  {
+    text: 'Dr. Ade placed this order on St. Finbarr Rd. last week. Reorder it?',
+    expected: ['Dr. Ade placed this order on St. Finbarr Rd. last week.', 'Reorder it?']
+  },
+  {
+    text: 'We have sides, e.g. dodo, moi moi and coleslaw. Which would you like?',
+    expected: ['We have sides, e.g. dodo, moi moi and coleslaw.', 'Which would you like?']
+  },
+  {
+    text: 'Your rider is on the way to Lekki and should arrive in about 35 minutes. Anything else?',
+    expected: ['Your rider is on the way to Lekki', 'and should arrive in about 35 minutes.', 'Anything else?']
+  },
+  {
+    text: 'Sure. Added.',
+    expected: ['Sure. Added.']
+  },
+  {
+    text: 'That comes to $12.99 in total. Paying by card?',
+    expected: ['That comes to $12.99 in total.', 'Paying by card?']
+  },
+  {
+    text: 'Order No. 4521 was delivered by J. Okafor at 3.15 p.m. today. Thank you!',
+    expected: ['Order No. 4521 was delivered by J. Okafor at 3.15 p.m. today.', 'Thank you!']
+  },
+  {
+    text: 'She said "perfect." Then she ordered two more.',
+    expected: ['She said "perfect."', 'Then she ordered two more.']
+  },
+  {
+    text: 'Hi, welcome to OrderVoice! What can I get for you today?',
+    expected: ['Hi, welcome to OrderVoice!', 'What can I get for you today?']
+  },
+  {
+    text: 'One jollof rice with grilled chicken, extra plantain and a bottle of Zobo comes to ₦4,500.',
+    options: { firstClause: false },
+    expected: ['One jollof rice with grilled chicken, extra plantain and a bottle of Zobo comes to ₦4,500.']
+  },
+  {
+    text: 'Sorry, no. We are out of suya tonight, but the grilled fish is fresh.',
+    expected: ['Sorry, no.', 'We are out of suya tonight, but the grilled fish is fresh.']
+  },
+  {
+    text: 'Yes.',
+    expected: ['Yes.']
+  },
+  {
+    text: 'Delivery takes 30 min. Anything else?',
+    expected: ['Delivery takes 30 min.', 'Anything else?']
+  },
+  {
+    text: 'It takes 10 min. or so to prepare.',
+    expected: ['It takes 10 min. or so to prepare.']
+  },
+  {
+    text: 'Two plates is the max. Want to go ahead?',
+    expected: ['Two plates is the max.', 'Want to go ahead?']
+  },
+  {
+    text: 'Your rider is on Allen St. See you soon!',
+    expected: ['Your rider is on Allen St.', 'See you soon!']
+  },
+  {
+    text: 'Pick it up from Mama Put Foods Co. Thank you!',
+    expected: ['Pick it up from Mama Put Foods Co.', 'Thank you!']
+  },
+  {
+    text: 'We reopen on Jan. 5 after the holidays. See you then!',
+    expected: ['We reopen on Jan. 5 after the holidays.', 'See you then!']
+  }
+];
+
+// Export for use in other modules
+if (typeof module !== 'undefined' && module.exports) {
+  module.exports = SentenceChunker;
+}
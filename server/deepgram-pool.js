@@ -0,0 +1,175 @@
+/**
+ * Deepgram Pool (Node)
+ * Deepgram transcribes one audio stream per socket, so sessions can't share
+ * a live socket - instead the pool keeps a few authenticated sockets open
+ * ahead of demand (KeepAlive while idle) and hands one to each new session,
+ * so starting a call never waits for the TCP/TLS/WebSocket handshake
+ */
+
+const WsConnection = require('./ws-connection');
+const { MetricsStore } = require('./shared-components');
+
+class DeepgramPool {
+  constructor(config, options = {}) {
+    this.apiKey = config.deepgramApiKey;
+    this.config = {
+      model: 'nova-2',
+      language: 'en-US',
+      smartFormat: true,
+      interimResults: true,
+      punctuate: true,
+      endpointing: 300,
+      vadEvents: true,
+      utteranceEndMs: 1000,
+      sampleRate: 16000,
+      keepAliveMs: 4000,
+      ...config.deepgram
+    };
+    this.options = {
+      url: 'wss://api.deepgram.com/v1/listen',
+      spares: 2,                 // open sockets kept ready for new sessions
+      connectTimeoutMs: 5000,
+      ...options
+    };
+
+    this.spares = [];
+    this.opening = 0;
+    this.active = new Set();
+    this.closed = false;
+    this.keepAliveTimer = null;
+
+    this.stats = {
+      opened: 0,
+      spareHits: 0,              // sessions that got an already-open socket
+      spareMisses: 0,
+      failures: 0,
+      released: 0
+    };
+    this.latency = new MetricsStore({ windowSize: 100 });
+  }
+
+  buildUrl() {
+    const params = new URLSearchParams({
+      model: this.config.model,
+      language: this.config.language,
+      smart_format: this.config.smartFormat,
+      interim_results: this.config.interimResults,
+      punctuate: this.config.punctuate,
+      endpointing: this.config.endpointing,
+      vad_events: this.config.vadEvents,
+      utterance_end_ms: this.config.utteranceEndMs,
+      encoding: 'linear16',
+      sample_rate: this.config.sampleRate,
+      channels: 1
+    });
+    return `${this.options.url}?${params}`;
+  }
+
+  async open() {
+    const startTime = Date.now();
+    try {
+      const ws = await WsConnection.connect(this.buildUrl(), {
+        headers: { Authorization: `Token ${this.apiKey}` },
+        timeoutMs: this.options.connectTimeoutMs
+      });
+      this.stats.opened++;
+      this.latency.record('connect', Date.now() - startTime);
+      return ws;
+    } catch (error) {
+      this.stats.failures++;
+      throw error;
+    }
+  }
+
+  /**
+   * Open spares up to the target; failures are logged, not thrown
+   */
+  refill() {
+    if (this.closed) return;
+    const missing = this.options.spares - this.spares.length - this.opening;
+    for (let i = 0; i < missing; i++) {
+      this.opening++;
+      this.open()
+        .then((ws) => {
+          if (this.closed) {
+            ws.close();
+            return;
+          }
+          ws.on('close', () => {
+            this.spares = this.spares.filter(spare => spare !== ws);
+          });
+          this.spares.push(ws);
+        })
+        .catch((error) => {
+          console.warn('[DeepgramPool] Spare connection failed:', error.message);
+        })
+        .finally(() => {
+          this.opening--;
+        });
+    }
+  }
+
+  start() {
+    this.refill();
+    // Idle spares would be closed by Deepgram after ~10 s without data
+    this.keepAliveTimer = setInterval(() => {
+      this.spares.forEach(ws => ws.send(JSON.stringify({ type: 'KeepAlive' })));
+    }, this.config.keepAliveMs);
+    this.keepAliveTimer.unref?.();
+  }
+
+  /**
+   * Get a socket for a new session
+   */
+  async acquire() {
+    let ws = null;
+    while (this.spares.length > 0 && !ws) {
+      const spare = this.spares.shift();
+      if (spare.readyState === WsConnection.OPEN) ws = spare;
+    }
+
+    if (ws) {
+      this.stats.spareHits++;
+    } else {
+      this.stats.spareMisses++;
+      ws = await this.open();
+    }
+
+    this.active.add(ws);
+    this.refill();
+    return ws;
+  }
+
+  /**
+   * Session over: flush the stream and close (transcripts never carry
+   * over to another caller)
+   */
+  release(ws) {
+    if (!this.active.delete(ws)) return;
+    this.stats.released++;
+    if (ws.readyState === WsConnection.OPEN) {
+      ws.send(JSON.stringify({ type: 'CloseStream' }));
+      ws.close();
+    }
+  }
+
+  getStats() {
+    return {
+      ...this.stats,
+      active: this.active.size,
+      spares: this.spares.length,
+      connectMs: this.latency.summary('connect')
+    };
+  }
+
+  close() {
+    this.closed = true;
+    clearInterval(this.keepAliveTimer);
+    this.spares.forEach(ws => ws.close());
+    this.spares = [];
+    this.active.forEach(ws => ws.close());
+    this.active.clear();
+  }
+}
+
+module.exports = DeepgramPool;
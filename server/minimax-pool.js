@@ -0,0 +1,382 @@
+/**
+ * MiniMax Pool (Node)
+ * Authenticated TTS sockets shared by every session on the server
+ * A socket carries several requests at once (each tagged with turn_id/seq,
+ * as MiniMaxAPI does in the browser); a request goes to the least busy
+ * socket for its voice, a new socket is opened only when all are at
+ * maxInFlight, and requests wait in a queue once maxSockets is reached.
+ * Audio is handed on as framed binary (see AudioChunkIngestor) whichever
+ * way MiniMax sent it
+ */
+
+const WsConnection = require('./ws-connection');
+const { AudioChunkIngestor, MetricsStore } = require('./shared-components');
+
+class MiniMaxPool {
+  constructor(config, options = {}) {
+    this.config = config;
+    this.options = {
+      maxSockets: 32,            // across all voices
+      maxInFlight: 4,            // concurrent requests per socket
+      idleTimeoutMs: 120000,     // close sockets unused this long (one per voice stays)
+      pingIntervalMs: config.performance?.pingInterval || 30000,
+      connectTimeoutMs: 5000,
+      ...options
+    };
+
+    this.sockets = new Map();    // voiceId -> [socket entries]
+    this.waiting = [];           // requests queued for a free slot
+    this.socketCount = 0;
+    this.ingestor = new AudioChunkIngestor();
+    this.pingTimer = null;
+
+    this.stats = {
+      requests: 0,
+      reused: 0,                 // requests sent on an already-open socket
+      opened: 0,
+      closed: 0,
+      queued: 0,
+      maxQueued: 0,
+      cancelled: 0,
+      failed: 0
+    };
+    this.latency = new MetricsStore({ windowSize: 200 });
+  }
+
+  getStreamFormat() {
+    return {
+      format: this.config.streaming?.format || 'mp3',
+      sampleRate: this.config.streaming?.sampleRate,
+      bitrate: this.config.streaming?.bitrate
+    };
+  }
+
+  getCodec() {
+    const { format } = this.getStreamFormat();
+    return format === 'pcm' ? 'pcm16' : format;
+  }
+
+  start() {
+    this.pingTimer = setInterval(() => {
+      this.sockets.forEach((entries) => {
+        entries.forEach(entry => entry.ws && entry.ws.send(JSON.stringify({ type: 'ping' })));
+      });
+      this.evictIdle();
+    }, this.options.pingIntervalMs);
+    this.pingTimer.unref?.();
+  }
+
+  /**
+   * Open an authenticated socket for a voice
+   */
+  openSocket(voiceId) {
+    const entry = {
+      voiceId,
+      ws: null,
+      ready: null,
+      inFlight: new Map(),       // seq -> request
+      nextSeq: 1,
+      lastUsed: Date.now()
+    };
+
+    const entries = this.sockets.get(voiceId) || [];
+    entries.push(entry);
+    this.sockets.set(voiceId, entries);
+    this.socketCount++;
+
+    const startTime = Date.now();
+    const url = `${this.config.endpoints.websocket}?voice_id=${voiceId}&group_id=${this.config.groupId}`;
+    entry.ready = WsConnection.connect(url, { timeoutMs: this.options.connectTimeoutMs })
+      .then((ws) => {
+        entry.ws = ws;
+        this.stats.opened++;
+        this.latency.record('connect', Date.now() - startTime);
+
+        ws.on('message', (data, isBinary) => this.handleMessage(entry, data, isBinary));
+        ws.on('close', () => this.handleClosed(entry));
+        ws.on('error', (error) => console.error('[MiniMaxPool] Socket error:', error.message));
+
+        ws.send(JSON.stringify({
+          type: 'auth',
+          api_key: this.config.apiKey,
+          group_id: this.config.groupId,
+          model: this.config.model,
+          voice_id: voiceId,
+          format: this.getStreamFormat().format,
+          binary_frames: this.config.streaming?.binaryFraming !== false
+        }));
+        return entry;
+      })
+      .catch((error) => {
+        this.stats.failed++;
+        this.removeEntry(entry);
+        throw error;
+      });
+
+    return entry;
+  }
+
+  /**
+   * Synthesize text; handlers.onAudio(frame) receives framed audio,
+   * handlers.onEnd() / onError(error) finish the request
+   * Returns the request (request.cancel() drops any further audio)
+   */
+  speak(voiceId, text, options = {}, handlers = {}) {
+    const request = {
+      voiceId,
+      text,
+      options,
+      handlers,
+      turnId: options.turnId || 0,
+      seq: 0,
+      entry: null,
+      createdAt: Date.now(),
+      firstAudioAt: 0,
+      cancelled: false,
+      done: false,
+      cancel: () => this.cancel(request)
+    };
+    this.stats.requests++;
+
+    if (!this.dispatch(request)) {
+      this.waiting.push(request);
+      this.stats.queued++;
+      this.stats.maxQueued = Math.max(this.stats.maxQueued, this.waiting.length);
+    }
+    return request;
+  }
+
+  /**
+   * Send on the least busy socket for the voice, opening one if allowed
+   * Returns false if the request has to wait
+   */
+  dispatch(request) {
+    const entries = this.sockets.get(request.voiceId) || [];
+    let entry = null;
+    entries.forEach((candidate) => {
+      if (candidate.inFlight.size >= this.options.maxInFlight) return;
+      if (!entry || candidate.inFlight.size < entry.inFlight.size) entry = candidate;
+    });
+
+    if (entry) {
+      this.stats.reused++;
+    } else if (this.socketCount < this.options.maxSockets) {
+      entry = this.openSocket(request.voiceId);
+    } else {
+      return false;
+    }
+
+    request.entry = entry;
+    request.seq = entry.nextSeq++;
+    entry.inFlight.set(request.seq, request);
+    entry.lastUsed = Date.now();
+
+    entry.ready
+      .then(() => {
+        if (request.cancelled) {
+          this.finish(request);
+          return;
+        }
+        const { format, sampleRate, bitrate } = this.getStreamFormat();
+        entry.ws.send(JSON.stringify({
+          type: 'tts',
+          text: request.text,
+          model: this.config.model,
+          voice_settings: {
+            ...this.config.streaming?.voiceSettings,
+            ...request.options.voiceSettings
+          },
+          streaming: true,
+          format,
+          sample_rate: sampleRate,
+          bitrate,
+          speed: request.options.speed || this.config.streaming?.speed,
+          turn_id: request.turnId & 0xFFFF,
+          seq: request.seq
+        }));
+      })
+      .catch((error) => {
+        this.fail(request, error);
+      });
+
+    return true;
+  }
+
+  /**
+   * The request a message belongs to: by seq, else the oldest in flight
+   */
+  findRequest(entry, seq) {
+    if (seq !== undefined && entry.inFlight.has(seq)) {
+      return entry.inFlight.get(seq);
+    }
+    return entry.inFlight.values().next().value || null;
+  }
+
+  handleMessage(entry, data, isBinary) {
+    // Only TTS traffic counts as use - ping replies must not hold off eviction
+    if (isBinary) {
+      entry.lastUsed = Date.now();
+      // Already framed: read the seq straight from the header, no copy
+      const framed = data.length >= MiniMaxPool.FRAME_HEADER_BYTES && data[0] === MiniMaxPool.FRAME_MAGIC;
+      const request = this.findRequest(entry, framed ? data.readUInt32LE(4) : undefined);
+      if (!request) return;
+
+      this.deliverAudio(request, framed
+        ? data
+        : Buffer.from(AudioChunkIngestor.encodeFrame(data, { codec: this.getCodec(), turnId: request.turnId, seq: request.seq })));
+      return;
+    }
+
+    let message;
+    let audio = null;
+    try {
+      ({ message, audio } = this.ingestor.parseTextMessage(data));
+    } catch (error) {
+      console.error('[MiniMaxPool] Bad message:', error.message);
+      return;
+    }
+
+    switch (message.type) {
+      case 'audio_chunk': {
+        entry.lastUsed = Date.now();
+        const request = this.findRequest(entry, message.seq);
+        if (request && audio && audio.byteLength > 0) {
+          const frame = AudioChunkIngestor.encodeFrame(audio, {
+            codec: this.getCodec(),
+            turnId: request.turnId,
+            seq: request.seq
+          });
+          this.deliverAudio(request, Buffer.from(frame));
+        }
+        break;
+      }
+
+      case 'audio_end': {
+        entry.lastUsed = Date.now();
+        const request = this.findRequest(entry, message.seq);
+        if (request) {
+          if (!request.cancelled && request.handlers.onEnd) request.handlers.onEnd();
+          this.finish(request);
+        }
+        break;
+      }
+
+      case 'error': {
+        const request = this.findRequest(entry, message.seq);
+        if (request) this.fail(request, new Error(message.error || 'MiniMax error'));
+        break;
+      }
+    }
+  }
+
+  deliverAudio(request, frame) {
+    if (request.cancelled) return;
+    if (!request.firstAudioAt) {
+      request.firstAudioAt = Date.now();
+      this.latency.record('ttfb', request.firstAudioAt - request.createdAt);
+    }
+    if (request.handlers.onAudio) request.handlers.onAudio(frame);
+  }
+
+  /**
+   * Drop further audio; the slot frees when MiniMax ends the request
+   */
+  cancel(request) {
+    if (request.cancelled || request.done) return;
+    request.cancelled = true;
+    this.stats.cancelled++;
+
+    const index = this.waiting.indexOf(request);
+    if (index !== -1) {
+      this.waiting.splice(index, 1);
+      request.done = true;
+    }
+  }
+
+  finish(request) {
+    if (request.done) return;
+    request.done = true;
+    if (request.entry) {
+      request.entry.inFlight.delete(request.seq);
+    }
+    this.drainWaiting();
+  }
+
+  fail(request, error) {
+    this.stats.failed++;
+    if (!request.cancelled && request.handlers.onError) request.handlers.onError(error);
+    this.finish(request);
+  }
+
+  drainWaiting() {
+    while (this.waiting.length > 0) {
+      if (!this.dispatch(this.waiting[0])) return;
+      this.waiting.shift();
+    }
+  }
+
+  handleClosed(entry) {
+    this.stats.closed++;
+    this.removeEntry(entry);
+    entry.inFlight.forEach(request => this.fail(request, new Error('MiniMax socket closed')));
+  }
+
+  removeEntry(entry) {
+    const entries = this.sockets.get(entry.voiceId);
+    if (!entries || !entries.includes(entry)) return;
+    this.socketCount--;
+    const remaining = entries.filter(candidate => candidate !== entry);
+    if (remaining.length > 0) {
+      this.sockets.set(entry.voiceId, remaining);
+    } else {
+      this.sockets.delete(entry.voiceId);
+    }
+    this.drainWaiting();
+  }
+
+  /**
+   * Close sockets idle past idleTimeoutMs, keeping one per voice warm
+   */
+  evictIdle() {
+    const now = Date.now();
+    this.sockets.forEach((entries) => {
+      entries
+        .filter(entry => entry.ws && entry.inFlight.size === 0 && now - entry.lastUsed > this.options.idleTimeoutMs)
+        .slice(0, entries.length - 1)
+        .forEach(entry => entry.ws.close());
+    });
+  }
+
+  getStats() {
+    let inFlight = 0;
+    this.sockets.forEach((entries) => {
+      entries.forEach((entry) => {
+        inFlight += entry.inFlight.size;
+      });
+    });
+
+    return {
+      ...this.stats,
+      sockets: this.socketCount,
+      inFlight,
+      waiting: this.waiting.length,
+      requestsPerSocket: this.stats.opened > 0 ? +(this.stats.requests / this.stats.opened).toFixed(1) : 0,
+      connectMs: this.latency.summary('connect'),
+      ttfbMs: this.latency.summary('ttfb')
+    };
+  }
+
+  close() {
+    clearInterval(this.pingTimer);
+    this.waiting = [];
+    this.sockets.forEach((entries) => {
+      entries.forEach(entry => entry.ws && entry.ws.close());
+    });
+  }
+}
+
+// AudioChunkIngestor binary frame layout
+MiniMaxPool.FRAME_MAGIC = 0xA5;
+MiniMaxPool.FRAME_HEADER_BYTES = 8;
+
+module.exports = MiniMaxPool;
@@ -0,0 +1,326 @@
+/**
+ * Relay Load Test (Node)
+ * Runs the stand-in upstreams and the relay in their own processes, then
+ * drives simulated callers at increasing session counts. Each caller
+ * streams mic audio in real time (speech, then silence), waits for the
+ * reply's audio and talks again. Reported per level: end-of-speech to
+ * first TTS byte (p50/p95), the relay's share of it over what the
+ * stand-ins impose, relay CPU (fraction of one core) and sessions per core
+ *
+ *   node server/relay-load-test.js --levels 10,25,50,100 --duration 15
+ *
+ * The callers run on the same machine; the relay's CPU is measured
+ * in its own process, so sessions per core is not inflated by them.
+ * Theirs and the stand-ins' CPU are reported too (callersCpu,
+ * standInsCpu) - on a machine with fewer cores than processes they
+ * compete with the relay and inflate its latency
+ */
+
+const { fork } = require('child_process');
+
+const WsConnection = require('./ws-connection');
+const VoiceRelayServer = require('./voice-relay-server');
+const RelayStandIns = require('./relay-standins');
+const { MetricsStore } = require('./shared-components');
+
+const { parseArgs } = VoiceRelayServer;
+
+const FRAME_MS = 40;
+const SAMPLE_RATE = 16000;
+const FRAME_BYTES = SAMPLE_RATE * 2 * FRAME_MS / 1000;
+const MUX_HEADER_BYTES = 4;
+
+/**
+ * Child process roles: upstream stand-ins, or the relay pointed at them
+ */
+async function runChild(role, args) {
+  if (role === 'standins') {
+    const standIns = new RelayStandIns();
+    const urls = await standIns.start();
+    // Endpointing is counted in whole mic frames
+    const endpointingMs = Math.ceil(300 / FRAME_MS) * FRAME_MS;
+    let cpuStart = process.cpuUsage();
+    let timeStart = Date.now();
+    process.on('message', (message) => {
+      if (message.type === 'reset') {
+        cpuStart = process.cpuUsage();
+        timeStart = Date.now();
+        process.send({ type: 'reset' });
+      } else if (message.type === 'stats') {
+        const usage = process.cpuUsage(cpuStart);
+        process.send({ type: 'stats', cpuLoad: +((usage.user + usage.system) / 1000 / (Date.now() - timeStart)).toFixed(3) });
+      }
+    });
+    process.send({ type: 'ready', urls, baselineMs: standIns.getBaselineMs(endpointingMs) });
+    return;
+  }
+
+  const config = {
+    deepgramApiKey: 'standin',
+    groqApiKey: 'standin',
+    apiKey: 'standin',
+    groupId: 'standin',
+    model: 'standin',
+    endpoints: { websocket: args['minimax-url'] },
+    voices: { standin: { id: 'standin' } },
+    streaming: { format: 'pcm', sampleRate: 24000 },
+    performance: {},
+    deepgram: {},
+    groq: {},
+    // Replies differ per caller in real use - don't let the cache short-cut them
+    llmCache: { enabled: false },
+    turns: { mergeWindowMs: 0 }
+  };
+
+  // Keep the relay's own logging out of the measurement
+  console.log = () => {};
+  const server = new VoiceRelayServer(config, {
+    port: 0,
+    host: '127.0.0.1',
+    groqOrigin: args['groq-origin'],
+    deepgramUrl: args['deepgram-url'],
+    maxSessions: 100000,
+    minimax: { maxSockets: 64, maxInFlight: 8 }
+  });
+  const port = await server.start();
+  process.on('message', (message) => {
+    if (message.type === 'reset') {
+      server.resetCpu();
+      server.metrics.reset();
+      process.send({ type: 'reset' });
+    } else if (message.type === 'stats') {
+      process.send({ type: 'stats', stats: server.getStats() });
+    }
+  });
+  process.send({ type: 'ready', port });
+}
+
+function startChild(role, extraArgs = []) {
+  const child = fork(__filename, ['--role', role, ...extraArgs], { stdio: ['ignore', 'inherit', 'inherit', 'ipc'] });
+  return new Promise((resolve, reject) => {
+    child.once('message', message => resolve({ child, ...message }));
+    child.once('exit', code => reject(new Error(`${role} exited (${code})`)));
+  });
+}
+
+function request(child, type) {
+  return new Promise((resolve) => {
+    const handler = (message) => {
+      if (message.type !== type) return;
+      child.off('message', handler);
+      resolve(message);
+    };
+    child.on('message', handler);
+    child.send({ type });
+  });
+}
+
+/**
+ * One simulated caller: speech, silence until the reply's audio has
+ * finished, a short pause, repeat
+ */
+class SimulatedCaller {
+  constructor(socket, id, latency, options) {
+    this.socket = socket;
+    this.id = id;
+    this.latency = latency;
+    this.options = options;
+    this.state = 'idle';
+    this.framesLeft = 0;
+    this.speechEndAt = 0;
+    this.turns = 0;
+    this.ready = false;
+
+    this.speech = Buffer.alloc(MUX_HEADER_BYTES + FRAME_BYTES);
+    this.silence = Buffer.alloc(MUX_HEADER_BYTES + FRAME_BYTES);
+    [this.speech, this.silence].forEach((frame) => {
+      frame[0] = 1;
+      frame.writeUInt16LE(id, 2);
+    });
+    for (let i = MUX_HEADER_BYTES; i < this.speech.length; i += 2) {
+      this.speech.writeInt16LE(((i * 37) % 2000) + 500, i);
+    }
+
+    // Start talking at a random point so turns don't line up
+    this.pauseFrames = Math.floor(Math.random() * (2000 / FRAME_MS));
+  }
+
+  /**
+   * Called every FRAME_MS - sends one frame, like a mic worklet would
+   */
+  tick() {
+    if (!this.ready) return;
+
+    if (this.state === 'idle') {
+      if (--this.pauseFrames <= 0) {
+        this.state = 'speaking';
+        this.framesLeft = this.options.speechMs / FRAME_MS;
+      }
+    }
+
+    if (this.state === 'speaking') {
+      this.socket.send(this.speech);
+      if (--this.framesLeft <= 0) {
+        this.state = 'waiting';
+        this.speechEndAt = Date.now();
+      }
+      return;
+    }
+
+    this.socket.send(this.silence);
+  }
+
+  handleAudio() {
+    if (this.state !== 'waiting') return;
+    this.latency.record('voice_to_voice', Date.now() - this.speechEndAt);
+    this.state = 'listening';
+  }
+
+  handleMessage(message) {
+    if (message.type === 'ready') {
+      this.ready = true;
+    } else if (message.type === 'ai_audio_end' && this.state === 'listening') {
+      this.turns++;
+      this.state = 'idle';
+      this.pauseFrames = (1000 + Math.random() * 1000) / FRAME_MS;
+    } else if (message.type === 'error') {
+      this.latency.record('errors', 1);
+    }
+  }
+}
+
+async function runLevel(relayPort, sessions, options, relay, standIns) {
+  const latency = new MetricsStore({ windowSize: 100000 });
+  const sockets = [];
+  const callers = [];
+
+  const socketCount = Math.ceil(sessions / options.sessionsPerSocket);
+  for (let s = 0; s < socketCount; s++) {
+    const socket = await WsConnection.connect(`ws://127.0.0.1:${relayPort}/relay`);
+    const byId = new Map();
+    socket.on('message', (data, isBinary) => {
+      if (isBinary) {
+        const caller = byId.get(data.readUInt16LE(2));
+        if (caller) caller.handleAudio();
+        return;
+      }
+      const message = JSON.parse(data);
+      const caller = byId.get(message.session);
+      if (caller) caller.handleMessage(message);
+    });
+
+    const count = Math.min(options.sessionsPerSocket, sessions - callers.length);
+    for (let i = 0; i < count; i++) {
+      const caller = new SimulatedCaller(socket, i, latency, options);
+      byId.set(i, caller);
+      callers.push(caller);
+      socket.send(JSON.stringify({ type: 'open', session: i, voice: 'standin' }));
+    }
+    sockets.push(socket);
+  }
+
+  // Let sessions come up, then measure a clean window
+  await new Promise(resolve => setTimeout(resolve, 1000));
+  await request(relay, 'reset');
+  await request(standIns, 'reset');
+  latency.reset();
+
+  // One timer per socket at a random phase - real mics aren't in lock-step,
+  // and one burst of every caller's frame per tick would measure the burst
+  const generatorCpu = process.cpuUsage();
+  const timers = sockets.map((socket, s) => {
+    const group = callers.slice(s * options.sessionsPerSocket, (s + 1) * options.sessionsPerSocket);
+    const timer = { interval: null };
+    timer.start = setTimeout(() => {
+      timer.interval = setInterval(() => group.forEach(caller => caller.tick()), FRAME_MS);
+    }, Math.random() * FRAME_MS);
+    return timer;
+  });
+  await new Promise(resolve => setTimeout(resolve, options.durationMs));
+  timers.forEach((timer) => {
+    clearTimeout(timer.start);
+    clearInterval(timer.interval);
+  });
+  const generatorUsage = process.cpuUsage(generatorCpu);
+
+  const { stats } = await request(relay, 'stats');
+  const upstream = await request(standIns, 'stats');
+  sockets.forEach(socket => socket.close());
+  await new Promise(resolve => setTimeout(resolve, 500));
+
+  const summary = latency.summary('voice_to_voice');
+  return {
+    sessions,
+    sockets: socketCount,
+    turns: summary.count,
+    p50: summary.p50,
+    p95: summary.p95,
+    overheadP95: summary.p95 === null ? null : Math.round(summary.p95 - options.baselineMs),
+    cpu: stats.cpuLoad,
+    standInsCpu: upstream.cpuLoad,
+    callersCpu: +((generatorUsage.user + generatorUsage.system) / 1000 / options.durationMs).toFixed(3),
+    sessionsPerCore: stats.cpuLoad > 0 ? Math.round(sessions / stats.cpuLoad) : null,
+    errors: latency.count('errors'),
+    minimaxSockets: stats.minimax.sockets,
+    ttsRequestsPerSocket: stats.minimax.requestsPerSocket,
+    deepgramSpareHits: stats.deepgram.spareHits,
+    rssMB: stats.rssMB
+  };
+}
+
+async function main(args) {
+  const options = {
+    levels: String(args.levels || '10,25,50,100').split(',').map(Number),
+    durationMs: Number(args.duration || 15) * 1000,
+    sessionsPerSocket: Number(args['sessions-per-socket'] || 4),
+    speechMs: Number(args['speech-ms'] || 1200),
+    budgetMs: Number(args['budget-ms'] || 100),   // acceptable relay overhead at p95
+    maxCpu: Number(args['max-cpu'] || 0.8)
+  };
+
+  const standIns = await startChild('standins');
+  options.baselineMs = standIns.baselineMs;
+  const relay = await startChild('relay', [
+    '--groq-origin', standIns.urls.groqOrigin,
+    '--deepgram-url', standIns.urls.deepgramUrl,
+    '--minimax-url', standIns.urls.minimaxUrl
+  ]);
+
+  console.log(`[LoadTest] Stand-in baseline ${options.baselineMs}ms (endpointing + TTFT + first sentence + TTS TTFB)`);
+  const results = [];
+  for (const sessions of options.levels) {
+    const result = await runLevel(relay.port, sessions, options, relay.child, standIns.child);
+    results.push(result);
+    console.log(`[LoadTest] ${sessions} sessions: p95 ${result.p95}ms (+${result.overheadP95}ms), cpu ${result.cpu}`);
+  }
+  console.table(results);
+
+  // Highest level that kept within budget, and what one core would carry
+  const passing = results.filter(result =>
+    result.overheadP95 !== null && result.overheadP95 <= options.budgetMs && result.cpu <= options.maxCpu && result.errors === 0);
+  const best = passing[passing.length - 1];
+  if (best) {
+    console.log(`[LoadTest] Sustained ${best.sessions} sessions within +${options.budgetMs}ms p95 on one relay process ` +
+      `(${Math.round(best.cpu * 100)}% of a core) - about ${Math.round(best.sessions * options.maxCpu / best.cpu)} sessions per core at ${Math.round(options.maxCpu * 100)}% CPU`);
+  } else {
+    console.log('[LoadTest] No level stayed within budget');
+  }
+
+  standIns.child.kill();
+  relay.child.kill();
+  return results;
+}
+
+if (require.main === module) {
+  const args = parseArgs(process.argv.slice(2));
+  if (args.role) {
+    runChild(args.role, args);
+  } else {
+    main(args).catch((error) => {
+      console.error('[LoadTest] Failed:', error);
+      process.exit(1);
+    });
+  }
+}
+
+module.exports = { main, SimulatedCaller };
@@ -0,0 +1,288 @@
+/**
+ * Relay Session (Node)
+ * One caller's conversation running on the server: the same pipeline as
+ * VoiceStreamingOrchestrator (Deepgram finals -> TurnScheduler -> GroqLLM
+ * sentences -> MiniMax) minus everything that needs a page. Mic audio
+ * arrives from the browser over the relay socket and TTS audio goes back
+ * over it; upstream sockets come from the server's shared pools
+ */
+
+const WsConnection = require('./ws-connection');
+const { GroqLLM, TurnScheduler } = require('./shared-components');
+
+class RelaySession {
+  /**
+   * transport.send(message) sends JSON to the browser,
+   * transport.sendAudio(frame) a framed TTS chunk
+   */
+  constructor(id, transport, shared, config, options = {}) {
+    this.id = id;
+    this.transport = transport;
+    this.shared = shared;        // { deepgram, minimax, responseCache, metrics }
+    this.config = config;
+    this.options = {
+      voice: null,               // voices key; null = first configured voice
+      maxPendingAudioMs: 2000,   // mic audio held while the STT socket opens
+      ...options
+    };
+
+    const voiceName = this.options.voice || Object.keys(config.voices || {})[0];
+    this.voice = config.voices?.[voiceName];
+    if (!this.voice) {
+      throw new Error(`Voice "${voiceName}" not found`);
+    }
+
+    // The connection is shared - no per-session warm-up
+    this.groq = new GroqLLM({ ...config, groq: { ...config.groq, warmup: false } });
+    this.groq.responseCache = shared.responseCache;
+    (this.options.context || []).forEach(context => this.groq.addContext(context));
+    this.groq.on('sentence', sentence => this.deliverSentence(sentence));
+    this.groq.on('complete', (response) => {
+      this.send({ type: 'ai_message_complete', text: response, turn: this.turnId });
+    });
+
+    this.scheduler = new TurnScheduler({
+      run: turn => this.runTurn(turn),
+      cancel: (turn, reason) => this.cancelTurn(turn, reason)
+    }, config.turns);
+
+    this.stt = null;
+    this.pendingAudio = [];
+    this.pendingAudioBytes = 0;
+    this.closed = false;
+
+    this.turnId = 0;
+    this.tts = [];               // this turn's TTS requests, in playback order
+    this.generating = false;
+    this.finalAt = 0;
+    this.firstAudioAt = 0;
+
+    this.stats = {
+      audioBytesIn: 0,
+      audioBytesOut: 0,
+      sttReconnects: 0
+    };
+  }
+
+  send(message) {
+    this.transport.send({ ...message, session: this.id });
+  }
+
+  async start() {
+    await this.connectStt();
+    this.send({ type: 'ready', voice: this.voice.id });
+  }
+
+  async connectStt() {
+    const ws = await this.shared.deepgram.acquire();
+    if (this.closed) {
+      this.shared.deepgram.release(ws);
+      return;
+    }
+
+    this.stt = ws;
+    ws.on('message', (data) => {
+      try {
+        this.handleSttMessage(JSON.parse(data));
+      } catch (error) {
+        console.error(`[RelaySession ${this.id}] Bad Deepgram message:`, error.message);
+      }
+    });
+    ws.on('close', () => {
+      if (this.stt !== ws || this.closed) return;
+      this.stt = null;
+      this.stats.sttReconnects++;
+      console.warn(`[RelaySession ${this.id}] Deepgram closed - reconnecting`);
+      this.connectStt().catch((error) => {
+        this.send({ type: 'error', error: `STT unavailable: ${error.message}` });
+      });
+    });
+
+    // Audio that arrived while connecting
+    const pending = this.pendingAudio;
+    this.pendingAudio = [];
+    this.pendingAudioBytes = 0;
+    pending.forEach(chunk => ws.send(chunk));
+  }
+
+  /**
+   * Mic PCM (linear16 at deepgram.sampleRate) from the browser
+   */
+  handleAudio(payload) {
+    this.stats.audioBytesIn += payload.length;
+    if (this.stt && this.stt.readyState === WsConnection.OPEN) {
+      this.stt.send(payload);
+      return;
+    }
+
+    // Keep the most recent audio until the socket is back
+    this.pendingAudio.push(Buffer.from(payload));
+    this.pendingAudioBytes += payload.length;
+    const maxBytes = (this.config.deepgram?.sampleRate || 16000) * 2 * this.options.maxPendingAudioMs / 1000;
+    while (this.pendingAudioBytes > maxBytes && this.pendingAudio.length > 1) {
+      this.pendingAudioBytes -= this.pendingAudio.shift().length;
+    }
+  }
+
+  handleSttMessage(data) {
+    if (data.type === 'Results') {
+      const result = data.channel?.alternatives?.[0];
+      if (!result || !result.transcript) return;
+
+      if (data.is_final) {
+        this.finalAt = Date.now();
+        this.scheduler.submit(result.transcript, {
+          confidence: result.confidence,
+          speechFinal: data.speech_final
+        });
+      } else {
+        this.send({ type: 'interim_transcript', text: result.transcript });
+      }
+    } else if (data.type === 'SpeechStarted') {
+      // The browser fuses this with its own VAD for barge-in
+      this.send({ type: 'speech_started' });
+    } else if (data.type === 'UtteranceEnd') {
+      this.scheduler.flush();
+    }
+  }
+
+  /**
+   * Typed input skips STT
+   */
+  handleText(text) {
+    if (!text || !text.trim()) return;
+    this.finalAt = Date.now();
+    this.scheduler.submit(text, { speechFinal: true });
+  }
+
+  /**
+   * Run one turn (called by the TurnScheduler, one at a time)
+   */
+  async runTurn(turn) {
+    this.turnId++;
+    this.tts = [];
+    this.firstAudioAt = 0;
+    this.send({ type: 'user_message', text: turn.text, turn: this.turnId });
+
+    const startTime = Date.now();
+    this.generating = true;
+    try {
+      const response = await this.groq.generateResponse(turn.text, { history: false });
+      if (response !== null && !turn.cancelled) {
+        this.groq.commitExchange(turn.text, response);
+        this.shared.metrics.record('llm_response', Date.now() - startTime);
+      }
+    } finally {
+      this.generating = false;
+    }
+
+    if (!turn.cancelled && this.tts.length === 0) {
+      this.send({ type: 'ai_audio_end', turn: this.turnId });
+    }
+  }
+
+  deliverSentence(sentence) {
+    const turn = this.scheduler.running;
+    if (!turn || turn.cancelled) return;
+    turn.delivered.push(sentence);
+    this.send({ type: 'ai_sentence', text: sentence, turn: this.turnId });
+
+    const entry = { frames: [], done: false, sentence: turn.delivered.length - 1 };
+    entry.request = this.shared.minimax.speak(this.voice.id, sentence, { turnId: this.turnId }, {
+      onAudio: frame => this.queueAudio(entry, frame),
+      onEnd: () => this.endAudio(entry),
+      onError: (error) => {
+        this.send({ type: 'error', error: `TTS failed: ${error.message}` });
+        this.endAudio(entry);
+      }
+    });
+    this.tts.push(entry);
+  }
+
+  /**
+   * Sentences may be synthesized on different sockets at once - audio is
+   * forwarded in sentence order, later sentences buffer until it's their turn
+   */
+  queueAudio(entry, frame) {
+    if (this.tts[0] === entry) {
+      this.forwardAudio(entry, frame);
+    } else {
+      entry.frames.push(Buffer.from(frame));
+    }
+  }
+
+  endAudio(entry) {
+    entry.done = true;
+    while (this.tts.length > 0 && this.tts[0].done) {
+      this.tts.shift();
+      const next = this.tts[0];
+      if (next) {
+        next.frames.forEach(frame => this.forwardAudio(next, frame));
+        next.frames = [];
+      }
+    }
+    if (this.tts.length === 0 && !this.generating) {
+      this.send({ type: 'ai_audio_end', turn: this.turnId });
+    }
+  }
+
+  forwardAudio(entry, frame) {
+    if (!this.firstAudioAt) {
+      this.firstAudioAt = Date.now();
+      if (this.finalAt) {
+        this.shared.metrics.record('final_to_first_audio', this.firstAudioAt - this.finalAt);
+      }
+    }
+    this.stats.audioBytesOut += frame.length;
+    this.transport.sendAudio(frame, this.turnId, entry.sentence);
+  }
+
+  cancelTts() {
+    this.tts.forEach(entry => entry.request.cancel());
+    this.tts = [];
+  }
+
+  /**
+   * Stop a turn the scheduler cancelled (superseded, interrupted, closed)
+   */
+  cancelTurn(turn, reason) {
+    this.groq.cancel();
+    if (turn.delivered.length > 0) {
+      // Keep what the caller actually heard so the next reply has context
+      this.groq.commitExchange(turn.text, turn.delivered.join(' '));
+      this.cancelTts();
+    }
+    this.send({ type: 'turn_cancelled', turn: this.turnId, reason });
+  }
+
+  /**
+   * The browser detected a barge-in
+   */
+  interrupt() {
+    this.scheduler.interrupt();
+    this.cancelTts();
+    this.send({ type: 'interrupted', turn: this.turnId });
+  }
+
+  close() {
+    if (this.closed) return;
+    this.closed = true;
+    this.scheduler.cancelAll('closed');
+    this.cancelTts();
+    this.groq.cancel();
+    if (this.stt) {
+      this.shared.deepgram.release(this.stt);
+      this.stt = null;
+    }
+  }
+
+  getStats() {
+    return {
+      ...this.stats,
+      turns: this.scheduler.getStats(),
+      llmTtft: this.groq.getTtftStats()
+    };
+  }
+}
+
+module.exports = RelaySession;
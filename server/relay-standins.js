@@ -0,0 +1,222 @@
+/**
+ * Relay Stand-ins (Node)
+ * Local imitations of the three upstreams for load testing the relay -
+ * same wire protocols, fixed latencies, no keys, no cost:
+ *   Deepgram  ws  /v1/listen   interim / final Results driven by the audio
+ *                               itself (non-zero PCM = speech), SpeechStarted,
+ *                               endpointing after `endpointing` ms of silence
+ *   Groq      http /openai/v1   SSE chat completions after ttftMs, one token
+ *                               every tokenMs; /models for warm-up
+ *   MiniMax   ws  /minimax      auth, then framed binary PCM per tts request
+ *                               after ttfbMs, paced faster than real time
+ */
+
+const http = require('http');
+const WsConnection = require('./ws-connection');
+const { AudioChunkIngestor } = require('./shared-components');
+
+class RelayStandIns {
+  constructor(options = {}) {
+    this.options = {
+      port: 0,
+      ttftMs: 150,               // Groq request to first token
+      tokenMs: 8,                // between tokens
+      ttfbMs: 120,               // MiniMax request to first audio
+      chunkMs: 100,              // audio per TTS chunk
+      chunkIntervalMs: 25,       // chunk pacing (4x real time)
+      charsPerSecond: 14,        // speech duration of TTS text
+      sttSampleRate: 16000,
+      ttsSampleRate: 24000,
+      transcript: 'I would like two plates of jollof rice and a bottle of water please',
+      reply: 'Sure, two plates of jollof rice and a bottle of water. Would you like anything else with that? Delivery takes about thirty minutes.',
+      ...options
+    };
+
+    this.server = null;
+    this.stats = {
+      sttStreams: 0,
+      sttBytes: 0,
+      completions: 0,
+      ttsSockets: 0,
+      ttsRequests: 0
+    };
+  }
+
+  async start() {
+    this.server = http.createServer((req, res) => this.handleHttp(req, res));
+    this.server.on('upgrade', (req, socket, head) => {
+      const path = new URL(req.url, 'http://standin').pathname;
+      const ws = WsConnection.accept(req, socket, head);
+      if (!ws) return;
+      if (path === '/v1/listen') {
+        this.handleDeepgram(ws, req);
+      } else if (path === '/minimax') {
+        this.handleMiniMax(ws);
+      } else {
+        ws.close(1008, 'Unknown path');
+      }
+    });
+
+    await new Promise(resolve => this.server.listen(this.options.port, '127.0.0.1', resolve));
+    this.port = this.server.address().port;
+    return {
+      groqOrigin: `http://127.0.0.1:${this.port}`,
+      deepgramUrl: `ws://127.0.0.1:${this.port}/v1/listen`,
+      minimaxUrl: `ws://127.0.0.1:${this.port}/minimax`
+    };
+  }
+
+  handleHttp(req, res) {
+    if (req.url === '/openai/v1/models') {
+      res.writeHead(200, { 'Content-Type': 'application/json' });
+      res.end('{"data":[]}');
+      return;
+    }
+
+    if (req.url === '/openai/v1/chat/completions' && req.method === 'POST') {
+      req.resume();
+      req.on('end', () => this.streamCompletion(res));
+      return;
+    }
+
+    res.writeHead(404);
+    res.end();
+  }
+
+  streamCompletion(res) {
+    this.stats.completions++;
+    res.writeHead(200, { 'Content-Type': 'text/event-stream' });
+
+    const tokens = this.options.reply.split(/(?<= )/);
+    let index = 0;
+    let timer = null;
+    const next = () => {
+      if (res.destroyed) return;
+      if (index >= tokens.length) {
+        res.end('data: [DONE]\n\n');
+        return;
+      }
+      res.write(`data: ${JSON.stringify({ choices: [{ delta: { content: tokens[index++] } }] })}\n\n`);
+      timer = setTimeout(next, this.options.tokenMs);
+    };
+    timer = setTimeout(next, this.options.ttftMs);
+    res.on('close', () => clearTimeout(timer));
+  }
+
+  /**
+   * Timing comes from the audio received, not the wall clock
+   */
+  handleDeepgram(ws, req) {
+    this.stats.sttStreams++;
+    const params = new URL(req.url, 'http://standin').searchParams;
+    const endpointingMs = Number(params.get('endpointing') || 300);
+    const bytesPerMs = this.options.sttSampleRate * 2 / 1000;
+    const words = this.options.transcript.split(' ');
+
+    const state = { speechMs: 0, silenceMs: 0, speaking: false, interimsSent: 0 };
+    const results = (transcript, isFinal) => JSON.stringify({
+      type: 'Results',
+      is_final: isFinal,
+      speech_final: isFinal,
+      channel: { alternatives: [{ transcript, confidence: 0.98 }] }
+    });
+
+    ws.on('message', (data, isBinary) => {
+      if (!isBinary) {
+        if (data.includes('CloseStream')) ws.close();
+        return;
+      }
+
+      this.stats.sttBytes += data.length;
+      const ms = data.length / bytesPerMs;
+      const speech = data.length >= 2 && data.readInt16LE(0) !== 0;
+
+      if (speech) {
+        if (!state.speaking) {
+          state.speaking = true;
+          state.speechMs = 0;
+          state.interimsSent = 0;
+          ws.send('{"type":"SpeechStarted"}');
+        }
+        state.speechMs += ms;
+        state.silenceMs = 0;
+
+        // An interim every 250 ms of speech, growing word by word
+        const due = Math.floor(state.speechMs / 250);
+        if (due > state.interimsSent) {
+          state.interimsSent = due;
+          ws.send(results(words.slice(0, Math.min(words.length, due * 3)).join(' '), false));
+        }
+      } else if (state.speaking) {
+        state.silenceMs += ms;
+        if (state.silenceMs >= endpointingMs) {
+          state.speaking = false;
+          ws.send(results(this.options.transcript, true));
+          ws.send('{"type":"UtteranceEnd"}');
+        }
+      }
+    });
+  }
+
+  handleMiniMax(ws) {
+    this.stats.ttsSockets++;
+    const bytesPerMs = this.options.ttsSampleRate * 2 / 1000;
+    const chunkBytes = Math.round(this.options.chunkMs * bytesPerMs);
+    const chunk = new Uint8Array(chunkBytes).fill(1);
+    let binaryFrames = true;
+    const timers = new Set();
+
+    ws.on('message', (data) => {
+      const message = JSON.parse(data);
+
+      if (message.type === 'auth') {
+        binaryFrames = message.binary_frames !== false;
+        ws.send(JSON.stringify({ type: 'auth_success', session_id: `standin-${this.stats.ttsSockets}`, binary_frames: binaryFrames }));
+        return;
+      }
+
+      if (message.type !== 'tts') return;
+      this.stats.ttsRequests++;
+
+      const tag = { turn_id: message.turn_id, seq: message.seq };
+      const speechMs = message.text.length / this.options.charsPerSecond * 1000;
+      let chunks = Math.max(1, Math.ceil(speechMs / this.options.chunkMs));
+
+      ws.send(JSON.stringify({ type: 'audio_start', ...tag }));
+      const send = () => {
+        timers.delete(timer);
+        if (ws.readyState !== WsConnection.OPEN) return;
+        if (binaryFrames) {
+          ws.send(AudioChunkIngestor.encodeFrame(chunk, { codec: 'pcm16', turnId: message.turn_id, seq: message.seq }));
+        } else {
+          ws.send(JSON.stringify({ type: 'audio_chunk', ...tag, audio: Buffer.from(chunk).toString('base64') }));
+        }
+        if (--chunks > 0) {
+          timer = setTimeout(send, this.options.chunkIntervalMs);
+          timers.add(timer);
+        } else {
+          ws.send(JSON.stringify({ type: 'audio_end', ...tag }));
+        }
+      };
+      let timer = setTimeout(send, this.options.ttfbMs);
+      timers.add(timer);
+    });
+
+    ws.on('close', () => timers.forEach(timer => clearTimeout(timer)));
+  }
+
+  /**
+   * Caller-perceived latency the stand-ins alone impose on a turn
+   */
+  getBaselineMs(endpointingMs = 300) {
+    const firstSentence = this.options.reply.split(/(?<=[.!?])\s/)[0];
+    const tokens = firstSentence.split(' ').length;
+    return endpointingMs + this.options.ttftMs + tokens * this.options.tokenMs + this.options.ttfbMs;
+  }
+
+  stop() {
+    return new Promise(resolve => this.server.close(resolve));
+  }
+}
+
+module.exports = RelayStandIns;
@@ -0,0 +1,30 @@
+/**
+ * Shared Components (Node)
+ * Loads the browser modules the relay reuses unchanged. They reference
+ * each other as globals (as the script tags provide in the page), so each
+ * is installed on globalThis in the same order the demo page loads them
+ */
+
+const path = require('path');
+
+const MODULES = [
+  ['MetricsStore', 'metrics-store.js'],
+  ['SSEParser', 'sse-parser.js'],
+  ['SentenceChunker', 'sentence-chunker.js'],
+  ['LLMResponseCache', 'llm-response-cache.js'],
+  ['ConversationContext', 'conversation-context.js'],
+  ['GroqLLM', 'groq-llm.js'],
+  ['AudioChunkIngestor', 'audio-chunk-ingestor.js'],
+  ['TurnScheduler', 'turn-scheduler.js']
+];
+
+const components = {};
+MODULES.forEach(([name, file]) => {
+  const component = require(path.join(__dirname, '..', file));
+  if (globalThis[name] === undefined) {
+    globalThis[name] = component;
+  }
+  components[name] = globalThis[name];
+});
+
+module.exports = components;
@@ -0,0 +1,375 @@
+/**
+ * Voice Relay Server (Node)
+ * Runs conversations server-side so browsers never hold API keys and
+ * upstream connections are shared across callers.
+ *
+ * Each browser opens ONE WebSocket to /relay and multiplexes any number of
+ * sessions over it:
+ *   text frames    JSON control, always with a `session` id
+ *                  browser -> server: open {voice, context}, close,
+ *                  interrupt, text {text}
+ *                  server -> browser: ready, interim_transcript,
+ *                  user_message, speech_started, ai_sentence,
+ *                  ai_message_complete, ai_audio_end, turn_cancelled,
+ *                  interrupted, error
+ *   binary frames  4-byte header + payload
+ *                  byte 0 kind (1 = mic PCM up, 2 = TTS audio down)
+ *                  byte 1 reserved
+ *                  bytes 2-3 session id (uint16, little-endian)
+ *                  TTS payloads are AudioChunkIngestor frames with the
+ *                  session's turn id, and the sentence index within the turn
+ *                  in place of the upstream seq (bytes 4-7)
+ *
+ * Upstreams: Deepgram sockets from a warm pool (one per session, as the
+ * API requires), MiniMax sockets shared by all sessions, Groq over the
+ * process-wide keep-alive HTTP pool behind fetch(), plus an optional LLM
+ * response cache for FAQ answers (RELAY_LLM_CACHE=1). One event loop per
+ * process; `--workers N` forks a process per core behind the cluster module
+ *
+ *   node server/voice-relay-server.js --port 8787 --workers 4
+ */
+
+const http = require('http');
+const os = require('os');
+const cluster = require('cluster');
+
+const WsConnection = require('./ws-connection');
+const DeepgramPool = require('./deepgram-pool');
+const MiniMaxPool = require('./minimax-pool');
+const RelaySession = require('./relay-session');
+const { GroqLLM, LLMResponseCache, MetricsStore } = require('./shared-components');
+
+const MUX_HEADER_BYTES = 4;
+const MUX_MIC = 1;
+const MUX_TTS = 2;
+
+class VoiceRelayServer {
+  constructor(config, options = {}) {
+    this.options = {
+      port: 8787,
+      host: '0.0.0.0',
+      path: '/relay',
+      token: null,               // required ?token= for browsers, if set
+      maxSessions: 500,          // per process
+      groqOrigin: null,          // override the Groq API origin (stand-ins)
+      deepgramUrl: undefined,    // override the Deepgram listen URL (stand-ins)
+      deepgramSpares: 4,
+      minimax: {},               // MiniMaxPool options
+      ...options
+    };
+
+    // Passed to every GroqLLM this server creates, never set class-wide
+    this.config = this.options.groqOrigin
+      ? { ...config, groq: { ...config.groq, origin: this.options.groqOrigin } }
+      : config;
+
+    this.deepgram = new DeepgramPool(this.config, {
+      spares: this.options.deepgramSpares,
+      ...(this.options.deepgramUrl ? { url: this.options.deepgramUrl } : {})
+    });
+    this.minimax = new MiniMaxPool(this.config, this.options.minimax);
+    // Shared by every session in the process, so off unless configured.
+    // Keys include the pinned context, so sessions opened with different
+    // context never share answers
+    this.responseCache = new LLMResponseCache({ enabled: false, ...this.config.llmCache });
+    this.metrics = new MetricsStore({ windowSize: 1000 });
+
+    // Warms and keeps warm the shared Groq connection
+    this.groqWarmer = new GroqLLM(this.config);
+
+    this.server = null;
+    this.clients = new Set();
+    this.sessionCount = 0;
+    this.cpuStart = null;
+
+    this.stats = {
+      clients: 0,
+      sessionsOpened: 0,
+      sessionsClosed: 0,
+      rejected: 0,
+      bytesDown: 0,
+      bytesUp: 0
+    };
+  }
+
+  async start() {
+    this.deepgram.start();
+    this.minimax.start();
+    this.groqWarmer.warmUp();
+    this.groqWarmer.startKeepWarm();
+    this.cpuStart = { usage: process.cpuUsage(), time: process.hrtime.bigint() };
+
+    this.server = http.createServer((req, res) => this.handleHttp(req, res));
+    this.server.on('upgrade', (req, socket, head) => this.handleUpgrade(req, socket, head));
+
+    await new Promise((resolve) => {
+      this.server.listen(this.options.port, this.options.host, resolve);
+    });
+    this.port = this.server.address().port;
+    console.log(`[Relay] Listening on ${this.options.host}:${this.port}${this.options.path} (pid ${process.pid})`);
+    return this.port;
+  }
+
+  /**
+   * GET /health, GET /stats
+   */
+  handleHttp(req, res) {
+    if (req.url === '/health') {
+      res.writeHead(200, { 'Content-Type': 'text/plain' });
+      res.end('ok');
+      return;
+    }
+    if (req.url === '/stats') {
+      res.writeHead(200, { 'Content-Type': 'application/json' });
+      res.end(JSON.stringify(this.getStats()));
+      return;
+    }
+    res.writeHead(404);
+    res.end();
+  }
+
+  handleUpgrade(req, socket, head) {
+    const url = new URL(req.url, 'http://relay');
+    if (url.pathname !== this.options.path ||
+        (this.options.token && url.searchParams.get('token') !== this.options.token)) {
+      socket.end('HTTP/1.1 403 Forbidden\r\n\r\n');
+      return;
+    }
+
+    const ws = WsConnection.accept(req, socket, head);
+    if (ws) this.handleClient(ws);
+  }
+
+  handleClient(ws) {
+    const client = { ws, sessions: new Map() };
+    this.clients.add(client);
+    this.stats.clients++;
+
+    ws.on('message', (data, isBinary) => {
+      if (isBinary) {
+        this.handleBinary(client, data);
+      } else {
+        this.handleControl(client, data);
+      }
+    });
+
+    ws.on('close', () => {
+      client.sessions.forEach(session => this.closeSession(client, session));
+      this.clients.delete(client);
+    });
+
+    ws.on('error', (error) => {
+      console.warn('[Relay] Client socket error:', error.message);
+    });
+  }
+
+  handleBinary(client, data) {
+    if (data.length <= MUX_HEADER_BYTES || data[0] !== MUX_MIC) return;
+    const session = client.sessions.get(data.readUInt16LE(2));
+    if (!session) return;
+
+    this.stats.bytesUp += data.length;
+    session.handleAudio(data.subarray(MUX_HEADER_BYTES));
+  }
+
+  handleControl(client, text) {
+    let message;
+    try {
+      message = JSON.parse(text);
+    } catch (error) {
+      return;
+    }
+
+    const id = message.session;
+    const session = client.sessions.get(id);
+
+    switch (message.type) {
+      case 'open':
+        this.openSession(client, id, message);
+        break;
+      case 'close':
+        if (session) this.closeSession(client, session);
+        break;
+      case 'interrupt':
+        if (session) session.interrupt();
+        break;
+      case 'text':
+        if (session) session.handleText(message.text);
+        break;
+    }
+  }
+
+  openSession(client, id, message) {
+    const send = (payload) => client.ws.send(JSON.stringify(payload));
+
+    if (!Number.isInteger(id) || id < 0 || id > 0xFFFF || client.sessions.has(id)) {
+      send({ type: 'error', session: id, error: 'Invalid or duplicate session id' });
+      return;
+    }
+    if (this.sessionCount >= this.options.maxSessions) {
+      this.stats.rejected++;
+      send({ type: 'error', session: id, error: 'Server at capacity' });
+      return;
+    }
+
+    const transport = {
+      send,
+      sendAudio: (frame, turnId, sentence) => this.sendAudio(client, id, frame, turnId, sentence)
+    };
+
+    let session;
+    try {
+      session = new RelaySession(id, transport, {
+        deepgram: this.deepgram,
+        minimax: this.minimax,
+        responseCache: this.responseCache,
+        metrics: this.metrics
+      }, this.config, { voice: message.voice, context: message.context });
+    } catch (error) {
+      send({ type: 'error', session: id, error: error.message });
+      return;
+    }
+
+    client.sessions.set(id, session);
+    this.sessionCount++;
+    this.stats.sessionsOpened++;
+
+    const startTime = Date.now();
+    session.start()
+      .then(() => this.metrics.record('session_start', Date.now() - startTime))
+      .catch((error) => {
+        send({ type: 'error', session: id, error: `Session failed to start: ${error.message}` });
+        this.closeSession(client, session);
+      });
+  }
+
+  closeSession(client, session) {
+    if (client.sessions.get(session.id) !== session) return;
+    client.sessions.delete(session.id);
+    this.sessionCount--;
+    this.stats.sessionsClosed++;
+    session.close();
+  }
+
+  /**
+   * Mux header + the TTS frame, with the session's turn id and the sentence
+   * index written over the pooled socket's turn id / seq. The seq field
+   * changes meaning here - see the header comment in audio-chunk-ingestor.js
+   */
+  sendAudio(client, sessionId, frame, turnId, sentence) {
+    const out = Buffer.allocUnsafe(MUX_HEADER_BYTES + frame.length);
+    out[0] = MUX_TTS;
+    out[1] = 0;
+    out.writeUInt16LE(sessionId, 2);
+    frame.copy(out, MUX_HEADER_BYTES);
+    out.writeUInt16LE(turnId & 0xFFFF, MUX_HEADER_BYTES + 2);
+    out.writeUInt32LE(sentence, MUX_HEADER_BYTES + 4);
+
+    this.stats.bytesDown += out.length;
+    client.ws.send(out);
+  }
+
+  /**
+   * CPU used by this process since start, as a fraction of one core
+   */
+  getCpuLoad() {
+    const usage = process.cpuUsage(this.cpuStart.usage);
+    const elapsedUs = Number(process.hrtime.bigint() - this.cpuStart.time) / 1000;
+    return elapsedUs > 0 ? (usage.user + usage.system) / elapsedUs : 0;
+  }
+
+  /**
+   * Restart the CPU measurement window (load tests, per level)
+   */
+  resetCpu() {
+    this.cpuStart = { usage: process.cpuUsage(), time: process.hrtime.bigint() };
+  }
+
+  getStats() {
+    return {
+      pid: process.pid,
+      sessions: this.sessionCount,
+      clients: this.clients.size,
+      cpuLoad: +this.getCpuLoad().toFixed(3),
+      rssMB: Math.round(process.memoryUsage().rss / 1048576),
+      ...this.stats,
+      latency: this.metrics.snapshot(),
+      deepgram: this.deepgram.getStats(),
+      minimax: this.minimax.getStats(),
+      llmCache: this.responseCache.getStats()
+    };
+  }
+
+  async stop() {
+    this.clients.forEach((client) => {
+      client.sessions.forEach(session => this.closeSession(client, session));
+      client.ws.close(1001, 'Server shutting down');
+    });
+    this.groqWarmer.stopKeepWarm();
+    this.deepgram.close();
+    this.minimax.close();
+    await new Promise(resolve => this.server.close(resolve));
+  }
+
+  /**
+   * Relay config from the environment - same shape as the browser config
+   */
+  static configFromEnv(env = process.env) {
+    return {
+      deepgramApiKey: env.DEEPGRAM_API_KEY,
+      groqApiKey: env.GROQ_API_KEY,
+      apiKey: env.MINIMAX_API_KEY,
+      groupId: env.MINIMAX_GROUP_ID,
+      model: env.MINIMAX_MODEL || 'speech-02-hd',
+      endpoints: { websocket: env.MINIMAX_WS_URL },
+      // Same shape as config.voices in the page, e.g. {"austyn":{"id":"..."}}
+      voices: env.RELAY_VOICES ? JSON.parse(env.RELAY_VOICES) : {},
+      streaming: { format: env.MINIMAX_FORMAT || 'pcm', sampleRate: 24000 },
+      performance: {},
+      deepgram: {},
+      groq: {},
+      // Shared across callers - only context-free FAQ answers are cached
+      llmCache: { enabled: env.RELAY_LLM_CACHE === '1' }
+    };
+  }
+}
+
+/**
+ * Parse --name value flags
+ */
+function parseArgs(argv) {
+  const args = {};
+  for (let i = 0; i < argv.length; i++) {
+    if (argv[i].startsWith('--')) {
+      const next = argv[i + 1];
+      args[argv[i].slice(2)] = next === undefined || next.startsWith('--') ? true : argv[++i];
+    }
+  }
+  return args;
+}
+
+if (require.main === module) {
+  const args = parseArgs(process.argv.slice(2));
+  const workers = Number(args.workers || os.cpus().length);
+
+  if (cluster.isPrimary && workers > 1) {
+    console.log(`[Relay] Starting ${workers} workers`);
+    for (let i = 0; i < workers; i++) cluster.fork();
+    cluster.on('exit', (worker, code) => {
+      console.warn(`[Relay] Worker ${worker.process.pid} exited (${code}) - restarting`);
+      cluster.fork();
+    });
+  } else {
+    const server = new VoiceRelayServer(VoiceRelayServer.configFromEnv(), {
+      port: Number(args.port || process.env.PORT || 8787),
+      token: args.token || process.env.RELAY_TOKEN || null,
+      groqOrigin: args['groq-origin'],
+      deepgramUrl: args['deepgram-url']
+    });
+    server.start();
+    process.on('SIGTERM', () => server.stop().then(() => process.exit(0)));
+  }
+}
+
+module.exports = VoiceRelayServer;
+module.exports.parseArgs = parseArgs;
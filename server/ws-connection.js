@@ -0,0 +1,410 @@
+/**
+ * WebSocket Connection (Node)
+ * Minimal RFC 6455 endpoint for the relay - no dependencies
+ * Works on both sides: browser connections accepted from an HTTP upgrade,
+ * and upstream connections (Deepgram, MiniMax) opened from the server.
+ * Text and binary messages, fragmentation, ping/pong and close; no
+ * extensions (permessage-deflate would cost more CPU than it saves on audio)
+ */
+
+const crypto = require('crypto');
+const http = require('http');
+const https = require('https');
+
+const HANDSHAKE_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11';
+const LITTLE_ENDIAN = require('os').endianness() === 'LE';
+
+// Mask keys are drawn from a pre-filled random pool, not one syscall each
+const MASK_POOL_BYTES = 4096;
+let maskPool = crypto.randomBytes(MASK_POOL_BYTES);
+let maskOffset = 0;
+
+function nextMaskKey() {
+  if (maskOffset + 4 > MASK_POOL_BYTES) {
+    maskPool = crypto.randomBytes(MASK_POOL_BYTES);
+    maskOffset = 0;
+  }
+  const key = maskPool.subarray(maskOffset, maskOffset + 4);
+  maskOffset += 4;
+  return key;
+}
+
+const OPCODES = {
+  continuation: 0x0,
+  text: 0x1,
+  binary: 0x2,
+  close: 0x8,
+  ping: 0x9,
+  pong: 0xA
+};
+
+class WsConnection {
+  constructor(socket, options = {}) {
+    this.socket = socket;
+    this.options = {
+      client: false,               // client frames are masked
+      maxMessageBytes: 16 * 1024 * 1024,
+      ...options
+    };
+
+    this.readyState = WsConnection.OPEN;
+    this.protocol = options.protocol || null;
+    this.listeners = {};
+
+    this.buffer = null;            // unparsed bytes
+    this.fragments = [];
+    this.fragmentOpcode = 0;
+    this.fragmentBytes = 0;
+
+    this.stats = {
+      messagesIn: 0,
+      messagesOut: 0,
+      bytesIn: 0,
+      bytesOut: 0
+    };
+
+    socket.setNoDelay(true);
+    socket.on('data', data => this.receive(data));
+    socket.on('close', () => this.handleClose(1006, ''));
+    socket.on('error', (error) => this.emit('error', error));
+
+    if (options.head && options.head.length > 0) {
+      this.receive(options.head);
+    }
+  }
+
+  /**
+   * Bytes written but not yet flushed to the kernel (backpressure)
+   */
+  get bufferedAmount() {
+    return this.socket.writableLength;
+  }
+
+  /**
+   * Send a string (text frame) or Buffer / ArrayBuffer / typed array (binary)
+   */
+  send(data) {
+    if (this.readyState !== WsConnection.OPEN) return false;
+
+    if (typeof data === 'string') {
+      this.writeFrame(OPCODES.text, Buffer.from(data));
+    } else if (Buffer.isBuffer(data)) {
+      this.writeFrame(OPCODES.binary, data);
+    } else if (data instanceof ArrayBuffer) {
+      this.writeFrame(OPCODES.binary, Buffer.from(data));
+    } else {
+      this.writeFrame(OPCODES.binary, Buffer.from(data.buffer, data.byteOffset, data.byteLength));
+    }
+    this.stats.messagesOut++;
+    return true;
+  }
+
+  ping(data = Buffer.alloc(0)) {
+    if (this.readyState !== WsConnection.OPEN) return;
+    this.writeFrame(OPCODES.ping, data);
+  }
+
+  close(code = 1000, reason = '') {
+    if (this.readyState !== WsConnection.OPEN) return;
+    this.readyState = WsConnection.CLOSING;
+
+    const payload = Buffer.alloc(2 + Buffer.byteLength(reason));
+    payload.writeUInt16BE(code, 0);
+    payload.write(reason, 2);
+    this.writeFrame(OPCODES.close, payload);
+
+    // Don't wait forever for the peer's close frame
+    this.closeTimer = setTimeout(() => this.socket.destroy(), 2000);
+    this.closeTimer.unref?.();
+  }
+
+  terminate() {
+    this.socket.destroy();
+  }
+
+  writeFrame(opcode, payload) {
+    const length = payload.length;
+    const mask = this.options.client;
+    let headerBytes = 2;
+    if (length >= 65536) headerBytes += 8;
+    else if (length >= 126) headerBytes += 2;
+    if (mask) headerBytes += 4;
+
+    const header = Buffer.allocUnsafe(headerBytes);
+    header[0] = 0x80 | opcode;
+    let offset = 2;
+    if (length >= 65536) {
+      header[1] = 127;
+      header.writeBigUInt64BE(BigInt(length), 2);
+      offset += 8;
+    } else if (length >= 126) {
+      header[1] = 126;
+      header.writeUInt16BE(length, 2);
+      offset += 2;
+    } else {
+      header[1] = length;
+    }
+
+    if (mask) {
+      header[1] |= 0x80;
+      const key = nextMaskKey();
+      key.copy(header, offset);
+      payload = WsConnection.applyMask(Buffer.from(payload), key);
+    }
+
+    this.stats.bytesOut += headerBytes + length;
+    // One syscall for header + payload
+    this.socket.cork();
+    this.socket.write(header);
+    if (length > 0) this.socket.write(payload);
+    process.nextTick(() => this.socket.uncork());
+  }
+
+  /**
+   * XOR a payload with a 4-byte key in place, a 32-bit word at a time
+   * where the buffer is aligned (mic frames are masked on every hop)
+   */
+  static applyMask(payload, key) {
+    let i = 0;
+    if (LITTLE_ENDIAN && payload.byteOffset % 4 === 0 && payload.length >= 16) {
+      const words = new Uint32Array(payload.buffer, payload.byteOffset, payload.length >> 2);
+      const keyWord = key[0] | (key[1] << 8) | (key[2] << 16) | (key[3] << 24);
+      for (let w = 0; w < words.length; w++) {
+        words[w] ^= keyWord;
+      }
+      i = words.length << 2;
+    }
+    for (; i < payload.length; i++) {
+      payload[i] ^= key[i & 3];
+    }
+    return payload;
+  }
+
+  receive(data) {
+    this.stats.bytesIn += data.length;
+    this.buffer = this.buffer ? Buffer.concat([this.buffer, data]) : data;
+
+    while (this.buffer && this.readyState !== WsConnection.CLOSED) {
+      const consumed = this.parseFrame(this.buffer);
+      if (consumed === 0) break;
+      this.buffer = consumed < this.buffer.length ? this.buffer.subarray(consumed) : null;
+    }
+  }
+
+  /**
+   * Parse one frame from the front of buf; returns bytes consumed (0 = need more)
+   */
+  parseFrame(buf) {
+    if (buf.length < 2) return 0;
+
+    const fin = (buf[0] & 0x80) !== 0;
+    const opcode = buf[0] & 0x0F;
+    const masked = (buf[1] & 0x80) !== 0;
+    let length = buf[1] & 0x7F;
+    let offset = 2;
+
+    if (length === 126) {
+      if (buf.length < 4) return 0;
+      length = buf.readUInt16BE(2);
+      offset = 4;
+    } else if (length === 127) {
+      if (buf.length < 10) return 0;
+      length = Number(buf.readBigUInt64BE(2));
+      offset = 10;
+    }
+
+    if (length > this.options.maxMessageBytes) {
+      this.close(1009, 'Message too big');
+      this.socket.destroy();
+      return 0;
+    }
+
+    const maskOffset = offset;
+    if (masked) offset += 4;
+    if (buf.length < offset + length) return 0;
+
+    let payload = buf.subarray(offset, offset + length);
+    if (masked) {
+      // Copy out so the shared receive buffer isn't modified
+      payload = WsConnection.applyMask(Buffer.from(payload), buf.subarray(maskOffset, maskOffset + 4));
+    }
+
+    this.handleFrame(fin, opcode, payload);
+    return offset + length;
+  }
+
+  handleFrame(fin, opcode, payload) {
+    switch (opcode) {
+      case OPCODES.ping:
+        this.writeFrame(OPCODES.pong, payload);
+        return;
+
+      case OPCODES.pong:
+        this.emit('pong', payload);
+        return;
+
+      case OPCODES.close: {
+        const code = payload.length >= 2 ? payload.readUInt16BE(0) : 1005;
+        const reason = payload.length > 2 ? payload.toString('utf8', 2) : '';
+        if (this.readyState === WsConnection.OPEN) {
+          this.readyState = WsConnection.CLOSING;
+          this.writeFrame(OPCODES.close, payload.subarray(0, 2));
+        }
+        this.socket.end();
+        this.handleClose(code, reason);
+        return;
+      }
+
+      case OPCODES.continuation:
+        this.fragments.push(payload);
+        this.fragmentBytes += payload.length;
+        if (fin) {
+          const message = Buffer.concat(this.fragments, this.fragmentBytes);
+          this.fragments = [];
+          this.fragmentBytes = 0;
+          this.deliver(this.fragmentOpcode, message);
+        }
+        return;
+
+      case OPCODES.text:
+      case OPCODES.binary:
+        if (!fin) {
+          this.fragmentOpcode = opcode;
+          this.fragments = [payload];
+          this.fragmentBytes = payload.length;
+          return;
+        }
+        this.deliver(opcode, payload);
+        return;
+
+      default:
+        this.close(1002, 'Unknown opcode');
+    }
+  }
+
+  deliver(opcode, payload) {
+    this.stats.messagesIn++;
+    if (opcode === OPCODES.text) {
+      this.emit('message', payload.toString('utf8'), false);
+    } else {
+      this.emit('message', payload, true);
+    }
+  }
+
+  handleClose(code, reason) {
+    if (this.readyState === WsConnection.CLOSED) return;
+    this.readyState = WsConnection.CLOSED;
+    clearTimeout(this.closeTimer);
+    this.emit('close', { code, reason });
+  }
+
+  /**
+   * Event listener system
+   */
+  on(event, callback) {
+    if (!this.listeners[event]) {
+      this.listeners[event] = [];
+    }
+    this.listeners[event].push(callback);
+  }
+
+  off(event, callback) {
+    if (this.listeners[event]) {
+      this.listeners[event] = this.listeners[event].filter(cb => cb !== callback);
+    }
+  }
+
+  emit(event, data, extra) {
+    if (this.listeners[event]) {
+      this.listeners[event].forEach(callback => callback(data, extra));
+    }
+  }
+
+  /**
+   * Complete a server-side upgrade; returns the connection, or null after
+   * rejecting the request
+   */
+  static accept(req, socket, head, options = {}) {
+    const key = req.headers['sec-websocket-key'];
+    if (!key || (req.headers.upgrade || '').toLowerCase() !== 'websocket') {
+      socket.end('HTTP/1.1 400 Bad Request\r\n\r\n');
+      return null;
+    }
+
+    const accept = crypto.createHash('sha1').update(key + HANDSHAKE_GUID).digest('base64');
+    const lines = [
+      'HTTP/1.1 101 Switching Protocols',
+      'Upgrade: websocket',
+      'Connection: Upgrade',
+      `Sec-WebSocket-Accept: ${accept}`
+    ];
+    if (options.protocol) lines.push(`Sec-WebSocket-Protocol: ${options.protocol}`);
+    socket.write(lines.join('\r\n') + '\r\n\r\n');
+
+    return new WsConnection(socket, { ...options, client: false, head });
+  }
+
+  /**
+   * Open a client connection (ws:// or wss://)
+   */
+  static connect(url, options = {}) {
+    const target = new URL(url);
+    const secure = target.protocol === 'wss:' || target.protocol === 'https:';
+    const key = crypto.randomBytes(16).toString('base64');
+
+    const headers = {
+      Connection: 'Upgrade',
+      Upgrade: 'websocket',
+      'Sec-WebSocket-Version': '13',
+      'Sec-WebSocket-Key': key,
+      ...options.headers
+    };
+    if (options.protocols) {
+      headers['Sec-WebSocket-Protocol'] = [].concat(options.protocols).join(', ');
+    }
+
+    return new Promise((resolve, reject) => {
+      const request = (secure ? https : http).request({
+        hostname: target.hostname,
+        port: target.port || (secure ? 443 : 80),
+        path: target.pathname + target.search,
+        headers,
+        timeout: options.timeoutMs || 10000
+      });
+
+      request.on('upgrade', (res, socket, head) => {
+        const expected = crypto.createHash('sha1').update(key + HANDSHAKE_GUID).digest('base64');
+        if (res.headers['sec-websocket-accept'] !== expected) {
+          socket.destroy();
+          reject(new Error('WebSocket handshake failed: bad accept key'));
+          return;
+        }
+        resolve(new WsConnection(socket, {
+          ...options,
+          client: true,
+          head,
+          protocol: res.headers['sec-websocket-protocol'] || null
+        }));
+      });
+
+      request.on('response', (res) => {
+        res.resume();
+        reject(new Error(`WebSocket handshake failed: ${res.statusCode} ${res.statusMessage}`));
+      });
+
+      request.on('timeout', () => {
+        request.destroy(new Error('WebSocket handshake timed out'));
+      });
+
+      request.on('error', reject);
+      request.end();
+    });
+  }
+}
+
+WsConnection.CONNECTING = 0;
+WsConnection.OPEN = 1;
+WsConnection.CLOSING = 2;
+WsConnection.CLOSED = 3;
+
+module.exports = WsConnection;
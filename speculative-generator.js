@@ -0,0 +1,274 @@
+/**
+ * Speculative Generator
+ * Starts LLM generation from a stable interim transcript instead of waiting
+ * for Deepgram's endpointing. Output is held back until the final transcript
+ * arrives: if it matches the speculated text (within a small edit distance)
+ * the held sentences are released, otherwise the generation is cancelled
+ * and the caller restarts from the final transcript
+ */
+
+class SpeculativeGenerator {
+  constructor(groq, options = {}) {
+    this.groq = groq;
+    this.options = {
+      enabled: false,
+      stableMs: 250,        // interim unchanged this long counts as stable
+      stableCount: 2,       // ...or repeated this many times in a row
+      minWords: 2,          // don't speculate on a single word
+      maxEdits: 2,          // character edits always tolerated
+      maxEditRatio: 0.1,    // edits tolerated relative to the final's length
+      ...options
+    };
+
+    this.current = null;     // in-flight speculation
+    this.lastInterim = '';
+    this.repeats = 0;
+    this.stableTimer = null;
+
+    this.stats = {
+      attempts: 0,
+      hits: 0,
+      misses: 0,
+      diverged: 0,          // cancelled before the final because the interim changed
+      tokensUsed: 0,
+      tokensWasted: 0,
+      headStartMs: []       // how long before the final each hit started
+    };
+
+    this.groq.on('token', () => {
+      if (this.current) this.current.tokens++;
+    });
+  }
+
+  /**
+   * Lowercase, strip punctuation and collapse whitespace
+   */
+  static normalize(text) {
+    return text.toLowerCase().replace(/[^\p{L}\p{N}\s']/gu, '').replace(/\s+/g, ' ').trim();
+  }
+
+  /**
+   * Levenshtein distance, bailing out once it exceeds limit
+   */
+  static editDistance(a, b, limit = Infinity) {
+    if (Math.abs(a.length - b.length) > limit) return limit + 1;
+
+    let previous = new Array(b.length + 1);
+    let row = new Array(b.length + 1);
+    for (let j = 0; j <= b.length; j++) previous[j] = j;
+
+    for (let i = 1; i <= a.length; i++) {
+      row[0] = i;
+      let best = row[0];
+      for (let j = 1; j <= b.length; j++) {
+        const cost = a[i - 1] === b[j - 1] ? 0 : 1;
+        row[j] = Math.min(previous[j] + 1, row[j - 1] + 1, previous[j - 1] + cost);
+        if (row[j] < best) best = row[j];
+      }
+      if (best > limit) return limit + 1;
+      [previous, row] = [row, previous];
+    }
+
+    return previous[b.length];
+  }
+
+  /**
+   * Whether a speculated transcript is close enough to the final one
+   */
+  matches(speculated, final) {
+    const a = SpeculativeGenerator.normalize(speculated);
+    const b = SpeculativeGenerator.normalize(final);
+    const limit = Math.max(this.options.maxEdits, Math.floor(b.length * this.options.maxEditRatio));
+    return SpeculativeGenerator.editDistance(a, b, limit) <= limit;
+  }
+
+  /**
+   * Feed every interim transcript; speculation starts once it is stable
+   */
+  onInterim(transcript) {
+    if (!this.options.enabled) return;
+
+    const text = SpeculativeGenerator.normalize(transcript);
+    if (!text) return;
+
+    // The user kept talking past what we speculated on
+    if (this.current && !this.current.committed && !this.matches(this.current.text, transcript)) {
+      this.stats.diverged++;
+      this.cancel();
+    }
+
+    this.repeats = text === this.lastInterim ? this.repeats + 1 : 1;
+    this.lastInterim = text;
+
+    clearTimeout(this.stableTimer);
+    if (this.repeats >= this.options.stableCount) {
+      this.start(transcript);
+    } else {
+      this.stableTimer = setTimeout(() => this.start(transcript), this.options.stableMs);
+    }
+  }
+
+  /**
+   * Begin a held-back generation for a stable interim
+   */
+  start(transcript) {
+    clearTimeout(this.stableTimer);
+    this.stableTimer = null;
+
+    if (this.current) return;
+    if (transcript.trim().split(/\s+/).length < this.options.minWords) return;
+    // Never pre-empt a response that is already being generated
+    if (this.groq.abortController) return;
+
+    const speculation = {
+      text: transcript,
+      startedAt: Date.now(),
+      sentences: [],
+      response: null,        // full response once the stream completes
+      finalText: null,
+      committed: false,
+      tokens: 0,
+      promise: null
+    };
+
+    this.current = speculation;
+    this.stats.attempts++;
+    console.log('[Speculative] Generating from interim:', transcript);
+
+    speculation.promise = this.groq.generateResponse(transcript, { history: false })
+      .catch((error) => {
+        console.warn('[Speculative] Generation failed:', error?.message || error);
+      })
+      .then(() => {
+        // Aborted or failed without completing - nothing left to commit
+        if (this.current === speculation && speculation.response === null) {
+          this.current = null;
+        }
+      });
+  }
+
+  /**
+   * Route an LLM event; returns true if it was held back
+   */
+  hold(event, data) {
+    const speculation = this.current;
+    if (!speculation) return false;
+
+    if (event === 'sentence') {
+      if (speculation.committed) return false;
+      speculation.sentences.push(data);
+      return true;
+    }
+
+    if (event === 'complete') {
+      speculation.response = data;
+      if (!speculation.committed) return true;
+
+      this.finish(speculation);
+      return false;
+    }
+
+    return false;
+  }
+
+  /**
+   * Resolve against the final transcript
+   * Returns the committed speculation ({ sentences, response, promise })
+   * on a hit, or null when the caller should generate normally
+   */
+  resolve(finalTranscript) {
+    clearTimeout(this.stableTimer);
+    this.stableTimer = null;
+    this.lastInterim = '';
+    this.repeats = 0;
+
+    const speculation = this.current;
+    if (!speculation) return null;
+
+    if (!this.matches(speculation.text, finalTranscript)) {
+      console.log(`[Speculative] Miss: "${speculation.text}" vs "${finalTranscript}"`);
+      this.stats.misses++;
+      this.cancel();
+      return null;
+    }
+
+    this.stats.hits++;
+    this.stats.headStartMs.push(Date.now() - speculation.startedAt);
+    if (this.stats.headStartMs.length > 50) {
+      this.stats.headStartMs.shift();
+    }
+
+    speculation.committed = true;
+    speculation.finalText = finalTranscript;
+    console.log(`[Speculative] Hit - ${speculation.sentences.length} sentence(s) ready`);
+
+    const released = {
+      sentences: speculation.sentences,
+      response: speculation.response,
+      promise: speculation.promise
+    };
+    speculation.sentences = [];
+
+    if (speculation.response !== null) {
+      this.finish(speculation);
+    }
+    return released;
+  }
+
+  /**
+   * Record a committed exchange in history under the final transcript
+   */
+  finish(speculation) {
+    this.groq.commitExchange(speculation.finalText, speculation.response);
+    this.stats.tokensUsed += speculation.tokens;
+    if (this.current === speculation) {
+      this.current = null;
+    }
+  }
+
+  /**
+   * Abandon the in-flight speculation
+   */
+  cancel() {
+    clearTimeout(this.stableTimer);
+    this.stableTimer = null;
+
+    const speculation = this.current;
+    if (!speculation || speculation.committed) return;
+
+    this.current = null;
+    this.stats.tokensWasted += speculation.tokens;
+    if (speculation.response === null) {
+      this.groq.cancel();
+    }
+  }
+
+  /**
+   * Reset interim tracking (e.g. when the user is interrupted or stops)
+   */
+  reset() {
+    this.cancel();
+    this.lastInterim = '';
+    this.repeats = 0;
+  }
+
+  getStats() {
+    const { headStartMs, ...stats } = this.stats;
+    const resolved = stats.hits + stats.misses;
+    const totalTokens = stats.tokensUsed + stats.tokensWasted;
+
+    return {
+      ...stats,
+      hitRate: resolved > 0 ? +(stats.hits / resolved).toFixed(3) : 0,
+      wasteRate: totalTokens > 0 ? +(stats.tokensWasted / totalTokens).toFixed(3) : 0,
+      avgHeadStartMs: headStartMs.length > 0
+        ? Math.round(headStartMs.reduce((a, b) => a + b, 0) / headStartMs.length)
+        : 0
+    };
+  }
+}
+
+// Export for use in other modules
+if (typeof module !== 'undefined' && module.exports) {
+  module.exports = SpeculativeGenerator;
+}
@@ -0,0 +1,320 @@
+/**
+ * SSE Parser
+ * Incremental parser for OpenAI-style chat completion streams (Groq)
+ * Bytes are appended to one reusable buffer and scanned once; for each
+ * `data:` line only choices[0].delta.content (and finish_reason) is pulled
+ * out, without JSON.parse-ing the whole chunk
+ */
+
+const SSE_NEWLINE = 0x0A;
+const SSE_CARRIAGE_RETURN = 0x0D;
+const SSE_COLON = 0x3A;
+const SSE_SPACE = 0x20;
+const SSE_QUOTE = 0x22;
+const SSE_BACKSLASH = 0x5C;
+
+class SSEParser {
+  constructor(initialSize = 4096) {
+    this.buffer = new Uint8Array(initialSize);
+    this.start = 0;     // first unconsumed byte
+    this.end = 0;       // end of valid data
+    this.scan = 0;      // where the next newline search resumes
+    this.done = false;  // saw data: [DONE]
+
+    this.decoder = new TextDecoder();
+    this.stats = { lines: 0, deltas: 0, fallbacks: 0 };
+  }
+
+  /**
+   * Append a network chunk and emit onDelta(content, finishReason) for
+   * every complete data line. content is null when a line carries none
+   */
+  push(chunk, onDelta) {
+    this.append(chunk);
+
+    const buffer = this.buffer;
+    const end = this.end;
+    while (true) {
+      // Bounded scan - indexOf() would run on into stale bytes past `end`
+      let newline = this.scan;
+      while (newline < end && buffer[newline] !== SSE_NEWLINE) newline++;
+      if (newline === end) {
+        this.scan = end;
+        break;
+      }
+
+      let lineEnd = newline;
+      if (lineEnd > this.start && buffer[lineEnd - 1] === SSE_CARRIAGE_RETURN) lineEnd--;
+
+      this.parseLine(this.start, lineEnd, onDelta);
+      this.start = newline + 1;
+      this.scan = this.start;
+    }
+
+    // Everything consumed - rewind instead of compacting later
+    if (this.start === this.end) {
+      this.start = this.end = this.scan = 0;
+    }
+  }
+
+  append(chunk) {
+    const needed = this.end + chunk.length;
+    if (needed > this.buffer.length) {
+      const pending = this.end - this.start;
+
+      if (pending + chunk.length <= this.buffer.length) {
+        // Slide the partial line to the front
+        this.buffer.copyWithin(0, this.start, this.end);
+      } else {
+        const grown = new Uint8Array(Math.max(this.buffer.length * 2, pending + chunk.length));
+        grown.set(this.buffer.subarray(this.start, this.end));
+        this.buffer = grown;
+      }
+
+      this.scan -= this.start;
+      this.start = 0;
+      this.end = pending;
+    }
+
+    this.buffer.set(chunk, this.end);
+    this.end += chunk.length;
+  }
+
+  parseLine(start, end, onDelta) {
+    const buffer = this.buffer;
+
+    // Blank lines separate events; ':' lines are comments
+    if (start === end || buffer[start] === SSE_COLON) return;
+
+    // "data:" prefix with an optional space
+    if (end - start < 5 ||
+        buffer[start] !== 0x64 || buffer[start + 1] !== 0x61 ||
+        buffer[start + 2] !== 0x74 || buffer[start + 3] !== 0x61 ||
+        buffer[start + 4] !== SSE_COLON) {
+      return;
+    }
+    let position = start + 5;
+    if (buffer[position] === SSE_SPACE) position++;
+
+    this.stats.lines++;
+
+    // [DONE]
+    if (end - position === 6 && buffer[position] === 0x5B && buffer[position + 1] === 0x44) {
+      this.done = true;
+      return;
+    }
+
+    const delta = this.find(SSEParser.DELTA_KEY, position, end);
+    if (delta === -1) return;
+
+    let content = null;
+    const contentKey = this.find(SSEParser.CONTENT_KEY, delta, end);
+    if (contentKey !== -1) {
+      content = this.readString(contentKey + SSEParser.CONTENT_KEY.length, end);
+    }
+
+    let finishReason = null;
+    const finishKey = this.find(SSEParser.FINISH_KEY, delta, end);
+    if (finishKey !== -1) {
+      finishReason = this.readString(finishKey + SSEParser.FINISH_KEY.length, end);
+    }
+
+    if (content !== null || finishReason !== null) {
+      this.stats.deltas++;
+      onDelta(content, finishReason);
+    }
+  }
+
+  /**
+   * Read a JSON string whose opening quote is at `start` (whitespace
+   * allowed before it). Returns null for non-strings (e.g. null)
+   */
+  readString(start, end) {
+    const buffer = this.buffer;
+    while (start < end && buffer[start] === SSE_SPACE) start++;
+    if (buffer[start] !== SSE_QUOTE) return null;
+
+    let escaped = false;
+    let ascii = true;
+    let position = start + 1;
+    while (position < end) {
+      const byte = buffer[position];
+      if (byte === SSE_BACKSLASH) {
+        escaped = true;
+        position += 2;
+        continue;
+      }
+      if (byte === SSE_QUOTE) break;
+      if (byte > 0x7F) ascii = false;
+      position++;
+    }
+    if (position >= end) return null;
+
+    // Typical tokens are a few ASCII bytes - cheaper than a decoder call
+    if (!escaped && ascii && position - start <= 33) {
+      let text = '';
+      for (let i = start + 1; i < position; i++) {
+        text += String.fromCharCode(buffer[i]);
+      }
+      return text;
+    }
+
+    if (!escaped) {
+      return this.decoder.decode(buffer.subarray(start + 1, position));
+    }
+
+    // Escapes (\n, \", \uXXXX...) are rare - let JSON.parse handle them
+    this.stats.fallbacks++;
+    try {
+      return JSON.parse(this.decoder.decode(buffer.subarray(start, position + 1)));
+    } catch (error) {
+      console.error('[SSE] Malformed string in stream:', error);
+      return null;
+    }
+  }
+
+  /**
+   * Index of an ASCII key pattern within [start, end), or -1
+   */
+  find(pattern, start, end) {
+    const buffer = this.buffer;
+    const first = pattern[0];
+    const last = end - pattern.length;
+
+    for (let position = start; position <= last; position++) {
+      if (buffer[position] !== first) continue;
+      let k = 1;
+      while (k < pattern.length && buffer[position + k] === pattern[k]) k++;
+      if (k === pattern.length) return position;
+    }
+    return -1;
+  }
+
+  reset() {
+    this.start = this.end = this.scan = 0;
+    this.done = false;
+  }
+
+  /**
+   * Split-and-JSON.parse loop that GroqLLM.processStream used before,
+   * kept as the benchmark baseline
+   */
+  static legacyParse(chunks, onDelta) {
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    for (const chunk of chunks) {
+      buffer += decoder.decode(chunk, { stream: true });
+      const lines = buffer.split('\n');
+      buffer = lines.pop() || '';
+
+      for (const line of lines) {
+        const trimmed = line.trim();
+        if (!trimmed || trimmed.startsWith(':')) continue;
+        if (!trimmed.startsWith('data: ')) continue;
+
+        const data = trimmed.slice(6);
+        if (data === '[DONE]') continue;
+
+        const parsed = JSON.parse(data);
+        const choice = parsed.choices?.[0];
+        if (choice?.delta?.content || choice?.finish_reason) {
+          onDelta(choice.delta?.content ?? null, choice.finish_reason ?? null);
+        }
+      }
+    }
+  }
+
+  /**
+   * Build a Groq-shaped stream for a response, cut into network chunks
+   */
+  static recordSample(text, chunkSize = 64) {
+    const encoder = new TextEncoder();
+    const tokens = text.match(/\s*\S+/g) || [];
+    const created = 1730000000;
+
+    let body = '';
+    const header = `{"id":"chatcmpl-sample","object":"chat.completion.chunk","created":${created},"model":"llama-3.3-70b-versatile","system_fingerprint":"fp_sample","choices":[{"index":0,`;
+    body += `data: ${header}"delta":{"role":"assistant","content":""},"logprobs":null,"finish_reason":null}],"x_groq":{"id":"req_sample"}}\n\n`;
+    tokens.forEach((token) => {
+      body += `data: ${header}"delta":{"content":${JSON.stringify(token)}},"logprobs":null,"finish_reason":null}]}\n\n`;
+    });
+    body += `data: ${header}"delta":{},"logprobs":null,"finish_reason":"stop"}],"x_groq":{"id":"req_sample","usage":{"completion_tokens":${tokens.length}}}}\n\n`;
+    body += 'data: [DONE]\n\n';
+
+    const bytes = encoder.encode(body);
+    const chunks = [];
+    for (let i = 0; i < bytes.length; i += chunkSize) {
+      chunks.push(bytes.slice(i, i + chunkSize));
+    }
+    return chunks;
+  }
+
+  /**
+   * Compare against the legacy loop on recorded streams (arrays of
+   * Uint8Array chunks, e.g. GroqLLM.recordedStreams with
+   * groq.recordStreams enabled) or on generated Groq-shaped samples
+   * Run from the browser console: SSEParser.benchmark()
+   */
+  static benchmark({ streams = null, iterations = 200, chunkSize = 64 } = {}) {
+    const now = () => (typeof performance !== 'undefined' ? performance.now() : Date.now());
+
+    if (!streams || streams.length === 0) {
+      const reply = 'Great choice! One jollof rice with grilled chicken comes to ₦4,500. ' +
+        'Would you like a drink with that - we have Chapman, Zobo and \"Fanta\", ' +
+        'or maybe some dodo on the side?\nDelivery to Lekki usually takes 35 minutes.';
+      streams = [1, 2, 4].map(n => SSEParser.recordSample(Array(n).fill(reply).join(' '), chunkSize));
+    }
+
+    const totalBytes = streams.reduce((sum, chunks) =>
+      sum + chunks.reduce((s, chunk) => s + chunk.length, 0), 0);
+
+    let legacyText = '';
+    let parserText = '';
+    SSEParser.legacyParse(streams[0], (content) => { if (content) legacyText += content; });
+    const check = new SSEParser();
+    streams[0].forEach(chunk => check.push(chunk, (content) => { if (content) parserText += content; }));
+
+    let sink = 0;
+    const count = (content) => { if (content) sink += content.length; };
+
+    let start = now();
+    for (let i = 0; i < iterations; i++) {
+      streams.forEach(chunks => SSEParser.legacyParse(chunks, count));
+    }
+    const legacyMs = now() - start;
+
+    start = now();
+    for (let i = 0; i < iterations; i++) {
+      streams.forEach((chunks) => {
+        const parser = new SSEParser();
+        chunks.forEach(chunk => parser.push(chunk, count));
+      });
+    }
+    const parserMs = now() - start;
+
+    const result = {
+      streams: streams.length,
+      bytesPerIteration: totalBytes,
+      outputMatches: legacyText === parserText,
+      legacyMs: Math.round(legacyMs),
+      parserMs: Math.round(parserMs),
+      legacyMBps: +((totalBytes * iterations) / 1e3 / legacyMs).toFixed(1),
+      parserMBps: +((totalBytes * iterations) / 1e3 / parserMs).toFixed(1),
+      speedup: +(legacyMs / parserMs).toFixed(2)
+    };
+    console.table ? console.table(result) : console.log(result);
+    result.charsParsed = sink;
+    return result;
+  }
+}
+
+// ASCII key patterns searched for in each data line
+SSEParser.DELTA_KEY = new TextEncoder().encode('"delta":');
+SSEParser.CONTENT_KEY = new TextEncoder().encode('"content":');
+SSEParser.FINISH_KEY = new TextEncoder().encode('"finish_reason":');
+
+// Export for use in other modules
+if (typeof module !== 'undefined' && module.exports) {
+  module.exports = SSEParser;
+}
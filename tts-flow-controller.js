@@ -0,0 +1,195 @@
+/**
+ * TTS Flow Controller
+ * Backpressure between the LLM sentence stream and MiniMax
+ * The first sentence of a turn goes out at once; after that sentences are
+ * merged while enough speech is queued ahead of the listener and only
+ * flushed when playback is about to run dry (or the merge gets long).
+ * Fewer, larger TTS requests - and text still held when the caller
+ * interrupts is never synthesized
+ */
+
+class TTSFlowController {
+  constructor(minimax, options = {}) {
+    this.minimax = minimax;
+    this.options = {
+      enabled: true,
+      lowWaterMs: 700,       // flush once less speech than this is queued ahead
+      maxChars: 280,         // never hold more text than this
+      charsPerSecond: 14,    // speaking rate used to estimate unsynthesized text
+      maxWaitMs: 1000,       // re-check playback at least this often while holding
+      ...options
+    };
+
+    this.pending = [];
+    this.pendingChars = 0;
+    this.pendingOptions = {};
+    this.pendingTag = null;
+    this.sentInTurn = 0;
+    this.timer = null;
+    this.listeners = {};
+
+    this.stats = {
+      sentences: 0,
+      requests: 0,
+      mergedSentences: 0,    // sentences that rode along in a combined request
+      firstFlushes: 0,
+      lowWaterFlushes: 0,
+      maxCharFlushes: 0,
+      turnFlushes: 0,
+      droppedChars: 0        // held text discarded on interrupt (never synthesized)
+    };
+  }
+
+  /**
+   * Queue an LLM sentence for TTS
+   * `tag` (e.g. the turn) comes back on the 'sent' event once the
+   * sentence is actually sent - held text dropped on interrupt never is
+   */
+  push(sentence, options = {}, tag = null) {
+    this.stats.sentences++;
+
+    if (!this.options.enabled) {
+      this.send(sentence, options, [sentence], tag);
+      return;
+    }
+
+    this.pending.push(sentence);
+    this.pendingChars += sentence.length;
+    this.pendingOptions = options;
+    this.pendingTag = tag;
+
+    // Time to first audio matters most - never hold the opening sentence
+    if (this.sentInTurn === 0) {
+      this.flush('first');
+      return;
+    }
+
+    this.pump();
+  }
+
+  /**
+   * Estimated milliseconds of speech queued ahead of the listener
+   */
+  getAheadMs() {
+    const unstartedMs = this.minimax.getUnstartedChars() * 1000 / this.options.charsPerSecond;
+    return this.minimax.getBufferedMs() + Math.round(unstartedMs);
+  }
+
+  /**
+   * Flush if playback is about to run dry, otherwise check again just
+   * before it would
+   */
+  pump() {
+    clearTimeout(this.timer);
+    this.timer = null;
+    if (this.pending.length === 0) return;
+
+    if (this.pendingChars >= this.options.maxChars) {
+      this.flush('max_chars');
+      return;
+    }
+
+    const aheadMs = this.getAheadMs();
+    if (aheadMs <= this.options.lowWaterMs) {
+      this.flush('low_water');
+      return;
+    }
+
+    const waitMs = Math.min(this.options.maxWaitMs, Math.max(20, aheadMs - this.options.lowWaterMs));
+    this.timer = setTimeout(() => this.pump(), waitMs);
+  }
+
+  /**
+   * Send everything held as one TTS request
+   */
+  flush(reason = 'manual') {
+    clearTimeout(this.timer);
+    this.timer = null;
+    if (this.pending.length === 0) return;
+
+    const text = this.pending.join(' ');
+    this.stats.mergedSentences += this.pending.length - 1;
+
+    switch (reason) {
+      case 'first': this.stats.firstFlushes++; break;
+      case 'low_water': this.stats.lowWaterFlushes++; break;
+      case 'max_chars': this.stats.maxCharFlushes++; break;
+      case 'turn': this.stats.turnFlushes++; break;
+    }
+
+    const sentences = this.pending;
+    this.pending = [];
+    this.pendingChars = 0;
+    this.send(text, this.pendingOptions, sentences, this.pendingTag);
+  }
+
+  send(text, options = {}, sentences = [text], tag = null) {
+    this.sentInTurn++;
+    this.stats.requests++;
+    this.minimax.streamText(text, options);
+    this.emit('sent', { text, sentences, tag });
+  }
+
+  /**
+   * A new response is starting: whatever the previous one still held is
+   * sent under its own turn, and the next sentence goes out immediately
+   * Call before MiniMaxAPI.beginTurn()
+   */
+  beginTurn() {
+    this.flush('turn');
+    this.sentInTurn = 0;
+  }
+
+  /**
+   * Drop held text (the caller barged in or the conversation stopped)
+   */
+  interrupt() {
+    clearTimeout(this.timer);
+    this.timer = null;
+
+    if (this.pendingChars > 0) {
+      console.log(`[TTSFlow] Dropped ${this.pendingChars} held chars on interrupt`);
+    }
+    this.stats.droppedChars += this.pendingChars;
+    this.pending = [];
+    this.pendingChars = 0;
+    this.sentInTurn = 0;
+  }
+
+  getStats() {
+    return {
+      ...this.stats,
+      avgSentencesPerRequest: this.stats.requests > 0
+        ? +(this.stats.sentences / this.stats.requests).toFixed(2)
+        : 0,
+      pendingChars: this.pendingChars
+    };
+  }
+
+  /**
+   * Event listener system
+   */
+  on(event, callback) {
+    if (!this.listeners[event]) {
+      this.listeners[event] = [];
+    }
+    this.listeners[event].push(callback);
+  }
+
+  off(event, callback) {
+    if (this.listeners[event]) {
+      this.listeners[event] = this.listeners[event].filter(cb => cb !== callback);
+    }
+  }
+
+  emit(event, data) {
+    if (this.listeners[event]) {
+      this.listeners[event].forEach(callback => callback(data));
+    }
+  }
+}
+
+// Export for use in other modules
+if (typeof module !== 'undefined' && module.exports) {
+  module.exports = TTSFlowController;
+}
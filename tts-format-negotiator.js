@@ -0,0 +1,121 @@
+/**
+ * TTS Format Negotiator
+ * Picks the most compact TTS downlink format this browser can decode
+ * incrementally, and a bitrate suited to the current network
+ *
+ *   opus - raw Opus packets decoded with WebCodecs AudioDecoder
+ *   mp3  - MP3 frames decoded per chunk with decodeAudioData
+ *   pcm  - uncompressed fallback played by the AudioWorklet ring buffer
+ */
+
+class TTSFormatNegotiator {
+  /**
+   * Resolve the streaming format to request from MiniMax
+   * Only negotiates when streaming.format is 'auto' or streaming.negotiate
+   * is set; otherwise the configured format is used unchanged
+   */
+  static async negotiate(streamingConfig = {}) {
+    const shouldNegotiate = streamingConfig.format === 'auto' || streamingConfig.negotiate === true;
+    if (!shouldNegotiate) {
+      return {
+        format: streamingConfig.format,
+        sampleRate: streamingConfig.sampleRate,
+        bitrate: streamingConfig.bitrate,
+        negotiated: false
+      };
+    }
+
+    const preferences = streamingConfig.formats || TTSFormatNegotiator.DEFAULT_PREFERENCES;
+    const tier = TTSFormatNegotiator.getNetworkTier();
+
+    for (const format of preferences) {
+      const supported = await TTSFormatNegotiator.isSupported(format);
+      if (!supported) continue;
+
+      const profile = TTSFormatNegotiator.PROFILES[format];
+      const result = {
+        format,
+        sampleRate: profile.sampleRate,
+        bitrate: profile.bitrates[tier],
+        networkTier: tier,
+        negotiated: true
+      };
+
+      console.log(`[TTSFormat] Using ${format} @ ${result.bitrate / 1000} kbps (network tier ${tier})`);
+      return result;
+    }
+
+    // Nothing matched - MP3 through decodeAudioData works everywhere
+    return {
+      format: 'mp3',
+      sampleRate: TTSFormatNegotiator.PROFILES.mp3.sampleRate,
+      bitrate: TTSFormatNegotiator.PROFILES.mp3.bitrates[tier],
+      networkTier: tier,
+      negotiated: true
+    };
+  }
+
+  /**
+   * Check whether a format can be decoded chunk by chunk
+   */
+  static async isSupported(format) {
+    try {
+      switch (format) {
+        case 'opus':
+          if (typeof AudioDecoder === 'undefined') return false;
+          return (await AudioDecoder.isConfigSupported({
+            codec: 'opus',
+            sampleRate: TTSFormatNegotiator.PROFILES.opus.sampleRate,
+            numberOfChannels: 1
+          })).supported === true;
+
+        case 'mp3':
+          return typeof AudioContext !== 'undefined' || typeof webkitAudioContext !== 'undefined';
+
+        case 'pcm':
+          return typeof AudioWorkletNode !== 'undefined';
+
+        default:
+          return false;
+      }
+    } catch (error) {
+      console.warn(`[TTSFormat] Support check failed for ${format}:`, error);
+      return false;
+    }
+  }
+
+  /**
+   * Map the Network Information API to a bitrate tier
+   * 0 = 2G-class / data saver, 1 = 3G-class, 2 = 4G and unknown
+   */
+  static getNetworkTier() {
+    const connection = typeof navigator !== 'undefined' ? navigator.connection : null;
+    if (!connection) return 2;
+    if (connection.saveData) return 0;
+
+    switch (connection.effectiveType) {
+      case 'slow-2g':
+      case '2g':
+        return 0;
+      case '3g':
+        return 1;
+      default:
+        return 2;
+    }
+  }
+}
+
+// Most compact first
+TTSFormatNegotiator.DEFAULT_PREFERENCES = ['opus', 'mp3', 'pcm'];
+
+// Bitrates (bits/s) per network tier: [2G, 3G, 4G]
+TTSFormatNegotiator.PROFILES = {
+  opus: { sampleRate: 48000, bitrates: [12000, 16000, 24000] },
+  mp3: { sampleRate: 24000, bitrates: [32000, 48000, 64000] },
+  pcm: { sampleRate: 16000, bitrates: [256000, 256000, 256000] }
+};
+
+// Export for use in other modules
+if (typeof module !== 'undefined' && module.exports) {
+  module.exports = TTSFormatNegotiator;
+}
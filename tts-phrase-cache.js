@@ -0,0 +1,236 @@
+/**
+ * TTS Phrase Cache
+ * LRU cache of synthesized audio for repeated phrases (greetings,
+ * confirmations, price read-backs) so they play without a network round trip
+ * Optionally persisted to IndexedDB with a size cap
+ */
+
+class TTSPhraseCache {
+  constructor(options = {}) {
+    this.options = {
+      maxEntries: 200,
+      maxBytes: 8 * 1024 * 1024,          // in-memory cap
+      maxTextLength: 200,                  // only cache short, reusable phrases
+      persist: false,
+      maxPersistBytes: 32 * 1024 * 1024,   // IndexedDB cap
+      dbName: 'ordervoice-tts-cache',
+      ...options
+    };
+
+    // Map keeps insertion order - most recently used entries are last
+    this.entries = new Map();
+    this.totalBytes = 0;
+
+    // key -> { bytes, lastUsed } for what is stored in IndexedDB
+    this.persisted = new Map();
+    this.persistedBytes = 0;
+    this.db = null;
+
+    this.stats = {
+      hits: 0,
+      misses: 0,
+      bytesSaved: 0,
+      evictions: 0
+    };
+  }
+
+  /**
+   * Build a cache key from everything that affects the synthesized audio
+   */
+  static buildKey({ voiceId, model, text, voiceSettings = {}, speed, format = '' }) {
+    const settings = Object.keys(voiceSettings).sort()
+      .map(name => `${name}=${voiceSettings[name]}`)
+      .join(',');
+    return [voiceId, model, TTSPhraseCache.normalizeText(text), settings, speed, format].join('|');
+  }
+
+  /**
+   * Normalize text so trivially different strings share an entry
+   */
+  static normalizeText(text) {
+    return text.normalize('NFC').replace(/\s+/g, ' ').trim();
+  }
+
+  /**
+   * Whether a phrase is worth caching
+   */
+  isCacheable(text) {
+    const length = text.trim().length;
+    return length > 0 && length <= this.options.maxTextLength;
+  }
+
+  /**
+   * Look up a phrase; returns an array of audio chunks or null
+   */
+  get(key) {
+    const entry = this.entries.get(key);
+    if (!entry) {
+      this.stats.misses++;
+      return null;
+    }
+
+    // Move to most-recently-used position
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    entry.lastUsed = Date.now();
+
+    this.stats.hits++;
+    this.stats.bytesSaved += entry.bytes;
+
+    if (this.persisted.has(key)) {
+      this.persisted.get(key).lastUsed = entry.lastUsed;
+      this.touchPersisted(key, entry);
+    }
+
+    return entry.chunks;
+  }
+
+  /**
+   * Store the audio chunks for a phrase
+   */
+  set(key, chunks) {
+    const bytes = chunks.reduce((sum, chunk) => sum + chunk.byteLength, 0);
+    if (bytes === 0 || bytes > this.options.maxBytes) return;
+
+    if (this.entries.has(key)) {
+      this.totalBytes -= this.entries.get(key).bytes;
+      this.entries.delete(key);
+    }
+
+    const entry = { chunks, bytes, lastUsed: Date.now() };
+    this.entries.set(key, entry);
+    this.totalBytes += bytes;
+    this.evict();
+
+    if (this.options.persist) {
+      this.persist(key, entry);
+    }
+  }
+
+  /**
+   * Evict least recently used entries until within limits
+   */
+  evict() {
+    while (this.entries.size > this.options.maxEntries ||
+           this.totalBytes > this.options.maxBytes) {
+      const oldestKey = this.entries.keys().next().value;
+      this.totalBytes -= this.entries.get(oldestKey).bytes;
+      this.entries.delete(oldestKey);
+      this.stats.evictions++;
+    }
+  }
+
+  /**
+   * Open IndexedDB and warm the memory cache with persisted phrases
+   */
+  async load() {
+    if (!this.options.persist || typeof indexedDB === 'undefined') return;
+
+    try {
+      this.db = await new Promise((resolve, reject) => {
+        const request = indexedDB.open(this.options.dbName, 1);
+        request.onupgradeneeded = () => {
+          const store = request.result.createObjectStore('phrases', { keyPath: 'key' });
+          store.createIndex('lastUsed', 'lastUsed');
+        };
+        request.onsuccess = () => resolve(request.result);
+        request.onerror = () => reject(request.error);
+      });
+
+      const records = await new Promise((resolve, reject) => {
+        const request = this.db.transaction('phrases', 'readonly')
+          .objectStore('phrases').index('lastUsed').getAll();
+        request.onsuccess = () => resolve(request.result);
+        request.onerror = () => reject(request.error);
+      });
+
+      // Oldest first, so the most recently used end up at the MRU end
+      records.forEach((record) => {
+        this.persisted.set(record.key, { bytes: record.bytes, lastUsed: record.lastUsed });
+        this.persistedBytes += record.bytes;
+
+        if (!this.entries.has(record.key)) {
+          this.entries.set(record.key, {
+            chunks: record.chunks,
+            bytes: record.bytes,
+            lastUsed: record.lastUsed
+          });
+          this.totalBytes += record.bytes;
+        }
+      });
+      this.evict();
+
+      console.log(`[TTSCache] Loaded ${records.length} persisted phrases`);
+    } catch (error) {
+      console.warn('[TTSCache] IndexedDB unavailable, using memory only:', error);
+      this.db = null;
+    }
+  }
+
+  /**
+   * Write an entry to IndexedDB, trimming the store to its size cap
+   */
+  persist(key, entry) {
+    if (!this.db || entry.bytes > this.options.maxPersistBytes) return;
+
+    const store = this.db.transaction('phrases', 'readwrite').objectStore('phrases');
+    store.put({ key, chunks: entry.chunks, bytes: entry.bytes, lastUsed: entry.lastUsed });
+
+    const previous = this.persisted.get(key);
+    this.persistedBytes += entry.bytes - (previous ? previous.bytes : 0);
+    this.persisted.set(key, { bytes: entry.bytes, lastUsed: entry.lastUsed });
+
+    if (this.persistedBytes > this.options.maxPersistBytes) {
+      const oldest = Array.from(this.persisted.entries())
+        .sort((a, b) => a[1].lastUsed - b[1].lastUsed);
+
+      for (const [oldKey, info] of oldest) {
+        if (this.persistedBytes <= this.options.maxPersistBytes) break;
+        if (oldKey === key) continue;
+        store.delete(oldKey);
+        this.persisted.delete(oldKey);
+        this.persistedBytes -= info.bytes;
+      }
+    }
+  }
+
+  /**
+   * Update lastUsed in IndexedDB so persisted eviction stays LRU
+   */
+  touchPersisted(key, entry) {
+    if (!this.db) return;
+    this.db.transaction('phrases', 'readwrite').objectStore('phrases')
+      .put({ key, chunks: entry.chunks, bytes: entry.bytes, lastUsed: entry.lastUsed });
+  }
+
+  /**
+   * Clear memory and persisted entries
+   */
+  clear() {
+    this.entries.clear();
+    this.totalBytes = 0;
+
+    if (this.db) {
+      this.db.transaction('phrases', 'readwrite').objectStore('phrases').clear();
+    }
+    this.persisted.clear();
+    this.persistedBytes = 0;
+  }
+
+  getStats() {
+    const lookups = this.stats.hits + this.stats.misses;
+    return {
+      ...this.stats,
+      hitRate: lookups > 0 ? +(this.stats.hits / lookups).toFixed(3) : 0,
+      entries: this.entries.size,
+      bytes: this.totalBytes,
+      persistedEntries: this.persisted.size,
+      persistedBytes: this.persistedBytes
+    };
+  }
+}
+
+// Export for use in other modules
+if (typeof module !== 'undefined' && module.exports) {
+  module.exports = TTSPhraseCache;
+}
@@ -0,0 +1,182 @@
+/**
+ * Turn Scheduler
+ * Serializes user turns so exactly one response is generated at a time
+ * Deepgram finals that belong together (several is_final segments before
+ * speech_final) are merged into one turn; a newer turn cancels the one in
+ * progress, and if that one hadn't produced any audio yet its words are
+ * carried into the new turn so the reply answers everything that was said
+ */
+
+class TurnScheduler {
+  /**
+   * handlers.run(turn) performs a turn and returns a promise;
+   * handlers.cancel(turn, reason) stops one that is in progress
+   */
+  constructor(handlers, options = {}) {
+    this.handlers = handlers;
+    this.options = {
+      mergeWindowMs: 400,      // wait this long for more finals before speech_final
+      carrySuperseded: true,   // fold a cancelled, still silent turn into the next
+      ...options
+    };
+
+    this.pending = null;       // turn still collecting finals
+    this.queue = [];           // turns ready to run, oldest first
+    this.running = null;
+    this.timer = null;
+    this.nextId = 1;
+
+    this.stats = {
+      finals: 0,
+      turns: 0,
+      merged: 0,               // finals folded into another turn
+      superseded: 0,           // running turns cancelled by a newer one
+      carried: 0,              // superseded turns whose words moved to the next
+      interrupted: 0,
+      completed: 0,
+      failed: 0,
+      mergeWaitMs: 0           // total time turns waited in the merge window
+    };
+  }
+
+  /**
+   * Accept a final transcript
+   * metadata.speechFinal (Deepgram endpoint) dispatches without waiting
+   */
+  submit(text, metadata = {}) {
+    this.stats.finals++;
+
+    if (this.pending) {
+      this.pending.text = `${this.pending.text} ${text}`;
+      this.pending.metadata = metadata;
+      this.pending.finals++;
+      this.stats.merged++;
+    } else {
+      const parts = [];
+
+      // The caller kept talking - the turn in progress is out of date
+      const running = this.running;
+      if (running && !running.cancelled) {
+        this.stats.superseded++;
+        if (this.options.carrySuperseded && running.delivered.length === 0) {
+          parts.push(running.text);
+          this.stats.carried++;
+        }
+        this.cancel(running, 'superseded');
+      }
+
+      // Turns still waiting for the running one to wind down
+      this.queue.forEach((turn) => {
+        parts.push(turn.text);
+        this.stats.merged++;
+      });
+      this.queue = [];
+
+      parts.push(text);
+      this.pending = {
+        id: this.nextId++,
+        text: parts.join(' '),
+        metadata,
+        finals: 1,
+        submittedAt: Date.now(),
+        startedAt: 0,
+        delivered: [],         // sentences sent to TTS for this turn
+        cancelled: false,
+        cancelReason: null
+      };
+    }
+
+    clearTimeout(this.timer);
+    if (metadata.speechFinal || this.options.mergeWindowMs <= 0) {
+      this.dispatch();
+    } else {
+      this.timer = setTimeout(() => this.dispatch(), this.options.mergeWindowMs);
+    }
+  }
+
+  /**
+   * The utterance is over (e.g. Deepgram UtteranceEnd) - stop waiting
+   */
+  flush() {
+    this.dispatch();
+  }
+
+  dispatch() {
+    clearTimeout(this.timer);
+    this.timer = null;
+    if (!this.pending) return;
+
+    this.stats.mergeWaitMs += Date.now() - this.pending.submittedAt;
+    this.queue.push(this.pending);
+    this.pending = null;
+    this.pump();
+  }
+
+  /**
+   * Start the next queued turn once nothing is running
+   */
+  async pump() {
+    if (this.running || this.queue.length === 0) return;
+
+    const turn = this.queue.shift();
+    this.running = turn;
+    turn.startedAt = Date.now();
+    this.stats.turns++;
+
+    try {
+      await this.handlers.run(turn);
+      if (!turn.cancelled) this.stats.completed++;
+    } catch (error) {
+      this.stats.failed++;
+      console.error('[TurnScheduler] Turn failed:', error);
+    } finally {
+      this.running = null;
+      this.pump();
+    }
+  }
+
+  cancel(turn, reason) {
+    if (turn.cancelled) return;
+    turn.cancelled = true;
+    turn.cancelReason = reason;
+    console.log(`[TurnScheduler] Cancelling turn ${turn.id} (${reason})`);
+    this.handlers.cancel(turn, reason);
+  }
+
+  /**
+   * Caller barged in: stop the running turn, keep anything still to come
+   */
+  interrupt() {
+    if (this.running && !this.running.cancelled) {
+      this.stats.interrupted++;
+      this.cancel(this.running, 'interrupted');
+    }
+  }
+
+  /**
+   * Drop everything (conversation stopped)
+   */
+  cancelAll(reason = 'stopped') {
+    clearTimeout(this.timer);
+    this.timer = null;
+    this.pending = null;
+    this.queue = [];
+    if (this.running) {
+      this.cancel(this.running, reason);
+    }
+  }
+
+  getStats() {
+    return {
+      ...this.stats,
+      avgMergeWaitMs: this.stats.turns > 0 ? Math.round(this.stats.mergeWaitMs / this.stats.turns) : 0,
+      queued: this.queue.length + (this.pending ? 1 : 0),
+      running: this.running ? this.running.id : null
+    };
+  }
+}
+
+// Export for use in other modules
+if (typeof module !== 'undefined' && module.exports) {
+  module.exports = TurnScheduler;
+}
@@ -0,0 +1,259 @@
+/**
+ * Turn Tracer
+ * Timestamps every stage of a conversational turn with performance.now()
+ * - from the end of the caller's speech to the last audible sample of the
+ * reply - and keeps per-span latency distributions (p50/p95/p99) so the
+ * voice-to-voice budget can be broken down stage by stage
+ */
+
+class TurnTracer {
+  constructor(options = {}) {
+    this.options = {
+      budgetMs: 800,            // voice-to-voice target
+      maxSamples: 500,          // per span, oldest dropped first
+      speechEndWindowMs: 5000,  // VAD speech end older than this isn't this turn's
+      ...options
+    };
+
+    this.current = null;
+    this.last = null;
+    this.lastSpeechEnd = null;
+    this.nextId = 1;
+    this.listeners = {};
+
+    this.samples = new MetricsStore({ windowSize: this.options.maxSamples });
+    this.buckets = {};
+    TurnTracer.SPANS.forEach(([span]) => {
+      this.buckets[span] = new Uint32Array(TurnTracer.BUCKETS_MS.length + 1);
+    });
+
+    this.stats = {
+      turns: 0,
+      completed: 0,
+      interrupted: 0,
+      overBudget: 0
+    };
+  }
+
+  static now() {
+    return typeof performance !== 'undefined' ? performance.now() : Date.now();
+  }
+
+  /**
+   * VAD saw the caller stop talking; attached to the next turn
+   */
+  speechEnd(time = TurnTracer.now()) {
+    this.lastSpeechEnd = time;
+  }
+
+  /**
+   * Start a turn at the final transcript; an unfinished previous turn is
+   * closed as superseded
+   */
+  begin(time = TurnTracer.now()) {
+    if (this.current) {
+      this.finish('superseded', time);
+    }
+
+    const marks = { stt_final: time };
+    this.attachSpeechEnd(marks, time);
+
+    this.current = { id: this.nextId++, marks };
+    this.stats.turns++;
+    return this.current.id;
+  }
+
+  /**
+   * A final transcript arrived. Starts a turn, unless the current one
+   * hasn't started running yet (held in the merge window or queued behind
+   * a generation) - the final is merged into it, so its final and speech
+   * end move up to this one and turn_wait shows the hold that follows
+   */
+  final(time = TurnTracer.now()) {
+    const trace = this.current;
+    if (!trace || trace.marks.turn_start !== undefined) {
+      return this.begin(time);
+    }
+
+    trace.marks.stt_final = time;
+    this.attachSpeechEnd(trace.marks, time);
+    return trace.id;
+  }
+
+  attachSpeechEnd(marks, time) {
+    if (this.lastSpeechEnd !== null &&
+        time - this.lastSpeechEnd >= 0 &&
+        time - this.lastSpeechEnd <= this.options.speechEndWindowMs) {
+      marks.speech_end = this.lastSpeechEnd;
+    }
+    this.lastSpeechEnd = null;
+  }
+
+  /**
+   * Record the first occurrence of a stage in the current turn, only once
+   * the stage it must follow (if given) has been seen
+   */
+  mark(stage, time = TurnTracer.now(), after = null) {
+    const trace = this.current;
+    if (!trace || trace.marks[stage] !== undefined) return false;
+    if (after && trace.marks[after] === undefined) return false;
+
+    trace.marks[stage] = time;
+    return true;
+  }
+
+  has(stage) {
+    return this.current !== null && this.current.marks[stage] !== undefined;
+  }
+
+  /**
+   * Close the current turn, record its spans and emit 'turn'
+   */
+  finish(outcome = 'complete', time = TurnTracer.now()) {
+    const trace = this.current;
+    if (!trace) return null;
+    this.current = null;
+
+    if (outcome === 'complete') {
+      trace.marks.playback_end = trace.marks.playback_end ?? time;
+      this.stats.completed++;
+    } else if (outcome === 'interrupted') {
+      this.stats.interrupted++;
+    }
+
+    const spans = {};
+    TurnTracer.SPANS.forEach(([span, from, to]) => {
+      const start = trace.marks[from];
+      const end = trace.marks[to];
+      if (start === undefined || end === undefined || end < start) return;
+
+      const ms = Math.round(end - start);
+      spans[span] = ms;
+      this.record(span, ms);
+    });
+
+    const voiceToVoice = spans.voice_to_voice ?? spans.final_to_voice;
+    if (voiceToVoice !== undefined && voiceToVoice > this.options.budgetMs) {
+      this.stats.overBudget++;
+    }
+
+    const result = {
+      id: trace.id,
+      outcome,
+      spans,
+      // Marks relative to the first one, for a readable waterfall
+      marks: TurnTracer.relativeMarks(trace.marks),
+      overBudget: voiceToVoice !== undefined && voiceToVoice > this.options.budgetMs
+    };
+
+    this.last = result;
+    this.emit('turn', result);
+    return result;
+  }
+
+  record(span, ms) {
+    this.samples.record(span, ms);
+
+    const bounds = TurnTracer.BUCKETS_MS;
+    let bucket = 0;
+    while (bucket < bounds.length && ms > bounds[bucket]) bucket++;
+    this.buckets[span][bucket]++;
+  }
+
+  static relativeMarks(marks) {
+    const origin = Math.min(...Object.values(marks));
+    const relative = {};
+    Object.keys(marks)
+      .sort((a, b) => marks[a] - marks[b])
+      .forEach((stage) => {
+        relative[stage] = Math.round(marks[stage] - origin);
+      });
+    return relative;
+  }
+
+  /**
+   * Per-span count, p50/p95/p99, max and bucket counts (≤ each of BUCKETS_MS, then over)
+   */
+  getHistograms() {
+    const histograms = {};
+    TurnTracer.SPANS.forEach(([span]) => {
+      const { count, p50, p95, p99, max, lifetime } = this.samples.summary(span);
+      histograms[span] = {
+        count,
+        p50,
+        p95,
+        p99,
+        max,
+        lifetime,
+        buckets: Array.from(this.buckets[span])
+      };
+    });
+    return histograms;
+  }
+
+  getStats() {
+    return {
+      ...this.stats,
+      budgetMs: this.options.budgetMs,
+      bucketsMs: TurnTracer.BUCKETS_MS,
+      spans: this.getHistograms(),
+      last: this.last
+    };
+  }
+
+  reset() {
+    this.current = null;
+    this.last = null;
+    this.lastSpeechEnd = null;
+    this.samples.reset();
+    TurnTracer.SPANS.forEach(([span]) => {
+      this.buckets[span].fill(0);
+    });
+    Object.keys(this.stats).forEach((key) => {
+      this.stats[key] = 0;
+    });
+  }
+
+  /**
+   * Event listener system
+   */
+  on(event, callback) {
+    if (!this.listeners[event]) {
+      this.listeners[event] = [];
+    }
+    this.listeners[event].push(callback);
+  }
+
+  off(event, callback) {
+    if (this.listeners[event]) {
+      this.listeners[event] = this.listeners[event].filter(cb => cb !== callback);
+    }
+  }
+
+  emit(event, data) {
+    if (this.listeners[event]) {
+      this.listeners[event].forEach(callback => callback(data));
+    }
+  }
+}
+
+// [span, from stage, to stage]
+TurnTracer.SPANS = [
+  ['stt', 'speech_end', 'stt_final'],                          // endpointing + final transcript
+  ['turn_wait', 'stt_final', 'turn_start'],                   // merge window + queued behind a reply
+  ['llm_ttft', 'turn_start', 'llm_first_token'],
+  ['first_sentence', 'llm_first_token', 'llm_first_sentence'],
+  ['tts_ttfb', 'llm_first_sentence', 'tts_first_byte'],
+  ['playback_lead', 'tts_first_byte', 'playback_start'],      // decode + scheduling
+  ['final_to_voice', 'stt_final', 'playback_start'],
+  ['voice_to_voice', 'speech_end', 'playback_start'],         // what the caller waits
+  ['speaking', 'playback_start', 'playback_end']
+];
+
+// Histogram bucket upper bounds (ms)
+TurnTracer.BUCKETS_MS = [50, 100, 200, 400, 800, 1600, 3200];
+
+// Export for use in other modules
+if (typeof module !== 'undefined' && module.exports) {
+  module.exports = TurnTracer;
+}
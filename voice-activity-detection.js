@@ -26,19 +26,18 @@ class VoiceActivityDetector {
    */
   async initialize() {
     try {
-      // Request microphone access
+      // Request microphone access at the device's native rate
       const stream = await navigator.mediaDevices.getUserMedia({
         audio: {
           echoCancellation: true,
           noiseSuppression: true,
-          autoGainControl: true,
-          sampleRate: 16000 // Lower sample rate for VAD to save processing
+          autoGainControl: true
         }
       });
 
-      // Create audio context
+      // Create audio context at the native rate - VAD only measures energy,
+      // so forcing 16 kHz would just add a browser resampling stage
       this.audioContext = new (window.AudioContext || window.webkitAudioContext)({
-        sampleRate: 16000,
         latencyHint: 'interactive'
       });
 
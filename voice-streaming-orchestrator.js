@@ -14,23 +14,39 @@ class VoiceStreamingOrchestrator {
     this.minimax = new MiniMaxAPI(config);
     this.vad = new VoiceActivityDetector(config);
 
+    // Optional: start the LLM on stable interim transcripts
+    this.speculator = new SpeculativeGenerator(this.groq, config.speculation);
+
+    // Merges LLM sentences into fewer TTS requests while audio is buffered
+    this.ttsFlow = new TTSFlowController(this.minimax, config.ttsFlow);
+
+    // Per-turn stage timestamps: speech end -> final -> LLM -> TTS -> playback
+    this.tracer = new TurnTracer(config.tracing);
+    this.tracer.on('turn', trace => this.handleTurnTrace(trace));
+
+    // One response at a time: merges split finals, cancels superseded turns
+    this.scheduler = new TurnScheduler({
+      run: turn => this.handleUserSpeech(turn.text, turn.metadata, turn),
+      cancel: (turn, reason) => this.cancelTurn(turn, reason)
+    }, config.turns);
+
+    // Barge-in: VAD + Deepgram SpeechStarted + echo-gated mic energy
+    this.bargeIn = new BargeInDetector({
+      minLevel: config.vad?.silenceThreshold ?? 0.01,
+      ...config.bargeIn
+    });
+
     // State management
     this.currentVoice = null;
     this.isActive = false;
     this.listeners = {};
     this.conversationBuffer = [];
-    this.processingQueue = [];
     this.lastUserSpeechTime = 0;
     this.currentUtterance = '';
     this.isAISpeaking = false;
 
-    // Performance metrics
-    this.metrics = {
-      sttLatency: [],
-      llmLatency: [],
-      ttsLatency: [],
-      totalLatency: []
-    };
+    // Performance metrics - constant-memory rings + lifetime histograms
+    this.metrics = new MetricsStore(config.metrics);
   }
 
   /**
@@ -51,12 +67,19 @@ class VoiceStreamingOrchestrator {
       await Promise.all([
         this.vad.initialize(),
         this.deepgram.connect(),
-        this.minimax.connect(this.currentVoice.id)
+        this.minimax.connect(this.currentVoice.id),
+        // Groq is plain HTTPS - open the connection now instead of on turn one
+        this.groq.warmUp()
       ]);
 
       // Set up event handlers
       this.setupEventHandlers();
 
+      // Keep the other configured voices authenticated for instant switching
+      this.minimax.prewarm(this.getPrewarmVoiceIds()).catch((error) => {
+        console.warn('[Orchestrator] Voice pre-warm failed:', error);
+      });
+
       const initTime = Date.now() - initStartTime;
       console.log(`[Orchestrator] Initialized successfully in ${initTime}ms`);
       this.emit('initialized', { voice: this.currentVoice, initTime });
@@ -79,27 +102,42 @@ class VoiceStreamingOrchestrator {
       console.log('[Orchestrator] User started speaking (VAD)');
       this.emit('user_speech_start');
 
-      // Interrupt AI if enabled
-      if (this.config.interruption.enabled && this.isAISpeaking) {
-        console.log('[Orchestrator] Interrupting AI');
-        this.interrupt();
-      }
+      // Push any held-back mic audio so the first words are not clipped
+      this.deepgram.handleSpeechOnset();
+
+      // Interrupt AI if the level isn't just its own voice echoing back
+      this.bargeIn.vadSpeechStart();
     });
 
     this.vad.on('speech_end', () => {
       console.log('[Orchestrator] User stopped speaking (VAD)');
       this.emit('user_speech_end');
+      this.tracer.speechEnd();
+      this.deepgram.handleSpeechEnd();
     });
 
     this.vad.on('volume', (volume) => {
+      this.bargeIn.process(volume, this.isAISpeaking ? this.minimax.getOutputLevel() : 0);
       this.emit('volume', volume);
     });
 
+    this.bargeIn.on('barge_in', (event) => {
+      if (!this.config.interruption.enabled || !this.isAISpeaking) return;
+
+      console.log(`[Orchestrator] Interrupting AI (${event.source})`);
+      // Stop latency counts the fade only if playback actually faded
+      event.fadeOutMs = this.interrupt(event.fadeOutMs);
+      this.bargeIn.stopped(event, this.minimax.getOutputLatencyMs());
+      this.emit('barge_in', event);
+    });
+
     // Deepgram STT events
     this.deepgram.on('transcript_interim', (data) => {
       console.log('[Orchestrator] Interim transcript:', data.transcript);
       this.currentUtterance = data.transcript;
+      if (data.transcript.trim()) this.bargeIn.confirm();
       this.emit('interim_transcript', data.transcript);
+      this.speculator.onInterim(data.transcript);
     });
 
     this.deepgram.on('transcript_final', (data) => {
@@ -107,13 +145,21 @@ class VoiceStreamingOrchestrator {
       console.log('[Orchestrator] Final transcript:', transcript);
 
       if (transcript.trim()) {
-        this.handleUserSpeech(transcript, data);
+        this.bargeIn.confirm();
+        // Traced from here, so the scheduler's wait counts toward the reply
+        this.tracer.final();
+        this.scheduler.submit(transcript, data);
       }
     });
 
+    this.deepgram.on('speech_started', () => {
+      this.bargeIn.remoteSpeechStart();
+    });
+
     this.deepgram.on('utterance_end', () => {
       console.log('[Orchestrator] Utterance ended');
       this.currentUtterance = '';
+      this.scheduler.flush();
     });
 
     this.deepgram.on('error', (error) => {
@@ -122,15 +168,18 @@ class VoiceStreamingOrchestrator {
     });
 
     // Groq LLM events - sentence-level streaming
-    this.groq.on('sentence', (sentence) => {
-      console.log('[Orchestrator] LLM sentence ready:', sentence);
-      this.emit('ai_sentence', sentence);
+    this.groq.on('token', () => {
+      this.tracer.mark('llm_first_token', TurnTracer.now(), 'turn_start');
+    });
 
-      // Stream sentence to TTS immediately for ultra-low latency
-      this.minimax.streamText(sentence);
+    this.groq.on('sentence', (sentence) => {
+      // Speculative output waits for the final transcript
+      if (this.speculator.hold('sentence', sentence)) return;
+      this.deliverSentence(sentence);
     });
 
     this.groq.on('complete', (fullResponse) => {
+      if (this.speculator.hold('complete', fullResponse)) return;
       console.log('[Orchestrator] LLM response complete');
       this.emit('ai_message_complete', fullResponse);
     });
@@ -140,26 +189,57 @@ class VoiceStreamingOrchestrator {
       this.emit('error', error);
     });
 
+    // Text actually sent to TTS - held text dropped on interrupt is not
+    this.ttsFlow.on('sent', ({ sentences, tag: turn }) => {
+      if (turn) turn.delivered.push(...sentences);
+    });
+
     // MiniMax TTS events
     this.minimax.on('audio_start', () => {
+      // Each sentence's stream starts one; the reply started with the first
+      if (this.isAISpeaking) return;
       console.log('[Orchestrator] AI started speaking');
       this.isAISpeaking = true;
+      this.bargeIn.setActive(true);
       this.emit('ai_speech_start');
     });
 
     this.minimax.on('audio_end', () => {
-      console.log('[Orchestrator] AI finished speaking');
-      this.isAISpeaking = false;
-      this.emit('ai_speech_end');
+      // The request's stream is done, not its playback - this only ends
+      // the reply if none of its audio made it to the player
+      this.checkSpeechEnded();
     });
 
     this.minimax.on('audio_chunk', () => {
+      this.tracer.mark('tts_first_byte', TurnTracer.now(), 'llm_first_sentence');
       this.emit('ai_audio_chunk');
     });
 
+    this.minimax.on('playback_start', (info) => {
+      // Scheduled players start slightly in the future
+      this.tracer.mark('playback_start', TurnTracer.now() + (info?.leadMs || 0), 'tts_first_byte');
+    });
+
+    this.minimax.on('playback_complete', (playbackMetrics) => {
+      if (playbackMetrics && playbackMetrics.underruns > 0) {
+        console.warn(`[Orchestrator] Playback had ${playbackMetrics.underruns} underrun(s)`);
+      }
+      this.emit('playback_metrics', playbackMetrics);
+
+      // The player also drains on an underrun mid-reply - the turn is only
+      // over once nothing else is coming
+      if (this.tracer.has('llm_complete') && this.tracer.has('playback_start') &&
+          this.ttsFlow.pendingChars === 0 && this.minimax.getUnstartedChars() === 0) {
+        this.tracer.finish('complete');
+      }
+
+      this.checkSpeechEnded();
+    });
+
     this.minimax.on('interrupted', () => {
       console.log('[Orchestrator] AI was interrupted');
       this.isAISpeaking = false;
+      this.bargeIn.setActive(false);
       this.emit('ai_interrupted');
     });
 
@@ -169,6 +249,38 @@ class VoiceStreamingOrchestrator {
     });
   }
 
+  /**
+   * The reply is over once it has played out and nothing else is queued;
+   * barge-in and the echo reference stay on until then
+   */
+  checkSpeechEnded() {
+    if (!this.isAISpeaking) return;
+    if (this.ttsFlow.pendingChars > 0 || this.minimax.getUnstartedChars() > 0 ||
+        this.minimax.hasPendingAudio()) return;
+
+    console.log('[Orchestrator] AI finished speaking');
+    this.isAISpeaking = false;
+    this.bargeIn.setActive(false);
+    this.emit('ai_speech_end');
+  }
+
+  /**
+   * Send an LLM sentence to TTS
+   */
+  deliverSentence(sentence) {
+    const turn = this.scheduler.running;
+    // Sentences still draining from a cancelled turn are never spoken
+    if (turn && turn.cancelled) return;
+
+    console.log('[Orchestrator] LLM sentence ready:', sentence);
+    this.tracer.mark('llm_first_sentence');
+    this.emit('ai_sentence', sentence);
+
+    // First sentence goes to TTS immediately; later ones are merged until
+    // playback needs them. The turn counts them as delivered once sent
+    this.ttsFlow.push(sentence, {}, turn);
+  }
+
   /**
    * Start voice conversation
    */
@@ -181,12 +293,14 @@ class VoiceStreamingOrchestrator {
     try {
       console.log('[Orchestrator] Starting ultra-low latency conversation');
       this.isActive = true;
+      this.bargeIn.reset();
 
       // Start all streaming components in parallel
       await Promise.all([
         this.vad.start(),
         this.deepgram.startStreaming()
       ]);
+      this.groq.startKeepWarm();
 
       this.emit('started');
       console.log('[Orchestrator] Conversation started - ready for voice input');
@@ -200,10 +314,17 @@ class VoiceStreamingOrchestrator {
   }
 
   /**
-   * Handle user speech input with streaming pipeline
+   * Run one user turn (called by the TurnScheduler, one at a time)
+   * The exchange is recorded only once the response completes, so a
+   * cancelled turn never leaves half an exchange in the history
    */
-  async handleUserSpeech(transcript, metadata) {
+  async handleUserSpeech(transcript, metadata, turn = null) {
     const startTime = Date.now();
+    // Turns that didn't come from a final transcript start their trace here
+    if (!this.tracer.mark('turn_start')) {
+      this.tracer.begin();
+      this.tracer.mark('turn_start');
+    }
     console.log('[Orchestrator] Processing user speech:', transcript);
     this.lastUserSpeechTime = startTime;
 
@@ -217,27 +338,42 @@ class VoiceStreamingOrchestrator {
 
     this.emit('user_message', transcript);
 
+    // New TTS turn - sentences of this response are tagged with it
+    this.ttsFlow.beginTurn();
+    this.minimax.beginTurn();
+
     // Start LLM generation immediately (streaming with sentence-level chunking)
     try {
       const llmStartTime = Date.now();
 
-      // Generate response with streaming
-      await this.groq.generateResponse(transcript);
+      // Use the speculative response if it was generated from the same words
+      const speculation = this.speculator.resolve(transcript);
+      if (speculation) {
+        // Tokens were already streamed while the caller was finishing
+        this.tracer.mark('llm_first_token');
+        speculation.sentences.forEach(sentence => this.deliverSentence(sentence));
+        if (speculation.response !== null) {
+          console.log('[Orchestrator] LLM response complete (speculative)');
+          this.emit('ai_message_complete', speculation.response);
+        }
+        await speculation.promise;
+      } else {
+        // Generate response with streaming
+        const response = await this.groq.generateResponse(transcript, { history: false });
+        if (response !== null && !turn?.cancelled) {
+          this.groq.commitExchange(transcript, response);
+        }
+      }
+
+      if (turn?.cancelled) return;
 
-      const totalLatency = Date.now() - startTime;
       const llmLatency = Date.now() - llmStartTime;
+      this.tracer.mark('llm_complete');
 
-      // Track metrics
-      this.metrics.llmLatency.push(llmLatency);
-      this.metrics.totalLatency.push(totalLatency);
+      // Track metrics; STT, TTS and total latency come from the turn trace
+      this.metrics.record('llmLatency', llmLatency);
 
-      console.log(`[Orchestrator] Response pipeline completed - LLM: ${llmLatency}ms, Total: ${totalLatency}ms`);
-      this.emit('metrics', {
-        llmLatency,
-        totalLatency,
-        averageLLM: this.getAverageMetric('llmLatency'),
-        averageTotal: this.getAverageMetric('totalLatency')
-      });
+      console.log(`[Orchestrator] Response generated - LLM: ${llmLatency}ms, since final: ${Date.now() - startTime}ms`);
 
     } catch (error) {
       console.error('[Orchestrator] Error generating response:', error);
@@ -245,36 +381,77 @@ class VoiceStreamingOrchestrator {
     }
   }
 
+  /**
+   * Record a finished turn's stage latencies and publish them
+   */
+  handleTurnTrace(trace) {
+    const { spans } = trace;
+    if (spans.stt !== undefined) this.metrics.record('sttLatency', spans.stt);
+    if (spans.tts_ttfb !== undefined) this.metrics.record('ttsLatency', spans.tts_ttfb);
+
+    // Caller-perceived: end of speech (or final transcript) to first audio
+    const totalLatency = spans.voice_to_voice ?? spans.final_to_voice;
+    if (totalLatency !== undefined) this.metrics.record('totalLatency', totalLatency);
+
+    console.log(`[Orchestrator] Turn ${trace.id} (${trace.outcome}):`, spans);
+    this.emit('turn_trace', trace);
+    this.emit('metrics', {
+      sttLatency: spans.stt,
+      llmLatency: spans.llm_ttft,
+      ttsLatency: spans.tts_ttfb,
+      totalLatency,
+      averageLLM: this.getAverageMetric('llmLatency'),
+      averageTotal: this.getAverageMetric('totalLatency'),
+      trace
+    });
+  }
+
+  /**
+   * Stop a turn the scheduler cancelled (superseded, interrupted, stopped)
+   */
+  cancelTurn(turn, reason) {
+    this.speculator.reset();
+    this.groq.cancel();
+
+    if (turn.delivered.length > 0) {
+      // Keep what the caller actually heard so the next reply has context
+      this.groq.commitExchange(turn.text, turn.delivered.join(' '));
+
+      if (reason === 'superseded') {
+        this.ttsFlow.interrupt();
+        this.minimax.interrupt();
+      }
+    }
+  }
+
   /**
    * Interrupt current AI response
+   * fadeOutMs overrides config.interruption.fadeOutDuration (barge-in)
+   * Returns the fade applied to playback
    */
-  interrupt() {
+  interrupt(fadeOutMs) {
     console.log('[Orchestrator] Interrupting current response');
+    this.tracer.finish('interrupted');
+    this.scheduler.interrupt();
 
-    // Cancel LLM generation
+    // Cancel LLM generation (speculative or not)
+    this.speculator.reset();
     this.groq.cancel();
 
-    // Stop TTS playback
-    this.minimax.interrupt();
+    // Stop TTS playback; held sentences are never synthesized
+    this.ttsFlow.interrupt();
+    const fadedMs = this.minimax.interrupt(fadeOutMs);
 
     this.isAISpeaking = false;
     this.emit('interrupted');
+    return fadedMs;
   }
 
   /**
    * Get average metric value
    */
-  getAverageMetric(metric) {
-    const values = this.metrics[metric];
-    if (values.length === 0) return 0;
-
-    // Keep only last 20 measurements
-    if (values.length > 20) {
-      this.metrics[metric] = values.slice(-20);
-    }
-
-    const sum = this.metrics[metric].reduce((a, b) => a + b, 0);
-    return Math.round(sum / this.metrics[metric].length);
+  getAverageMetric(metric, window = this.config.metrics?.averageWindow ?? 20) {
+    return Math.round(this.metrics.mean(metric, window));
   }
 
   /**
@@ -286,7 +463,26 @@ class VoiceStreamingOrchestrator {
       llmLatency: this.getAverageMetric('llmLatency'),
       ttsLatency: this.getAverageMetric('ttsLatency'),
       totalLatency: this.getAverageMetric('totalLatency'),
-      conversationLength: this.conversationBuffer.length
+      // p50/p95/p99 over the recent window and the whole session
+      latency: this.metrics.snapshot(),
+      conversationLength: this.conversationBuffer.length,
+      ttsCache: this.minimax.getCacheStats(),
+      llmCache: this.groq.getCacheStats(),
+      llmContext: this.groq.getContextStats(),
+      llmTtft: this.groq.getTtftStats(),
+      llmRouting: this.groq.getRoutingStats(),
+      ttsTransport: this.minimax.getTransportStats(),
+      ttsFlow: this.ttsFlow.getStats(),
+      turnLatency: this.tracer.getStats(),
+      turns: this.scheduler.getStats(),
+      bargeIn: this.bargeIn.getStats(),
+      reconnect: {
+        deepgram: this.deepgram.reconnector.getMetrics(),
+        minimax: this.minimax.getConnectionMetrics()
+      },
+      sttBacklog: this.deepgram.backlog.getStats(),
+      sttUplink: this.deepgram.getUplinkStats(),
+      speculation: this.speculator.getStats()
     };
   }
 
@@ -301,16 +497,24 @@ class VoiceStreamingOrchestrator {
 
     console.log('[Orchestrator] Changing voice to:', voiceName);
 
-    // Disconnect current
-    this.minimax.disconnect();
-
-    // Connect with new voice
-    await this.minimax.connect(voice.id);
+    // Pointer swap onto a warm socket - playback context and queued audio are kept
+    await this.minimax.switchVoice(voice.id);
 
     this.currentVoice = voice;
     this.emit('voice_changed', voice);
   }
 
+  /**
+   * Voices to keep warm: config.pool.voices, or every configured voice
+   */
+  getPrewarmVoiceIds() {
+    const names = this.config.pool?.voices || Object.keys(this.config.voices);
+    return names
+      .map(name => this.config.voices[name])
+      .filter(voice => voice && voice !== this.currentVoice)
+      .map(voice => voice.id);
+  }
+
   /**
    * Stop conversation
    */
@@ -326,13 +530,17 @@ class VoiceStreamingOrchestrator {
     // Stop all components
     this.vad.stop();
     this.deepgram.stopStreaming();
+    this.scheduler.cancelAll('stopped');
+    this.tracer.finish('stopped');
+    this.ttsFlow.interrupt();
     this.minimax.interrupt();
+    this.speculator.reset();
     this.groq.cancel();
+    this.groq.stopKeepWarm();
 
     // Clear state
     this.currentUtterance = '';
     this.isAISpeaking = false;
-    this.processingQueue = [];
 
     this.emit('stopped');
   }
@@ -357,12 +565,7 @@ class VoiceStreamingOrchestrator {
     this.isAISpeaking = false;
 
     // Reset metrics
-    this.metrics = {
-      sttLatency: [],
-      llmLatency: [],
-      ttsLatency: [],
-      totalLatency: []
-    };
+    this.metrics.reset();
 
     this.emit('cleaned_up');
   }